@@ -0,0 +1,109 @@
+# music_player/ai/classification_cache.py
+"""
+Persistent cache of AI classification answers.
+
+Answers are stored per (prompt label, prompt version, filename), so re-running a
+prompt on the same pool only sends filenames that were never classified before.
+The prompt version is the config's explicit "version" field if present, otherwise a
+hash of the prompt config, so editing a prompt in aiprompts.json invalidates its
+old answers automatically.
+"""
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Any
+
+from qt_base_app.models.logger import Logger
+from music_player.models.playlist import get_default_working_dir
+
+CACHE_FILENAME = ".ai_classification_cache.json"
+CACHE_FORMAT_VERSION = 1
+
+
+def prompt_version(prompt_config: Dict[str, Any]) -> str:
+    """Returns the version string used to key cached answers for a prompt."""
+    explicit = prompt_config.get("version")
+    if explicit is not None:
+        return str(explicit)
+    # The local prefilter section does not change what the model is asked
+    remote_config = {k: v for k, v in prompt_config.items() if k != "prefilter"}
+    payload = json.dumps(remote_config, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+class ClassificationCache:
+    """Thread-safe filename -> yes/no answer store, persisted as JSON in the playlists folder."""
+
+    def __init__(self, cache_path: Optional[Path] = None):
+        self._path = cache_path
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, bool]]] = None
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        if self._path is None:
+            self._path = get_default_working_dir() / "playlists" / CACHE_FILENAME
+        return self._path
+
+    @staticmethod
+    def _section_key(label: str, version: str) -> str:
+        return f"{label}|{version}"
+
+    def _ensure_loaded(self):
+        if self._entries is not None:
+            return
+        self._entries = {}
+        try:
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("format") == CACHE_FORMAT_VERSION:
+                    self._entries = data.get("prompts", {})
+        except Exception as e:
+            Logger.instance().warning(caller="ClassificationCache", msg=f"Ignoring unreadable classification cache {self.path}: {e}")
+
+    def get_many(self, label: str, version: str, filenames: Iterable[str]) -> Dict[str, bool]:
+        """Returns cached answers for the filenames that have one."""
+        with self._lock:
+            self._ensure_loaded()
+            section = self._entries.get(self._section_key(label, version), {})
+            return {name: section[name] for name in filenames if name in section}
+
+    def put_many(self, label: str, version: str, answers: Dict[str, bool]):
+        if not answers:
+            return
+        with self._lock:
+            self._ensure_loaded()
+            self._entries.setdefault(self._section_key(label, version), {}).update(answers)
+            self._dirty = True
+
+    def clear(self, label: Optional[str] = None):
+        """Drops cached answers for one prompt label (all versions), or everything."""
+        with self._lock:
+            self._ensure_loaded()
+            if label is None:
+                self._entries = {}
+            else:
+                prefix = f"{label}|"
+                self._entries = {k: v for k, v in self._entries.items() if not k.startswith(prefix)}
+            self._dirty = True
+        self.save()
+
+    def save(self):
+        """Writes the cache if it changed (atomic replace)."""
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            payload = {"format": CACHE_FORMAT_VERSION, "prompts": self._entries}
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            Logger.instance().error(caller="ClassificationCache", msg=f"Error saving classification cache: {e}")
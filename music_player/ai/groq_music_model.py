@@ -3,7 +3,9 @@ from qt_base_app.models.logger import Logger
 
 import os
 import json
-import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import groq # Import groq
 from typing import List, Dict, Optional, Any, Callable # Added Callable
 
@@ -13,6 +15,8 @@ from music_player.models.playlist import get_default_working_dir
 
 # Import the QSettings key constant
 from music_player.models.settings_defs import GROQ_API_QSETTINGS_KEY
+from music_player.ai.classification_cache import ClassificationCache, prompt_version
+from music_player.ai.rate_limiter import TokenBucket
 
 # Helper function to generate prompt (could be moved to MusicPicks or kept here)
 # (Using the version defined previously in the plan documentation)
@@ -62,10 +66,44 @@ def generate_prompt(config: dict, batch_filenames: list) -> str:
 
     return "\n".join(prompt_lines)
 
+def parse_classification_response(response_content: str, batch_size: int) -> Dict[int, bool]:
+    """Parses a numbered 'N. Yes/No' response into {batch index: answer}. Unparseable lines are logged and skipped."""
+    answers: Dict[int, bool] = {}
+    for line in response_content.strip().split('\n'):
+        line = line.strip()
+        if not line: continue
+        try:
+            parts = line.split('. ', 1)
+            if len(parts) == 2 and parts[0].isdigit():
+                list_num = int(parts[0])
+                answer = parts[1].strip().lower()
+                batch_index = list_num - 1
+                if 0 <= batch_index < batch_size:
+                    if answer in ("yes", "no"):
+                        answers[batch_index] = answer == "yes"
+                    else:
+                        Logger.instance().warning(caller="groq_music_model", msg=f"Warning: Unexpected answer '{answer}' for batch index {batch_index} (list num {list_num}) in line: '{line}'")
+                else:
+                    Logger.instance().warning(caller="groq_music_model", msg=f"Warning: Parsed list number {list_num} out of range for current batch size {batch_size}. Line: '{line}'")
+            else:
+                Logger.instance().warning(caller="groq_music_model", msg=f"Warning: Could not parse response line format: '{line}'")
+        except Exception as parse_err:
+            Logger.instance().error(caller="groq_music_model", msg=f"Error parsing response line: '{line}'. Error: {parse_err}")
+    return answers
+
+class ClassificationHalted(Exception):
+    """Raised inside a batch request when the run must stop; carries the user-facing message."""
+
 class GroqMusicModel:
     """
     Orchestrates music classification using Groq API.
     Handles prompt loading, configuration, throttling, API calls, and batch processing.
+
+    Answers are cached per (prompt label, prompt version, filename) in a ClassificationCache,
+    requests are spread over a few concurrent threads behind a shared TokenBucket, and
+    rate-limit responses are retried with backoff instead of ending the run.
+    Setting `ai.groq.base_url` in the YAML config points the client at another
+    chat-completions endpoint (e.g. scripts/groq_stub_server.py for testing).
     """
     def __init__(self):
         """
@@ -82,11 +120,14 @@ class GroqMusicModel:
         self.model_name: str = self.settings.get_yaml_config('ai.groq.model_name', "llama-3.1-8b-instant")
         self.batch_size: int = self.settings.get_yaml_config('ai.groq.batch_size', 30)
         requests_per_minute: int = self.settings.get_yaml_config('ai.groq.requests_per_minute', 28)
+        self.max_concurrency: int = max(1, int(self.settings.get_yaml_config('ai.groq.max_concurrency', 3)))
+        self.max_retries: int = max(0, int(self.settings.get_yaml_config('ai.groq.max_retries', 5)))
+        self.base_url: Optional[str] = self.settings.get_yaml_config('ai.groq.base_url', None)
         
-        if requests_per_minute > 0:
-            self._min_request_interval_seconds: float = 60.0 / requests_per_minute
-        else:
-            self._min_request_interval_seconds: float = 2.0 # Default if invalid RPM
+        if requests_per_minute <= 0:
+            requests_per_minute = 30 # Default if invalid RPM
+        self.rate_limiter = TokenBucket(requests_per_minute, capacity=self.max_concurrency)
+        self.cache = ClassificationCache()
         # ---------------------------------------------------------
         
         # --- Get Groq API Key using SettingsManager (QSettings key) ---
@@ -123,7 +164,10 @@ class GroqMusicModel:
             # Use the key retrieved in __init__
             if not self.groq_api_key: 
                 raise ValueError("GROQ API Key not found via SettingsManager (check Preferences).")
-            self.groq_client = groq.Client(api_key=self.groq_api_key)
+            client_kwargs = {"api_key": self.groq_api_key, "max_retries": 0} # Retries are handled by classify_filenames
+            if self.base_url:
+                client_kwargs["base_url"] = self.base_url
+            self.groq_client = groq.Client(**client_kwargs)
             self.api_ready = True 
         except Exception as e:
             Logger.instance().error(caller="groq_music_model", msg=f"Failed to initialize Groq client: {e}")
@@ -175,158 +219,113 @@ class GroqMusicModel:
         if not prompt_config or not filenames:
             return [] # Nothing to do
 
-        classified_paths = []
-        last_request_time = 0
+        label = prompt_config.get('target_label', 'Unknown')
+        version = prompt_version(prompt_config)
         total_files = len(filenames)
 
-        Logger.instance().info(caller="groq_music_model", msg=f"Starting classification for '{prompt_config.get('target_label', 'Unknown')}' with {total_files} files using {self.model_name}.")
+        # The model only ever sees basenames, so answers are shared by files with the same name
+        unique_names = list(dict.fromkeys(os.path.basename(f) for f in filenames))
+        answers: Dict[str, bool] = self.cache.get_many(label, version, unique_names)
+        pending_names = [name for name in unique_names if name not in answers]
+        batches = [pending_names[i:i + self.batch_size] for i in range(0, len(pending_names), self.batch_size)]
 
-        for i in range(0, total_files, self.batch_size):
-            # --- Cancellation Check --- 
-            if worker_cancelled_check():
-                Logger.instance().debug(caller="GroqMusicModel", msg="[GroqMusicModel] Cancellation requested, stopping classification.")
-                break # Exit the loop
-            # ------------------------
-            
-            batch_full_paths = filenames[i : i + self.batch_size]
-            if not batch_full_paths: continue
-
-            # --- Throttling --- 
-            current_time = time.time()
-            if last_request_time != 0: # Don't wait before the first request
-                elapsed_since_last = current_time - last_request_time
-                wait_time = self._min_request_interval_seconds - elapsed_since_last
-                if wait_time > 0:
-                    Logger.instance().debug(caller="GroqMusicModel", msg=f"[GroqMusicModel] Throttling: Waiting {wait_time:.2f} seconds.")
-                    # Allow interruption during sleep
-                    for _ in range(int(wait_time * 10)): # Check every 100ms
-                         if worker_cancelled_check(): break
-                         time.sleep(0.1)
-                    if worker_cancelled_check(): 
-                        Logger.instance().debug(caller="GroqMusicModel", msg="[GroqMusicModel] Cancellation requested during sleep.")
-                        break
-            # ------------------
-
-            # --- Cancellation Check (After potential sleep) --- 
-            if worker_cancelled_check():
-                Logger.instance().debug(caller="GroqMusicModel", msg="[GroqMusicModel] Cancellation requested before batch processing.")
-                break # Exit the loop
-            # ------------------------
-
-            last_request_time = time.time() # Record time before API call
-
-            # Generate the prompt for this specific batch using filenames only
-            # --- Add logging ---
-            Logger.instance().debug(caller="GroqMusicModel", msg="[GroqMusicModel] Extracting basenames...")
-            # -------------------
-            batch_filenames_only = [os.path.basename(f) for f in batch_full_paths]
-            # --- Add logging ---
-            Logger.instance().debug(caller="GroqMusicModel", msg="[GroqMusicModel] Generating prompt string...")
-            # -------------------
-            prompt_string = generate_prompt(prompt_config, batch_filenames_only)
-            # --- Add logging ---
-            Logger.instance().debug(caller="GroqMusicModel", msg="[GroqMusicModel] Prompt string generated.")
-            # -------------------
-
-            # --- DEBUG: Print the final prompt --- 
-            Logger.instance().debug(caller="groq_music_model", msg="-" * 20 + " PROMPT START " + "-" * 20)
-            Logger.instance().debug(caller="groq_music_model", msg=prompt_string)
-            Logger.instance().debug(caller="groq_music_model", msg="-" * 20 + " PROMPT END " + "-" * 22)
-            # -------------------------------------
+        Logger.instance().info(caller="groq_music_model", msg=f"Starting classification for '{label}' with {total_files} files using {self.model_name}: "
+                                                              f"{len(answers)} cached, {len(pending_names)} to send in {len(batches)} batches.")
+
+        processed = len(answers)
+        if progress_callback:
+            progress_callback(processed, len(unique_names))
+
+        halted = threading.Event()
+        def should_stop() -> bool:
+            return halted.is_set() or worker_cancelled_check()
 
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="groq")
+        try:
+            futures = {executor.submit(self._classify_batch, batch, prompt_config, should_stop): batch for batch in batches}
+            not_done = set(futures)
+            while not_done:
+                if worker_cancelled_check():
+                    Logger.instance().debug(caller="GroqMusicModel", msg="[GroqMusicModel] Cancellation requested, stopping classification.")
+                    break
+                done, not_done = wait(not_done, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = futures[future]
+                    try:
+                        batch_answers = future.result()
+                    except ClassificationHalted as e:
+                        if not halted.is_set():
+                            halted.set()
+                            if error_callback:
+                                error_callback(str(e))
+                            else:
+                                Logger.instance().error(caller="groq_music_model", msg=str(e))
+                        continue
+                    if batch_answers is None:
+                        continue # Cancelled before it was sent
+                    answers.update(batch_answers)
+                    self.cache.put_many(label, version, batch_answers)
+                    processed += len(batch)
+                    if progress_callback:
+                        progress_callback(processed, len(unique_names))
+                if halted.is_set():
+                    Logger.instance().error(caller="GroqMusicModel", msg="[GroqMusicModel] Halting classification due to API error.")
+                    break
+        finally:
+            halted.set() # Tell in-flight batches to give up retrying
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.cache.save()
+
+        classified_paths = [f for f in filenames if answers.get(os.path.basename(f))]
+        Logger.instance().info(caller="groq_music_model", msg=f"Finished classification. Found {len(classified_paths)} matching files.")
+        return classified_paths
+
+    def _classify_batch(self, batch_filenames: List[str], prompt_config: Dict[str, Any], should_stop: Callable[[], bool]) -> Optional[Dict[str, bool]]:
+        """
+        Sends one batch (runs on an executor thread). Returns {filename: answer} for the lines
+        the model answered, None if stopped before sending, and raises ClassificationHalted
+        on errors that should end the run. Rate-limit errors are retried with backoff.
+        """
+        prompt_string = generate_prompt(prompt_config, batch_filenames)
+        attempt = 0
+        while True:
+            if not self.rate_limiter.acquire(should_stop):
+                return None
             try:
-                # === API Call and Parsing Logic Moved Here ===
-                Logger.instance().debug(caller="GroqMusicModel", msg=f"[GroqMusicModel] Processing batch {i // self.batch_size + 1} / {(total_files + self.batch_size - 1) // self.batch_size}")
-                
-                # --- Add logging before API call ---
-                Logger.instance().debug(caller="GroqMusicModel", msg="[GroqMusicModel] Attempting Groq API call...")
-                # -------------------------------------
-                
                 chat_completion = self.groq_client.chat.completions.create(
                     messages=[
                         {"role": "user", "content": prompt_string}
                     ],
                     model=self.model_name,
                 )
-                
-                # --- Add logging after API call ---
-                Logger.instance().info(caller="GroqMusicModel", msg="[GroqMusicModel] Groq API call finished.")
-                # -----------------------------------
-                
-                response_content = chat_completion.choices[0].message.content
-                
-                # Parse the response robustly
-                lines = response_content.strip().split('\n')
-                
-                for line_num, line in enumerate(lines):
-                    line = line.strip()
-                    if not line: continue
-                    try:
-                        parts = line.split('. ', 1)
-                        if len(parts) == 2 and parts[0].isdigit():
-                            list_num = int(parts[0])
-                            answer = parts[1].strip().lower()
-                            batch_index = list_num - 1 
-                            
-                            if 0 <= batch_index < len(batch_full_paths):
-                                if answer == "yes":
-                                    file_path = batch_full_paths[batch_index] # Use full path
-                                    classified_paths.append(file_path)
-                                elif answer == "no":
-                                    pass # Correctly identified as not matching
-                                else:
-                                    # Just print parsing warnings
-                                    Logger.instance().warning(caller="groq_music_model", msg=f"Warning: Unexpected answer '{answer}' for batch index {batch_index} (list num {list_num}) in line: '{line}'")
-                            else:
-                                Logger.instance().warning(caller="groq_music_model", msg=f"Warning: Parsed list number {list_num} out of range for current batch size {len(batch_full_paths)}. Line: '{line}'")
-                        else:
-                            Logger.instance().warning(caller="groq_music_model", msg=f"Warning: Could not parse response line format: '{line}'")
-                    except Exception as parse_err:
-                         Logger.instance().error(caller="groq_music_model", msg=f"Error parsing response line: '{line}'. Error: {parse_err}")
-                # ==============================================
-
-            # === Exception Handling Moved Here ===
-            except groq.APIConnectionError as e:
-                msg = f"Groq Connection Error: {e}"
-                if error_callback:
-                    error_callback(msg)
-                else:
-                    Logger.instance().error(caller="groq_music_model", msg=msg)
-                Logger.instance().error(caller="GroqMusicModel", msg="[GroqMusicModel] Halting classification due to connection error.")
-                break # Stop processing further batches
+                response_content = chat_completion.choices[0].message.content or ""
+                parsed = parse_classification_response(response_content, len(batch_filenames))
+                return {batch_filenames[idx]: answer for idx, answer in parsed.items()}
             except groq.RateLimitError as e:
-                msg = f"Groq Rate Limit Error: {e}."
-                if error_callback:
-                    error_callback(msg)
-                else:
-                    Logger.instance().warning(caller="groq_music_model", msg=msg)
-                Logger.instance().debug(caller="GroqMusicModel", msg="[GroqMusicModel] Halting classification due to rate limit.")
-                break # Stop processing further batches
+                attempt += 1
+                if attempt > self.max_retries:
+                    raise ClassificationHalted(f"Groq Rate Limit Error: {e}. Gave up after {self.max_retries} retries.")
+                delay = self._retry_delay(e, attempt)
+                Logger.instance().warning(caller="GroqMusicModel", msg=f"[GroqMusicModel] Rate limited; retry {attempt}/{self.max_retries} in {delay:.1f}s.")
+                self.rate_limiter.pause(delay)
+            except groq.APIConnectionError as e:
+                raise ClassificationHalted(f"Groq Connection Error: {e}")
             except groq.APIStatusError as e:
                 error_detail = f"Groq API Error (Status {e.status_code}): {e.message}"
-                if hasattr(e, 'body') and e.body and 'error' in e.body:
+                if hasattr(e, 'body') and isinstance(e.body, dict) and 'error' in e.body:
                     error_detail += f" - {e.body['error'].get('message', 'No additional details.')}"
-                if error_callback:
-                    error_callback(error_detail)
-                else:
-                    Logger.instance().error(caller="groq_music_model", msg=error_detail)
-                Logger.instance().error(caller="GroqMusicModel", msg="[GroqMusicModel] Halting classification due to API status error.")
-                break # Stop processing further batches
+                raise ClassificationHalted(error_detail)
             except Exception as e:
-                msg = f"Unexpected Error during batch processing: {e}"
-                if error_callback:
-                    error_callback(msg)
-                else:
-                    Logger.instance().error(caller="groq_music_model", msg=msg)
-                Logger.instance().error(caller="GroqMusicModel", msg="[GroqMusicModel] Halting classification due to unexpected error.")
-                break # Stop processing further batches
-            # ======================================
-            
-            # Update progress after processing batch
-            if progress_callback:
-                current_processed = min(i + self.batch_size, total_files)
-                progress_callback(current_processed, total_files)
+                raise ClassificationHalted(f"Unexpected Error during batch processing: {e}")
 
-        # --- Loop Finished --- 
-        Logger.instance().info(caller="groq_music_model", msg=f"Finished classification. Found {len(classified_paths)} matching files.")
-        return classified_paths 
\ No newline at end of file
+    @staticmethod
+    def _retry_delay(error: Exception, attempt: int) -> float:
+        """Honours the server's retry-after header if present, else exponential backoff with jitter."""
+        response = getattr(error, 'response', None)
+        retry_after = response.headers.get('retry-after') if response is not None else None
+        try:
+            if retry_after is not None:
+                return max(0.5, float(retry_after))
+        except ValueError:
+            pass
+        return min(60.0, 2.0 ** attempt) + random.uniform(0, 1.0)
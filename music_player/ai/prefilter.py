@@ -0,0 +1,184 @@
+# music_player/ai/prefilter.py
+"""
+Local, offline pre-filter that runs before remote classification.
+
+A prompt in aiprompts.json may carry a "prefilter" section; filenames that its rules
+decide are answered locally and only the ambiguous rest is sent to the model:
+
+    "prefilter": {
+        "exclude_keywords": ["remix", "karaoke"],   # any match -> NO
+        "include_keywords": ["symphony", "bwv"],    # any match -> YES
+        "exclude_scripts": ["hangul"],              # filename contains these scripts -> NO
+        "include_regex": ["\\bop\\.?\\s*\\d+"],     # case-insensitive regex on the filename
+        "exclude_extensions": [".wav"],
+        "min_duration": 60, "max_duration": 3600,   # seconds, only if a duration is known
+        "default": "ask"                            # undecided files: "ask" (send), "yes" or "no"
+    }
+
+A NO from any rule wins over a YES from another. Additional rules can be added
+with register_rule(); each receives the configured value and the FilenameFeatures
+and returns True (YES), False (NO) or None (no opinion).
+"""
+import os
+import re
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from qt_base_app.models.logger import Logger
+
+# (first, last) code point ranges used for script detection
+SCRIPT_RANGES: Dict[str, List[Tuple[int, int]]] = {
+    "latin": [(0x0041, 0x024F)],
+    "cyrillic": [(0x0400, 0x052F)],
+    "greek": [(0x0370, 0x03FF)],
+    "arabic": [(0x0600, 0x06FF), (0x0750, 0x077F)],
+    "hebrew": [(0x0590, 0x05FF)],
+    "thai": [(0x0E00, 0x0E7F)],
+    "devanagari": [(0x0900, 0x097F)],
+    "hangul": [(0x1100, 0x11FF), (0x3130, 0x318F), (0xAC00, 0xD7AF)],
+    "kana": [(0x3040, 0x30FF)],
+    "han": [(0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xF900, 0xFAFF)],
+}
+# "cjk" is accepted as shorthand for han + kana + hangul
+SCRIPT_ALIASES = {"cjk": ("han", "kana", "hangul")}
+
+DurationLookup = Callable[[str], Optional[float]]
+
+
+def detect_scripts(text: str) -> Set[str]:
+    """Returns the names of the scripts (see SCRIPT_RANGES) used by letters in text."""
+    scripts = set()
+    for ch in text:
+        if not ch.isalpha():
+            continue
+        cp = ord(ch)
+        for name, ranges in SCRIPT_RANGES.items():
+            if any(lo <= cp <= hi for lo, hi in ranges):
+                scripts.add(name)
+                break
+    return scripts
+
+
+@dataclass
+class FilenameFeatures:
+    """Cheap per-file features the rules look at. Duration is only fetched if a rule asks."""
+    path: str
+    name: str
+    text: str                       # lower-cased, accent-folded filename without extension
+    extension: str
+    scripts: Set[str]
+    _duration_lookup: Optional[DurationLookup] = field(default=None, repr=False)
+    _duration: Any = field(default=False, repr=False)  # False = not looked up yet
+
+    @classmethod
+    def from_path(cls, path: str, duration_lookup: Optional[DurationLookup] = None) -> 'FilenameFeatures':
+        name = os.path.basename(path)
+        stem, ext = os.path.splitext(name)
+        folded = unicodedata.normalize("NFKD", stem)
+        folded = "".join(ch for ch in folded if not unicodedata.combining(ch)).lower()
+        return cls(path=path, name=name, text=folded, extension=ext.lower(),
+                   scripts=detect_scripts(stem), _duration_lookup=duration_lookup)
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self._duration is False:
+            self._duration = self._duration_lookup(self.path) if self._duration_lookup else None
+        return self._duration
+
+
+def _expand_scripts(names) -> Set[str]:
+    expanded = set()
+    for name in names or []:
+        expanded.update(SCRIPT_ALIASES.get(name.lower(), (name.lower(),)))
+    return expanded
+
+def _normalize_separators(text: str) -> str:
+    return re.sub(r"[_\-.]+", " ", text).strip()
+
+def _keywords(value, features: FilenameFeatures) -> bool:
+    # Treat separators in filenames as spaces so "symphony_no_9" matches "symphony no"
+    text = _normalize_separators(features.text)
+    return any(_normalize_separators(kw.lower()) in text for kw in value or [])
+
+def _scripts(value, features: FilenameFeatures) -> bool:
+    return bool(features.scripts & _expand_scripts(value))
+
+def _regex(value, features: FilenameFeatures) -> bool:
+    return any(re.search(pattern, features.name, re.IGNORECASE) for pattern in value or [])
+
+def _extensions(value, features: FilenameFeatures) -> bool:
+    return features.extension in {e.lower() if e.startswith('.') else f".{e.lower()}" for e in value or []}
+
+def _min_duration(value, features: FilenameFeatures) -> Optional[bool]:
+    duration = features.duration
+    return None if duration is None else (False if duration < float(value) else None)
+
+def _max_duration(value, features: FilenameFeatures) -> Optional[bool]:
+    duration = features.duration
+    return None if duration is None else (False if duration > float(value) else None)
+
+
+# Rule name -> (check, verdict). A plain predicate rule yields `verdict` when it matches;
+# a rule registered with verdict None returns its own True/False/None.
+_RULES: Dict[str, Tuple[Callable[[Any, FilenameFeatures], Optional[bool]], Optional[bool]]] = {}
+
+def register_rule(name: str, check: Callable[[Any, FilenameFeatures], Optional[bool]], verdict: Optional[bool] = None):
+    """Registers a prefilter rule usable as a key in a prompt's "prefilter" section."""
+    _RULES[name] = (check, verdict)
+
+register_rule("exclude_keywords", _keywords, False)
+register_rule("exclude_scripts", _scripts, False)
+register_rule("exclude_regex", _regex, False)
+register_rule("exclude_extensions", _extensions, False)
+register_rule("min_duration", _min_duration)
+register_rule("max_duration", _max_duration)
+register_rule("include_keywords", _keywords, True)
+register_rule("include_scripts", _scripts, True)
+register_rule("include_regex", _regex, True)
+register_rule("include_extensions", _extensions, True)
+
+
+def evaluate(features: FilenameFeatures, rules: Dict[str, Any]) -> Optional[bool]:
+    """Applies the configured rules to one file: True/False if decided locally, None if ambiguous."""
+    # Any NO wins over a YES; files no rule decides fall back to the "default" setting
+    decided: Optional[bool] = None
+    for name, (check, verdict) in _RULES.items():
+        if name not in rules:
+            continue
+        result = check(rules[name], features)
+        if verdict is not None:
+            result = verdict if result else None
+        if result is False:
+            return False
+        if result is True and decided is None:
+            decided = True
+    if decided is not None:
+        return decided
+    default = str(rules.get("default", "ask")).lower()
+    return True if default == "yes" else False if default == "no" else None
+
+
+def prefilter_filenames(
+    filenames: List[str],
+    prompt_config: Dict[str, Any],
+    duration_lookup: Optional[DurationLookup] = None
+) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Splits filenames using the prompt's "prefilter" rules.
+
+    Returns:
+        (matched, rejected, ambiguous) lists of paths, in input order. Without a
+        "prefilter" section every file is ambiguous.
+    """
+    rules = prompt_config.get("prefilter") if prompt_config else None
+    if not rules:
+        return [], [], list(filenames)
+    unknown = [name for name in rules if name != "default" and name not in _RULES]
+    if unknown:
+        Logger.instance().warning(caller="prefilter", msg=f"Ignoring unknown prefilter rules: {unknown}")
+    matched, rejected, ambiguous = [], [], []
+    for path in filenames:
+        result = evaluate(FilenameFeatures.from_path(path, duration_lookup), rules)
+        (matched if result is True else rejected if result is False else ambiguous).append(path)
+    return matched, rejected, ambiguous
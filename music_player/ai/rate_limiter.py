@@ -0,0 +1,46 @@
+# music_player/ai/rate_limiter.py
+"""Token-bucket rate limiter shared by concurrent API request threads."""
+import threading
+import time
+from typing import Callable
+
+
+class TokenBucket:
+    """
+    Allows `rate_per_minute` requests on average with bursts of up to `capacity`.
+    acquire() blocks (in short, cancellable sleeps) until a token is available.
+    pause() makes every caller wait, e.g. after the server reported a rate limit.
+    """
+    def __init__(self, rate_per_minute: float, capacity: int = 1):
+        self._rate = max(rate_per_minute, 0.1) / 60.0  # tokens per second
+        self._capacity = max(1, capacity)
+        self._tokens = float(self._capacity)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self._capacity, self._tokens + (now - self._last_refill) * self._rate)
+        self._last_refill = now
+
+    def acquire(self, cancelled: Callable[[], bool] = lambda: False, poll_interval: float = 0.1) -> bool:
+        """Takes one token. Returns False if `cancelled()` became true while waiting."""
+        while True:
+            if cancelled():
+                return False
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now >= self._paused_until and self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return True
+                wait = max(self._paused_until - now, (1.0 - self._tokens) / self._rate)
+            time.sleep(min(wait, poll_interval))
+
+    def pause(self, seconds: float):
+        """Blocks all acquirers for at least `seconds` and empties the bucket."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            # Refill as if empty since just before the pause ends, so one request may go through then
+            self._tokens = 0.0
+            self._last_refill = self._paused_until - 1.0 / self._rate
@@ -0,0 +1,144 @@
+"""
+Rolling bandwidth statistics for the download subsystem.
+
+DownloadManager feeds every typed progress record (see CLIDownloadWorker.DownloadProgress)
+into BandwidthStats, which keeps a short window of byte deltas per download and derives:
+- current throughput per worker (download URL), per host and in total
+- a queue-wide ETA from the remaining bytes of active downloads plus an estimate
+  for queued items based on the average size of finished ones
+"""
+from __future__ import annotations
+
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+
+DEFAULT_WINDOW_S = 10.0
+
+
+@dataclass
+class BandwidthSnapshot:
+    total_rate: float                            # Bytes per second over the window
+    worker_rates: Dict[str, float] = field(default_factory=dict)   # url -> bytes/s
+    host_rates: Dict[str, float] = field(default_factory=dict)     # host -> bytes/s
+    active_count: int = 0
+    queued_count: int = 0
+    remaining_bytes: Optional[int] = None        # Known + estimated bytes still to download
+    queue_eta: Optional[float] = None            # Seconds until the whole queue is done
+
+
+class _WorkerTrack:
+    __slots__ = ("host", "started_at", "samples", "last_bytes", "last_filename", "stream_total", "done_streams_bytes")
+
+    def __init__(self, host: str, started_at: float):
+        self.host = host
+        self.started_at = started_at
+        self.samples: deque = deque()   # (timestamp, byte delta)
+        self.last_bytes = 0
+        self.last_filename: Optional[str] = None
+        self.stream_total: Optional[int] = None
+        self.done_streams_bytes = 0     # Bytes of finished streams (video before audio, ...)
+
+
+class BandwidthStats:
+    """Per-worker, per-host and total throughput over the last `window_s` seconds."""
+
+    def __init__(self, window_s: float = DEFAULT_WINDOW_S):
+        self.window_s = window_s
+        self._tracks: Dict[str, _WorkerTrack] = {}
+        self._finished_sizes: deque = deque(maxlen=50)  # Recent completed download sizes
+
+    @staticmethod
+    def host_for_url(url: str) -> str:
+        host = urlparse(url).netloc.lower()
+        return host[4:] if host.startswith("www.") else (host or "unknown")
+
+    def record(self, url: str, record, now: Optional[float] = None) -> None:
+        """Add one progress record for a download."""
+        now = time.monotonic() if now is None else now
+        track = self._tracks.get(url)
+        if track is None:
+            track = self._tracks[url] = _WorkerTrack(self.host_for_url(url), now)
+
+        downloaded = record.downloaded_bytes or 0
+        if record.filename != track.last_filename or downloaded < track.last_bytes:
+            # A new stream started (e.g. audio after video); bank the previous one
+            track.done_streams_bytes += track.last_bytes
+            track.last_bytes = 0
+            track.last_filename = record.filename
+
+        delta = downloaded - track.last_bytes
+        track.last_bytes = downloaded
+        track.stream_total = record.total_bytes
+        if delta > 0:
+            track.samples.append((now, delta))
+        self._trim(track, now)
+
+    def finish(self, url: str, completed: bool) -> None:
+        """Stop tracking a download; completed sizes feed the estimate for queued items."""
+        track = self._tracks.pop(url, None)
+        if track is not None and completed:
+            size = track.done_streams_bytes + max(track.last_bytes, track.stream_total or 0)
+            if size > 0:
+                self._finished_sizes.append(size)
+
+    def _trim(self, track: _WorkerTrack, now: float) -> None:
+        cutoff = now - self.window_s
+        while track.samples and track.samples[0][0] < cutoff:
+            track.samples.popleft()
+
+    def _average_item_bytes(self) -> Optional[float]:
+        sizes = list(self._finished_sizes)
+        for track in self._tracks.values():
+            if track.stream_total:
+                sizes.append(track.done_streams_bytes + track.stream_total)
+        return (sum(sizes) / len(sizes)) if sizes else None
+
+    def snapshot(self, queued_count: int = 0, now: Optional[float] = None) -> BandwidthSnapshot:
+        """Compute current rates and the queue-wide ETA."""
+        now = time.monotonic() if now is None else now
+        worker_rates: Dict[str, float] = {}
+        host_rates: Dict[str, float] = {}
+        remaining = 0
+        remaining_known = True
+
+        for url, track in self._tracks.items():
+            self._trim(track, now)
+            # Downloads younger than the window are averaged over their own lifetime
+            span = max(1.0, min(self.window_s, now - track.started_at))
+            rate = sum(delta for _, delta in track.samples) / span
+            worker_rates[url] = rate
+            host_rates[track.host] = host_rates.get(track.host, 0.0) + rate
+            if track.stream_total is not None:
+                remaining += max(0, track.stream_total - track.last_bytes)
+            else:
+                remaining_known = False
+
+        if queued_count:
+            average = self._average_item_bytes()
+            if average is None:
+                remaining_known = False
+            else:
+                remaining += int(average * queued_count)
+
+        total_rate = sum(worker_rates.values())
+        remaining_bytes = remaining if remaining_known else None
+        queue_eta = None
+        if remaining_bytes is not None and total_rate > 0:
+            queue_eta = remaining_bytes / total_rate
+
+        return BandwidthSnapshot(
+            total_rate=total_rate,
+            worker_rates=worker_rates,
+            host_rates=host_rates,
+            active_count=len(self._tracks),
+            queued_count=queued_count,
+            remaining_bytes=remaining_bytes,
+            queue_eta=queue_eta,
+        )
+
+    def has_activity(self) -> bool:
+        return bool(self._tracks)
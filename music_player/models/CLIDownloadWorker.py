@@ -8,13 +8,15 @@ import subprocess
 import json
 import shlex
 import sys
-import tempfile
 import platform
 import shutil
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Optional
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
 from qt_base_app.models.logger import Logger
 import threading
+from collections import deque
 import psutil
 
 # Import yt-dlp updater PathManager to locate yt-dlp.exe
@@ -35,28 +37,206 @@ SUBTITLE_EXTENSIONS = {
 }
 # -------------------------------
 
-# --- Define Progress Regex ---
-# Matches lines like: [download]  10.5% of 12.34MiB at 500.00KiB/s ETA 00:15
-# or              : [download]   5.0% of Unknown Size at 250.0KiB/s ETA Unknown
-# or              : [download] 100% of    7.52MiB in 00:00:03 at 2.00MiB/s
-PROGRESS_REGEX = re.compile(
-    r"\s*\[download\]\s+"                # "[download]" prefix
-    r"(?P<percent>\d+(?:\.\d+)?)%\s+"   # Percentage (integer or float, non-capturing group for decimal)
-    r"of.*?at\s+"                       # "of ... at " (covers 'in ...' implicitly)
-    r"(?P<speed>[^\s]+)"                # Speed (greedy should be fine here)
-    r"(?:\s+ETA\s+(?P<eta>[^\s]+))?"    # Optional ETA part (non-capturing outer group)
-)
-
-# Matches subtitle download progress lines like: [download]    1.00KiB at   90.79KiB/s (00:00:00)
-SUBTITLE_PROGRESS_REGEX = re.compile(
-    r"\s*\[download\]\s+"               # "[download]" prefix
-    r"(?P<size>[\d.]+\w+)\s+"           # Downloaded size (e.g., "1.00KiB", "255.00KiB")
-    r"at\s+"                            # "at " separator
-    r"(?P<speed>[^\s]+)"                # Speed (e.g., "90.79KiB/s")
-    r"(?:\s+\((?P<time>[^)]+)\))?"      # Optional time in parentheses (e.g., "(00:00:00)")
-)
+# --- Machine-readable progress ---
+# yt-dlp prints one JSON progress dict per line (with --newline) behind this marker,
+# e.g.: [progress-json] {"status": "downloading", "downloaded_bytes": 1024, ...}
+PROGRESS_MARKER = "[progress-json] "
+PROGRESS_TEMPLATE = f"download:{PROGRESS_MARKER}%(progress)j"
+
+
+def _to_number(value):
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def format_bytes(num_bytes):
+    """Format a byte count in yt-dlp's binary-unit style (e.g. 12.34MiB)."""
+    if num_bytes is None:
+        return "Unknown"
+    size = float(num_bytes)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(size) < 1024.0:
+            return f"{size:.2f}{unit}"
+        size /= 1024.0
+    return f"{size:.2f}TiB"
+
+
+def format_eta(seconds):
+    """Format an ETA in seconds as MM:SS or HH:MM:SS."""
+    if seconds is None:
+        return "Unknown"
+    seconds = int(seconds)
+    hours, remainder = divmod(seconds, 3600)
+    minutes, secs = divmod(remainder, 60)
+    if hours:
+        return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+    return f"{minutes:02d}:{secs:02d}"
+
+
+@dataclass(frozen=True)
+class DownloadProgress:
+    """One progress report from yt-dlp's JSON progress template."""
+    status: str                        # downloading | finished | error
+    downloaded_bytes: Optional[int]
+    total_bytes: Optional[int]         # Exact size, or yt-dlp's estimate for fragmented streams
+    total_is_estimate: bool
+    speed: Optional[float]             # Bytes per second
+    eta: Optional[float]               # Seconds
+    elapsed: Optional[float]           # Seconds
+    fragment_index: Optional[int]
+    fragment_count: Optional[int]
+    filename: Optional[str]
+
+    @classmethod
+    def from_json(cls, data):
+        total = _to_number(data.get('total_bytes'))
+        estimate = _to_number(data.get('total_bytes_estimate'))
+        return cls(
+            status=str(data.get('status') or 'downloading'),
+            downloaded_bytes=_to_number(data.get('downloaded_bytes')),
+            total_bytes=total if total is not None else estimate,
+            total_is_estimate=(total is None and estimate is not None),
+            speed=_to_number(data.get('speed')),
+            eta=_to_number(data.get('eta')),
+            elapsed=_to_number(data.get('elapsed')),
+            fragment_index=_to_number(data.get('fragment_index')),
+            fragment_count=_to_number(data.get('fragment_count')),
+            filename=data.get('filename'),
+        )
+
+    @property
+    def percent(self):
+        """Percentage of the current stream, or None when the size is unknown."""
+        if self.status == 'finished':
+            return 100.0
+        if self.downloaded_bytes is not None and self.total_bytes:
+            return min(100.0, self.downloaded_bytes * 100.0 / self.total_bytes)
+        if self.fragment_index is not None and self.fragment_count:
+            return min(100.0, self.fragment_index * 100.0 / self.fragment_count)
+        return None
+
+    @property
+    def is_subtitle(self):
+        return bool(self.filename) and os.path.splitext(self.filename)[1].lower() in SUBTITLE_EXTENSIONS
+
+    @property
+    def remaining_bytes(self):
+        if self.downloaded_bytes is None or self.total_bytes is None:
+            return None
+        return max(0, self.total_bytes - self.downloaded_bytes)
 # ---------------------------
 
+# Number of recent yt-dlp output lines kept per worker for diagnostics.
+# Everything needed after the process exits is tracked incrementally by DownloadOutputState.
+OUTPUT_BUFFER_LINES = 200
+
+ALREADY_DOWNLOADED_REGEX = re.compile(r"^\[download\]\s+(?P<path>.+?)\s+has already been downloaded")
+QUOTED_PATH_REGEX = re.compile(r'"(.*?)"')
+
+
+class DownloadOutputState:
+    """
+    Incremental parser for the non-progress lines of yt-dlp output.
+    
+    Each line is inspected once as it arrives, so nothing has to be re-scanned after
+    the process exits. `feed` returns the kind of event the line represents (or None).
+    """
+    
+    PHASE_STARTING = "starting"
+    PHASE_DOWNLOADING = "downloading"
+    PHASE_MERGING = "merging"
+    PHASE_FIXING = "fixing"
+    PHASE_EMBEDDING = "embedding"
+    
+    EVENT_DESTINATION = "destination"
+    EVENT_MERGING = "merging"
+    EVENT_FIXING = "fixing"
+    EVENT_EMBEDDING = "embedding"
+    EVENT_ALREADY_DOWNLOADED = "already_downloaded"
+    EVENT_ERROR = "error"
+    
+    def __init__(self):
+        self.phase = self.PHASE_STARTING
+        self.last_destination = None      # Path from the latest "Destination:" line
+        self.final_path = None            # Path reported by Merger/FixupM3u8/EmbedSubtitle
+        self.already_downloaded = False
+        self.already_downloaded_path = None
+        self.last_error = None
+    
+    def feed(self, line):
+        """Advance the state with one output line and return the event it produced."""
+        stripped = line.strip()
+        
+        if stripped.startswith('[download]'):
+            if 'Destination:' in stripped:
+                self.phase = self.PHASE_DOWNLOADING
+                self.last_destination = stripped.split('Destination: ', 1)[1].strip()
+                return self.EVENT_DESTINATION
+            if 'has already been downloaded' in stripped:
+                self.already_downloaded = True
+                match = ALREADY_DOWNLOADED_REGEX.search(stripped)
+                if match:
+                    self.already_downloaded_path = match.group('path').strip()
+                return self.EVENT_ALREADY_DOWNLOADED
+            return None
+        
+        if stripped.startswith('[Merger]') and 'Merging formats into' in stripped:
+            match = re.search(r'Merging formats into "(.*?)"', stripped)
+            if match:
+                self.phase = self.PHASE_MERGING
+                self.final_path = match.group(1)
+                return self.EVENT_MERGING
+            return None
+        
+        if stripped.startswith('[FixupM3u8]'):
+            match = QUOTED_PATH_REGEX.search(stripped)
+            if match:
+                self.phase = self.PHASE_FIXING
+                self.final_path = match.group(1)
+                return self.EVENT_FIXING
+            return None
+        
+        if stripped.startswith('[EmbedSubtitle]') and 'Embedding subtitles in' in stripped:
+            self.phase = self.PHASE_EMBEDDING
+            match = QUOTED_PATH_REGEX.search(stripped)
+            if match:
+                self.final_path = match.group(1)
+            return self.EVENT_EMBEDDING
+        
+        if 'ERROR:' in stripped:
+            self.last_error = stripped
+            return self.EVENT_ERROR
+        
+        return None
+
+
+def resolve_ytdlp_path():
+    """
+    Get the path to the yt-dlp executable.
+    Shared by download workers and the DownloadManager's batch stages.
+    Uses the updater's PathManager if available, otherwise tries to find in PATH.
+    
+    Returns:
+        str: Path to yt-dlp executable
+    """
+    if YTDLP_PATH_MANAGER_AVAILABLE:
+        try:
+            path_manager = YtDlpPathManager()
+            install_path = path_manager.get_install_path()
+            
+            # Check if the file exists at the expected location
+            if os.path.exists(install_path):
+                Logger.instance().debug(caller="CLIDownloadWorker", msg=f"Using yt-dlp from updater path: {install_path}")
+                return install_path
+            else:
+                Logger.instance().warning(caller="CLIDownloadWorker", msg=f"yt-dlp not found at expected path: {install_path}")
+        except Exception as e:
+            Logger.instance().warning(caller="CLIDownloadWorker", msg=f"Error getting yt-dlp path from updater: {e}")
+    
+    # Fallback to trying PATH
+    Logger.instance().debug(caller="CLIDownloadWorker", msg="Falling back to searching for yt-dlp in system PATH")
+    return "yt-dlp"
+
+
 class CLIDownloadWorker(QObject):
     """Worker object for processing a single download using the yt-dlp CLI.
     Designed to be moved to a separate QThread.
@@ -67,6 +247,7 @@ class CLIDownloadWorker(QObject):
     complete_signal = pyqtSignal(str, str, str)    # url, output_dir, filename
     error_signal = pyqtSignal(str, str)            # url, error message
     processing_signal = pyqtSignal(str, str)       # url, status message
+    progress_record_signal = pyqtSignal(str, object)  # url, DownloadProgress (exact byte counts)
     # Add finished signal
     finished = pyqtSignal()                        # Emitted when processing is done (success or fail)
     
@@ -90,7 +271,8 @@ class CLIDownloadWorker(QObject):
         self.temporary_filenames = [] # List to store potential temp/stream filenames
         self.process = None
         self._process_lock = threading.Lock() # Add lock for thread safety
-        self._process_output = [] # Store output lines for later analysis
+        self._process_output = deque(maxlen=OUTPUT_BUFFER_LINES) # Recent output lines only (bounded)
+        self._output_state = DownloadOutputState() # Incrementally parsed download state
     
     @pyqtSlot() # Make run a slot
     def run(self):
@@ -112,10 +294,6 @@ class CLIDownloadWorker(QObject):
             safe_cmd = self._get_safe_command_string(cmd)
             self.logger.debug(caller="CLIDownloadWorker", msg=f"Executing command: {safe_cmd}")
             
-            # Create a temporary file for progress output
-            with tempfile.NamedTemporaryFile(mode='w+', delete=False, suffix='.json') as progress_file:
-                progress_file_path = progress_file.name
-            
             # Set up process with hidden window on Windows
             popen_kwargs = {
                 'stdout': subprocess.PIPE,
@@ -161,104 +339,57 @@ class CLIDownloadWorker(QObject):
 
                     # --- Refactored Parsing Logic ---
                     
-                    # 1. Check for Progress Line using Main Regex (video/audio with percentages)
-                    progress_match = PROGRESS_REGEX.search(line)
-                    if progress_match:
+                    # 1. Progress lines come from --progress-template as one JSON dict per line
+                    if line.startswith(PROGRESS_MARKER):
                         try:
-                            percentage = float(progress_match.group('percent'))
-                            speed = progress_match.group('speed')
-                            eta = progress_match.group('eta')
-                            status_text = f"Downloading: {percentage:.1f}% at {speed}, ETA: {eta}"
-                            
-                            # Emit progress update
-                            self.progress_signal.emit(self.url, percentage, status_text)
-                            
+                            record = DownloadProgress.from_json(json.loads(line[len(PROGRESS_MARKER):]))
                         except Exception as e:
-                            self.logger.error(caller="CLIDownloadWorker", msg=f"Error parsing progress regex match: {str(e)} - Line: {line.strip()}")
+                            self.logger.error(caller="CLIDownloadWorker", msg=f"Error parsing progress JSON: {str(e)} - Line: {line.strip()}")
+                            continue
+                        self._emit_progress(record)
                         continue # Move to the next line after handling progress
 
-                    # 2. Check for Subtitle Progress Line (raw data amounts)
-                    subtitle_progress_match = SUBTITLE_PROGRESS_REGEX.search(line)
-                    if subtitle_progress_match:
-                        try:
-                            size = subtitle_progress_match.group('size')
-                            speed = subtitle_progress_match.group('speed')
-                            time_elapsed = subtitle_progress_match.group('time') or "ongoing"
-                            status_text = f"Downloading subtitles: {size} at {speed} ({time_elapsed})"
-                            
-                            # For subtitle progress, we can't calculate exact percentage without knowing total size
-                            # Use a small progress value to show activity without indicating actual completion
-                            subtitle_progress = 5.0  # Small progress indicator
-                            
-                            # Emit progress update
-                            self.progress_signal.emit(self.url, subtitle_progress, status_text)
-                            
-                        except Exception as e:
-                            self.logger.error(caller="CLIDownloadWorker", msg=f"Error parsing subtitle progress regex match: {str(e)} - Line: {line.strip()}")
-                        continue # Move to the next line after handling subtitle progress
-
-                    # 3. If NOT a progress line, print it to logger and check for other keywords
-                    self.logger.info(caller="CLIDownloadWorker", msg=f"[yt-dlp output] {line.strip()}") # Log non-progress lines as INFO
+                    # 3. If NOT a progress line, advance the output state machine
+                    self.logger.debug(caller="CLIDownloadWorker", msg=f"[yt-dlp output] {line.strip()}")
+                    event = self._output_state.feed(line)
                     
-                    # Check for Destination:
-                    if '[download]' in line and 'Destination:' in line:
+                    if event == DownloadOutputState.EVENT_DESTINATION:
                         downloading_started = True
-                        output_file = line.split('Destination: ')[1].strip()
+                        output_file = self._output_state.last_destination
                         self.logger.info(caller="CLIDownloadWorker", msg=f"Downloading to: {output_file}")
                         # Store ALL potential temporary filenames reported
                         basename = os.path.basename(output_file)
                         if basename not in self.temporary_filenames:
                             self.temporary_filenames.append(basename)
                             self.logger.debug(caller="CLIDownloadWorker", msg=f"Added temporary filename candidate: {basename}") 
-                        continue # Handled, move to next line
-
-                    # Check for Merger:
-                    if line.strip().startswith('[Merger]') and 'Merging formats into' in line:
-                        match = re.search(r'Merging formats into "(.*?)"', line)
-                        if match:
-                            merged_filepath = match.group(1)
-                            # This is the FINAL filename
-                            self.downloaded_filename = os.path.basename(merged_filepath)
-                            self.logger.info(caller="CLIDownloadWorker", msg=f"Detected final merged file: {self.downloaded_filename}")
-                            
-                            # Emit progress update for merging phase
-                            self.progress_signal.emit(self.url, 100.0, "Merging video+audio...")
-                        continue # Handled, move to next line
-
-                    # Check for FixupM3u8 (HLS fixup writes directly to final container)
-                    if line.strip().startswith('[FixupM3u8]') and '"' in line:
-                        try:
-                            match = re.search(r'\"(.*?)\"', line)
-                            if match:
-                                final_path = match.group(1)
-                                self.downloaded_filename = os.path.basename(final_path)
-                                self.logger.info(caller="CLIDownloadWorker", msg=f"Detected final file from FixupM3u8: {self.downloaded_filename}")
-                                # Indicate post-processing phase
-                                self.progress_signal.emit(self.url, 100.0, "Fixing container...")
-                        except Exception as e_fix:
-                            self.logger.warning(caller="CLIDownloadWorker", msg=f"Failed to parse FixupM3u8 line: {e_fix}")
-                        continue
-
-                    # Check for Subtitle Embedding:
-                    if line.strip().startswith('[EmbedSubtitle]') and 'Embedding subtitles in' in line:
-                        try:
-                            match = re.search(r'\"(.*?)\"', line)
-                            if match:
-                                final_path = match.group(1)
-                                self.downloaded_filename = os.path.basename(final_path)
-                                self.logger.info(caller="CLIDownloadWorker", msg=f"Detected final file from EmbedSubtitle: {self.downloaded_filename}")
-                        except Exception:
-                            pass
+
+                    elif event == DownloadOutputState.EVENT_MERGING:
+                        # This is the FINAL filename
+                        self.downloaded_filename = os.path.basename(self._output_state.final_path)
+                        self.logger.info(caller="CLIDownloadWorker", msg=f"Detected final merged file: {self.downloaded_filename}")
+                        # Emit progress update for merging phase
+                        self.progress_signal.emit(self.url, 100.0, "Merging video+audio...")
+
+                    elif event == DownloadOutputState.EVENT_FIXING:
+                        # HLS fixup writes directly to final container
+                        self.downloaded_filename = os.path.basename(self._output_state.final_path)
+                        self.logger.info(caller="CLIDownloadWorker", msg=f"Detected final file from FixupM3u8: {self.downloaded_filename}")
+                        # Indicate post-processing phase
+                        self.progress_signal.emit(self.url, 100.0, "Fixing container...")
+
+                    elif event == DownloadOutputState.EVENT_EMBEDDING:
+                        if self._output_state.final_path:
+                            self.downloaded_filename = os.path.basename(self._output_state.final_path)
+                            self.logger.info(caller="CLIDownloadWorker", msg=f"Detected final file from EmbedSubtitle: {self.downloaded_filename}")
                         # Emit progress update for subtitle embedding phase
                         self.progress_signal.emit(self.url, 100.0, "Embedding subtitles...")
-                        continue # Handled, move to next line
-                        
-                    # Check for Errors:
-                    if 'ERROR:' in line:
-                        error_msg = line.strip()
+
+                    elif event == DownloadOutputState.EVENT_ALREADY_DOWNLOADED:
+                        self.logger.info(caller="CLIDownloadWorker", msg=f"yt-dlp reports file already downloaded: {self._output_state.already_downloaded_path or 'unknown'}")
+
+                    elif event == DownloadOutputState.EVENT_ERROR:
                         # Log error but continue processing output
-                        self.logger.error(caller="CLIDownloadWorker", msg=f"Error detected during download: {error_msg}")
-                        # No continue here, let it fall through if needed
+                        self.logger.error(caller="CLIDownloadWorker", msg=f"Error detected during download: {self._output_state.last_error}")
 
                     # --- End Refactored Parsing Logic ---
 
@@ -424,7 +555,10 @@ class CLIDownloadWorker(QObject):
                     error_msg = f"yt-dlp process exited with code {return_code}"
                     self.logger.warning(caller="CLIDownloadWorker", msg=f"{error_msg} (Cancelled: {self.cancelled}) URL: {self.url}") 
                     
-                    # Try to get specific error from stderr captured above
+                    # Use the last ERROR line seen on the (merged) output stream,
+                    # or a more specific one from any separately captured stderr
+                    if self._output_state.last_error:
+                        error_msg = self._output_state.last_error
                     if stderr_output:
                         error_lines = stderr_output.splitlines()
                         for line in reversed(error_lines):
@@ -432,6 +566,9 @@ class CLIDownloadWorker(QObject):
                                 error_msg = line.strip()
                                 break
                     
+                    # Recent output tail helps diagnose the failure without keeping the whole log
+                    self.logger.debug(caller="CLIDownloadWorker", msg=f"Last {len(self._process_output)} yt-dlp output lines:\n{''.join(self._process_output)}")
+                    
                     # Emit error signal (already confirmed not cancelled)
                     self.error_signal.emit(self.url, error_msg)
                     
@@ -456,8 +593,8 @@ class CLIDownloadWorker(QObject):
                         # If only subtitles were tracked or none at all
                         self.logger.warning(caller="CLIDownloadWorker", msg="No media filename captured directly via tracking.")
                         
-                        # Check if file already exists by examining stdout output
-                        already_exists, detected_filename = self._check_if_already_downloaded(self._process_output, stderr_output)
+                        # Check if file already exists from the incrementally tracked output state
+                        already_exists, detected_filename = self._check_if_already_downloaded(stderr_output)
                         if already_exists:
                             self.logger.info(caller="CLIDownloadWorker", msg=f"File already exists: {detected_filename or 'unknown'}")
                             self.error_signal.emit(self.url, "Already Exists")
@@ -470,29 +607,10 @@ class CLIDownloadWorker(QObject):
                             # Exit the method to prevent further output parsing and error emission
                             return
                         else:
-                            # Check once more by looking for the "has already been downloaded" message
-                            # directly in the stdout/stderr outputs
-                            
-                            # Check if we can find the message in merged stdout/stderr
-                            all_output = ""
-                            if stderr_output:
-                                all_output += stderr_output
-                            
-                            try:
-                                if local_process.stdout:
-                                    local_process.stdout.seek(0)
-                                    stdout_content = local_process.stdout.read()
-                                    all_output += stdout_content
-                            except:
-                                pass  # Can't seek stdout, continue with what we have
-                                
-                            if "has already been downloaded" in all_output:
-                                self.logger.info(caller="CLIDownloadWorker", msg=f"Detected file already exists from stdout/stderr")
-                                self.error_signal.emit(self.url, "Already Exists")
-                            else:
                         # Note: Disk scan fallback was removed as unreliable. We rely on Merger or last media file.
                         # If we reach here, self.downloaded_filename remains None.
-                                self.error_signal.emit(self.url, "Download finished but could not determine output filename.")
+                            self.error_signal.emit(self.url, "Download finished but could not determine output filename.")
+                            return
 
                 if self.downloaded_filename:
                      final_filepath = os.path.join(self.output_dir, self.downloaded_filename)
@@ -536,6 +654,24 @@ class CLIDownloadWorker(QObject):
             with self._process_lock:
                 self.process = None # Allow garbage collection
     
+    def _emit_progress(self, record):
+        """Emit both the typed progress record and the percent/status text used by the queue tiles."""
+        self.progress_record_signal.emit(self.url, record)
+        
+        speed = f"{format_bytes(record.speed)}/s" if record.speed is not None else "Unknown"
+        percentage = record.percent
+        if percentage is None or (record.is_subtitle and record.total_bytes is None):
+            # Subtitles (and some live streams) have no known total size.
+            # Use a small progress value to show activity without indicating actual completion
+            elapsed = format_eta(record.elapsed) if record.elapsed is not None else "ongoing"
+            label = "Downloading subtitles" if record.is_subtitle else "Downloading"
+            status_text = f"{label}: {format_bytes(record.downloaded_bytes)} at {speed} ({elapsed})"
+            self.progress_signal.emit(self.url, 5.0, status_text)
+            return
+        
+        status_text = f"Downloading: {percentage:.1f}% at {speed}, ETA: {format_eta(record.eta)}"
+        self.progress_signal.emit(self.url, percentage, status_text)
+
     def _get_ytdlp_executable_path(self):
         """
         Get the path to the yt-dlp executable.
@@ -544,27 +680,7 @@ class CLIDownloadWorker(QObject):
         Returns:
             str: Path to yt-dlp executable
         """
-        if YTDLP_PATH_MANAGER_AVAILABLE:
-            try:
-                path_manager = YtDlpPathManager()
-                install_path = path_manager.get_install_path()
-                
-                # Check if the file exists at the expected location
-                if os.path.exists(install_path):
-                    self.logger.debug(caller="CLIDownloadWorker", 
-                                     msg=f"Using yt-dlp from updater path: {install_path}")
-                    return install_path
-                else:
-                    self.logger.warning(caller="CLIDownloadWorker", 
-                                       msg=f"yt-dlp not found at expected path: {install_path}")
-            except Exception as e:
-                self.logger.warning(caller="CLIDownloadWorker", 
-                                   msg=f"Error getting yt-dlp path from updater: {e}")
-        
-        # Fallback to trying PATH
-        self.logger.debug(caller="CLIDownloadWorker", 
-                         msg="Falling back to searching for yt-dlp in system PATH")
-        return "yt-dlp"
+        return resolve_ytdlp_path()
 
     def _build_ytdlp_command(self):
         """Build the yt-dlp command with all necessary options."""
@@ -783,7 +899,9 @@ class CLIDownloadWorker(QObject):
         # Add other useful flags
         cmd.extend([
             "--no-mtime",        # Don't use the media timestamp
-            "--progress"         # Show progress bar
+            "--progress",        # Show progress even though output is piped
+            "--newline",         # One progress report per line
+            "--progress-template", PROGRESS_TEMPLATE  # Machine-readable progress (see DownloadProgress)
         ])
         
         # Finally add the URL
@@ -956,55 +1074,36 @@ class CLIDownloadWorker(QObject):
         # DO NOT start a thread here.
         # The main _execute_download loop will detect self.cancelled and handle termination/cleanup.
         
-    def _check_if_already_downloaded(self, output_lines, stderr_content=None):
+    def _check_if_already_downloaded(self, stderr_content=None):
         """
-        Check if the output contains messages indicating the file has already been downloaded.
+        Check whether yt-dlp reported that the file has already been downloaded.
+        
+        The output stream is parsed incrementally by DownloadOutputState, so this is O(1)
+        apart from any separately captured stderr.
         
         Args:
-            output_lines (list): List of output lines to check
             stderr_content (str, optional): Additional error output to check
             
         Returns:
             tuple: (already_exists, filename) - Boolean if already exists, and filename if detected
         """
-        already_exists = False
+        already_exists = self._output_state.already_downloaded
         detected_filename = None
+        if self._output_state.already_downloaded_path:
+            detected_filename = os.path.basename(self._output_state.already_downloaded_path)
         
-        # Pattern to match file paths. This pattern looks for a drive letter,
-        # followed by a colon and backslash, then any characters that are not
-        # invalid in a filename, and stops before " has already been downloaded".
-        path_pattern = r'([A-Za-z]:\\[^"<>|:*?\r\n]+?)(?=\s+has already been downloaded)'
-        
-        # First check output lines
-        for line in output_lines:
-            if "has already been downloaded" in line:
-                already_exists = True
-                
-                # Try to extract the filename using regex for Windows paths
-                import re
-                matches = re.findall(path_pattern, line)
-                if matches:
-                    file_path = matches[0]
-                    self.logger.info(caller="CLIDownloadWorker", msg=f"Found file path: {file_path}")
-                    detected_filename = os.path.basename(file_path)
-                break
-        
-        # If not found in output lines, check stderr
-        if not already_exists and stderr_content:
-            if "has already been downloaded" in stderr_content:
-                already_exists = True
-                
-                # Try to extract the filename from stderr
-                import re
-                matches = re.findall(path_pattern, stderr_content)
-                if matches:
-                    file_path = matches[0]
-                    self.logger.info(caller="CLIDownloadWorker", msg=f"Found file path in stderr: {file_path}")
-                    detected_filename = os.path.basename(file_path)
+        # If not found in the output stream, check stderr
+        if not already_exists and stderr_content and "has already been downloaded" in stderr_content:
+            already_exists = True
+            for line in stderr_content.splitlines():
+                match = ALREADY_DOWNLOADED_REGEX.search(line.strip())
+                if match:
+                    self.logger.info(caller="CLIDownloadWorker", msg=f"Found file path in stderr: {match.group('path')}")
+                    detected_filename = os.path.basename(match.group('path').strip())
+                    break
         
         # If we found it exists but couldn't get filename, log this
         if already_exists and not detected_filename:
             self.logger.warning(caller="CLIDownloadWorker", msg="File exists but couldn't extract filename from output")
             
         return already_exists, detected_filename
-        
\ No newline at end of file
@@ -2,18 +2,24 @@
 Download manager for handling multiple YouTube downloads.
 """
 import os
+import copy
 import threading
 import time
 from typing import Dict, List, Optional, Any, Tuple
 from queue import Queue
 
-from PyQt6.QtCore import QObject, pyqtSignal, QThread, QMutex, QUrl, QTimer, pyqtSlot
+import requests
+from PyQt6.QtCore import QObject, pyqtSignal, QThread, QMutex, QUrl, QTimer, pyqtSlot, QRunnable, QThreadPool
 from PyQt6.QtGui import QPixmap
 from PyQt6.QtCore import Qt
 
 from qt_base_app.models.logger import Logger
 from .SiteModel import SiteModel
-from .CLIDownloadWorker import CLIDownloadWorker
+from .CLIDownloadWorker import CLIDownloadWorker, resolve_ytdlp_path
+from .PlaylistExpander import PlaylistEntry, expand_playlist
+from .StreamPicker import prefetch_probe, PROBE_CACHE_MAX_ENTRIES
+from .BandwidthStats import BandwidthStats, BandwidthSnapshot
+from .PostDownloadPipeline import PostDownloadPipeline, STAGE_LABELS
 
 # Import yt-dlp updater for automatic updates
 try:
@@ -25,15 +31,98 @@ except ImportError as e:
     Logger.instance().warning(caller="DownloadManager", msg=f"Warning: yt-dlp updater not available: {e}")
     YTDLP_UPDATER_AVAILABLE = False
 
+# Bounded concurrency for the batch stages that run after a playlist is expanded
+MAX_CONCURRENT_PROBES = 3
+MAX_CONCURRENT_THUMBNAILS = 4
+# Only the next few queued entries are probed ahead; the window is topped up as downloads start
+PROBE_PREFETCH_AHEAD = min(6, PROBE_CACHE_MAX_ENTRIES)
+
+THUMBNAIL_WIDTH = 160
+THUMBNAIL_HEIGHT = 90
+
+
+def _fit_thumbnail(pixmap: QPixmap) -> QPixmap:
+    """Scale and center-crop a thumbnail to the queue tile size."""
+    scaled_pixmap = pixmap.scaled(
+        THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT,
+        Qt.AspectRatioMode.KeepAspectRatioByExpanding,
+        Qt.TransformationMode.SmoothTransformation
+    )
+    if scaled_pixmap.width() > THUMBNAIL_WIDTH or scaled_pixmap.height() > THUMBNAIL_HEIGHT:
+        x = (scaled_pixmap.width() - THUMBNAIL_WIDTH) // 2 if scaled_pixmap.width() > THUMBNAIL_WIDTH else 0
+        y = (scaled_pixmap.height() - THUMBNAIL_HEIGHT) // 2 if scaled_pixmap.height() > THUMBNAIL_HEIGHT else 0
+        scaled_pixmap = scaled_pixmap.copy(int(x), int(y), THUMBNAIL_WIDTH, THUMBNAIL_HEIGHT)
+    return scaled_pixmap
+
+
+class BatchWorkerSignals(QObject):
+    """Signals for the playlist expansion, thumbnail and probe runnables."""
+    playlist_ready = pyqtSignal(str, list)    # playlist url, [PlaylistEntry]
+    playlist_failed = pyqtSignal(str, str)    # playlist url, error message
+    thumbnail_ready = pyqtSignal(str, bytes)  # url, raw image bytes
+
+
+class PlaylistExpandWorker(QRunnable):
+    """Runs a single flat-playlist extraction off the GUI thread."""
+    def __init__(self, url: str, signals: BatchWorkerSignals):
+        super().__init__()
+        self.url = url
+        self.signals = signals
+
+    def run(self):
+        try:
+            entries = expand_playlist(ytdlp_path=resolve_ytdlp_path(), url=self.url)
+            self.signals.playlist_ready.emit(self.url, entries)
+        except Exception as e:
+            self.signals.playlist_failed.emit(self.url, str(e))
+
+
+class ThumbnailFetchWorker(QRunnable):
+    """Downloads a pre-resolved thumbnail URL; the pixmap is built on the GUI thread."""
+    def __init__(self, url: str, thumbnail_url: str, signals: BatchWorkerSignals):
+        super().__init__()
+        self.url = url
+        self.thumbnail_url = thumbnail_url
+        self.signals = signals
+
+    def run(self):
+        try:
+            response = requests.get(self.thumbnail_url, timeout=15.0)
+            if response.status_code == 200 and response.content:
+                self.signals.thumbnail_ready.emit(self.url, response.content)
+        except Exception as e:
+            Logger.instance().debug(caller="DownloadManager", msg=f"Thumbnail fetch failed for {self.url}: {e}")
+
+
+class ProbePrefetchWorker(QRunnable):
+    """Warms StreamPicker's probe cache so the download worker can skip its own probe."""
+    def __init__(self, url: str):
+        super().__init__()
+        self.url = url
+
+    def run(self):
+        try:
+            prefetch_probe(ytdlp_path=resolve_ytdlp_path(), url=self.url)
+        except Exception as e:
+            # The download worker will simply probe again
+            Logger.instance().debug(caller="DownloadManager", msg=f"Probe prefetch failed for {self.url}: {e}")
+
+
 class DownloadManager(QObject):
     """Manager for handling multiple YouTube downloads."""
     
     # Define signals
     queue_updated = pyqtSignal()
     download_started = pyqtSignal(str, str, QPixmap)  # url, title, thumbnail
+    thumbnail_updated = pyqtSignal(str, QPixmap)  # url, thumbnail (prefetched for a queued item)
     download_progress = pyqtSignal(str, float, str)  # url, progress percentage, status text
+    download_progress_detail = pyqtSignal(str, object)  # url, DownloadProgress (exact byte counts)
     download_complete = pyqtSignal(str, str, str)  # url, output_dir, filename
     download_error = pyqtSignal(str, str)  # url, error message
+    bandwidth_updated = pyqtSignal(object)  # BandwidthSnapshot (rates per worker/host/total, queue ETA)
+    playlist_expansion_started = pyqtSignal(str)  # playlist url
+    playlist_expanded = pyqtSignal(str, int)  # playlist url, number of entries added
+    playlist_error = pyqtSignal(str, str)  # playlist url, error message
     
     def __init__(self, parent=None):
         """Initialize the download manager."""
@@ -57,6 +146,33 @@ class DownloadManager(QObject):
         # Quick metadata fetch thread tracking (remains the same)
         self._quick_metadata_threads = {} 
         
+        # Playlist expansion and its bounded follow-up stages (thumbnails, format probes)
+        self._batch_signals = BatchWorkerSignals()
+        self._batch_signals.playlist_ready.connect(self._on_playlist_ready)
+        self._batch_signals.playlist_failed.connect(self._on_playlist_failed)
+        self._batch_signals.thumbnail_ready.connect(self._on_thumbnail_ready)
+        self._playlist_requests = {}  # playlist url -> (format_options, output_dir)
+        self._expand_pool = QThreadPool()
+        self._expand_pool.setMaxThreadCount(1)
+        self._thumbnail_pool = QThreadPool()
+        self._thumbnail_pool.setMaxThreadCount(MAX_CONCURRENT_THUMBNAILS)
+        self._probe_pool = QThreadPool()
+        self._probe_pool.setMaxThreadCount(MAX_CONCURRENT_PROBES)
+        self._prefetched = set()  # queued urls whose probe has been scheduled
+        
+        # Rolling bandwidth statistics, published once per second while downloads are active
+        self._bandwidth = BandwidthStats()
+        self._bandwidth_timer = QTimer(self)
+        self._bandwidth_timer.setInterval(1000)
+        self._bandwidth_timer.timeout.connect(self._emit_bandwidth)
+        
+        # Post-download stages (MP3 conversion, compression, OPlayer upload), each on its own pool
+        self._post_pipeline = PostDownloadPipeline(self)
+        self._post_pipeline.stage_started.connect(self._on_post_stage_started)
+        self._post_pipeline.stage_progress.connect(self._on_post_stage_progress)
+        self._post_pipeline.stage_failed.connect(self._on_post_stage_failed)
+        self._post_pipeline.pipeline_finished.connect(self._on_post_pipeline_finished)
+        
         # yt-dlp update tracking
         self._update_check_in_progress = False
         self._last_update_check_time = None
@@ -135,6 +251,132 @@ class DownloadManager(QObject):
         
         return False
     
+    def add_playlist(self, url, format_options=None, output_dir=None):
+        """
+        Expand a playlist or channel URL with one flat extraction and enqueue every entry.
+        
+        Args:
+            url (str): The playlist or channel URL
+            format_options (dict or str): Format options applied to every entry
+            output_dir (str): The output directory for downloaded files
+        
+        Returns:
+            bool: True if expansion started, False if it is already running for this URL
+        """
+        if url in self._playlist_requests:
+            Logger.instance().debug(caller="DownloadManager", msg=f"Playlist expansion already in progress: {url}")
+            return False
+        
+        self._playlist_requests[url] = (format_options, output_dir)
+        Logger.instance().info(caller="DownloadManager", msg=f"Expanding playlist: {url}")
+        self._expand_pool.start(PlaylistExpandWorker(url, self._batch_signals))
+        self.playlist_expansion_started.emit(url)
+        return True
+    
+    def add_downloads(self, entries: List[PlaylistEntry], format_options=None, output_dir=None):
+        """
+        Add a batch of entries with pre-filled titles to the download queue.
+        
+        Emits a single queue update for the whole batch, then fetches thumbnails and
+        format probes for the still-queued entries with bounded concurrency.
+        
+        Returns:
+            int: Number of entries actually added (duplicates are skipped)
+        """
+        added: List[PlaylistEntry] = []
+        
+        self._mutex.lock()
+        try:
+            known = set(self._queue) | set(self._active) | set(self._completed) | set(self._errors)
+            for entry in entries:
+                clean_url = SiteModel.get_clean_url(entry.url)
+                if clean_url in known:
+                    continue
+                known.add(clean_url)
+                
+                self._queue.append(clean_url)
+                # Each entry gets its own options: the worker writes picked_format back into them
+                self._metadata[clean_url] = {
+                    'url': clean_url,
+                    'title': entry.title or f"Loading: {SiteModel.detect_site(clean_url)} video",
+                    'status': 'Queued',
+                    'progress': 0,
+                    'thumbnail': None,
+                    'thumbnail_url': entry.thumbnail_url,
+                    'format_options': copy.deepcopy(format_options) if format_options else 'best',
+                    'output_dir': output_dir or os.path.expanduser('~/Downloads')
+                }
+                added.append(PlaylistEntry(clean_url, entry.title, entry.thumbnail_url, entry.duration, entry.index))
+        finally:
+            self._mutex.unlock()
+        
+        if not added:
+            return 0
+        
+        Logger.instance().info(caller="DownloadManager", msg=f"Added {len(added)} downloads in one batch")
+        self.queue_updated.emit()
+        
+        # Start as many downloads as slots allow; this also schedules probe
+        # prefetches for the head of what is still waiting
+        self._process_queue()
+        
+        for entry in added:
+            if not entry.title:
+                self._fetch_quick_metadata_threaded(entry.url)
+            elif entry.thumbnail_url:
+                self._thumbnail_pool.start(ThumbnailFetchWorker(entry.url, entry.thumbnail_url, self._batch_signals))
+        
+        return len(added)
+    
+    def _schedule_probe_prefetch(self):
+        """Probe the next PROBE_PREFETCH_AHEAD queued entries that have not been probed yet."""
+        to_probe = []
+        self._mutex.lock()
+        try:
+            for url in self._queue[:PROBE_PREFETCH_AHEAD]:
+                if url in self._prefetched:
+                    continue
+                format_options = self._metadata.get(url, {}).get('format_options')
+                if (SiteModel.detect_site(url) == SiteModel.SITE_YOUTUBE and
+                        isinstance(format_options, dict) and format_options.get("stream_picker")):
+                    self._prefetched.add(url)
+                    to_probe.append(url)
+        finally:
+            self._mutex.unlock()
+        
+        for url in to_probe:
+            self._probe_pool.start(ProbePrefetchWorker(url))
+    
+    def _on_playlist_ready(self, playlist_url, entries):
+        """Handle a finished flat-playlist extraction."""
+        format_options, output_dir = self._playlist_requests.pop(playlist_url, (None, None))
+        Logger.instance().info(caller="DownloadManager", msg=f"Playlist {playlist_url} expanded to {len(entries)} entries")
+        added = self.add_downloads(entries, format_options, output_dir)
+        self.playlist_expanded.emit(playlist_url, added)
+    
+    def _on_playlist_failed(self, playlist_url, error_message):
+        """Handle a failed flat-playlist extraction."""
+        self._playlist_requests.pop(playlist_url, None)
+        Logger.instance().error(caller="DownloadManager", msg=f"Playlist expansion failed for {playlist_url}: {error_message}")
+        self.playlist_error.emit(playlist_url, error_message)
+    
+    def _on_thumbnail_ready(self, url, data):
+        """Build the pixmap for a prefetched thumbnail on the GUI thread."""
+        pixmap = QPixmap()
+        if not pixmap.loadFromData(data):
+            return
+        pixmap = _fit_thumbnail(pixmap)
+        
+        self._mutex.lock()
+        try:
+            if url not in self._metadata:
+                return  # Removed while the thumbnail was in flight
+            self._metadata[url]['thumbnail'] = pixmap
+        finally:
+            self._mutex.unlock()
+        
+        self.thumbnail_updated.emit(url, pixmap)
+    
     def _fetch_quick_metadata_threaded(self, url):
         """
         Start a thread to quickly fetch basic metadata without blocking the UI.
@@ -192,18 +434,8 @@ class DownloadManager(QObject):
                         title = f"Loading: {site} video"
                     
                     if pixmap:
-                        # Scale the pixmap before sending it
-                        scaled_pixmap = pixmap.scaled(
-                            160, 90,
-                            Qt.AspectRatioMode.KeepAspectRatioByExpanding,
-                            Qt.TransformationMode.SmoothTransformation
-                        )
-                        
-                        # Center-crop if too big
-                        if scaled_pixmap.width() > 160 or scaled_pixmap.height() > 90:
-                            x = (scaled_pixmap.width() - 160) // 2 if scaled_pixmap.width() > 160 else 0
-                            y = (scaled_pixmap.height() - 90) // 2 if scaled_pixmap.height() > 90 else 0
-                            scaled_pixmap = scaled_pixmap.copy(int(x), int(y), 160, 90)
+                        # Scale and center-crop the pixmap before sending it
+                        scaled_pixmap = _fit_thumbnail(pixmap)
                         
                         # Emit signal with metadata
                         self.metadata_ready.emit(self.url, title, scaled_pixmap)
@@ -330,6 +562,7 @@ class DownloadManager(QObject):
             # For non-active items, proceed with immediate removal as before
             elif url in self._queue:
                 self._queue.remove(url)
+                self._prefetched.discard(url)
                 need_queue_update = True
                 if url in self._metadata: del self._metadata[url]; metadata_removed = True
             elif url in self._errors:
@@ -353,6 +586,9 @@ class DownloadManager(QObject):
             self._mutex.unlock()
         
         # --- Actions outside lock --- 
+        # A removed or cancelled item must not keep post-processing
+        self._post_pipeline.cancel(url)
+        
         if worker_to_cancel is not None:
             Logger.instance().debug(caller="DownloadManager", msg=f"DEBUG: Cancel signaled for worker: {url_to_cancel}")
             worker_to_cancel.cancel() # Ask worker to stop its internal process
@@ -421,6 +657,7 @@ class DownloadManager(QObject):
             
             for _ in range(urls_to_start):
                 url = self._queue.pop(0)
+                self._prefetched.discard(url)
                 metadata = self._metadata[url]
                 format_options = metadata['format_options']
                 output_dir = metadata['output_dir']
@@ -470,6 +707,7 @@ class DownloadManager(QObject):
             
             # Connect worker signals to manager slots (run in main thread)
             worker.progress_signal.connect(self._on_progress)
+            worker.progress_record_signal.connect(self._on_progress_record)
             worker.complete_signal.connect(self._on_complete)
             worker.error_signal.connect(self._on_error)
             worker.processing_signal.connect(self._on_processing)
@@ -498,6 +736,9 @@ class DownloadManager(QObject):
         if urls_to_process:
             self.queue_updated.emit()
         
+        # Slots were taken from the head of the queue; keep the prefetch window full
+        self._schedule_probe_prefetch()
+        
     # --- Signal Handlers from Worker --- 
     # These run in the main thread because the signals are connected
     # across threads by Qt's auto-connection type.
@@ -509,6 +750,30 @@ class DownloadManager(QObject):
             self._metadata[url]['stats'] = status_text
             self.download_progress.emit(url, progress, status_text)
     
+    def _on_progress_record(self, url, record):
+        """Handle typed progress records (byte counts, speed, ETA) from download threads."""
+        if url in self._metadata:
+            self._metadata[url]['progress_record'] = record
+            self._bandwidth.record(url, record)
+            if not self._bandwidth_timer.isActive():
+                self._bandwidth_timer.start()
+            self.download_progress_detail.emit(url, record)
+    
+    def get_bandwidth_snapshot(self) -> BandwidthSnapshot:
+        """Get current throughput per worker/host/total and the queue-wide ETA."""
+        self._mutex.lock()
+        try:
+            queued_count = len(self._queue)
+        finally:
+            self._mutex.unlock()
+        return self._bandwidth.snapshot(queued_count=queued_count)
+    
+    def _emit_bandwidth(self):
+        """Publish a bandwidth snapshot; stops the timer once nothing is downloading."""
+        self.bandwidth_updated.emit(self.get_bandwidth_snapshot())
+        if not self._bandwidth.has_activity():
+            self._bandwidth_timer.stop()
+    
     def _on_complete(self, url, output_dir, filename):
         """Handle download completion signal from worker."""
         Logger.instance().debug(caller="DownloadManager", msg=f"Download complete signal received - URL: {url}")
@@ -522,9 +787,11 @@ class DownloadManager(QObject):
         
         # --- Update state under lock --- 
         need_queue_update = False
+        format_options = None
         self._mutex.lock()
         try:
             if url in self._metadata:
+                format_options = self._metadata[url].get('format_options')
                 self._metadata[url]['status'] = 'Complete'
                 self._metadata[url]['progress'] = 100
                 self._metadata[url]['output_dir'] = output_dir
@@ -536,10 +803,41 @@ class DownloadManager(QObject):
         finally:
             self._mutex.unlock()
             
+        self._bandwidth.finish(url, completed=True)
+        
         # --- Emit signals outside lock --- 
         self.download_complete.emit(url, output_dir, filename) # Emit specific completion
         if need_queue_update:
             self.queue_updated.emit() # Let UI know general state changed
+        
+        # Hand the file to the post-download stages configured for its preset
+        stages = self._post_pipeline.stages_for(format_options)
+        if stages and filename and output_dir:
+            self._post_pipeline.start(url, os.path.join(output_dir, filename), stages)
+    
+    # --- Post-download pipeline slots ---
+    def _set_post_stats(self, url, text):
+        if url in self._metadata:
+            self._metadata[url]['stats'] = text
+        self.download_progress.emit(url, 100, text)
+    
+    def _on_post_stage_started(self, url, stage):
+        self._set_post_stats(url, f"{STAGE_LABELS.get(stage, stage)}...")
+    
+    def _on_post_stage_progress(self, url, stage, progress):
+        self._set_post_stats(url, f"{STAGE_LABELS.get(stage, stage)}: {int(progress * 100)}%")
+    
+    def _on_post_stage_failed(self, url, stage, error_message):
+        self._set_post_stats(url, f"{STAGE_LABELS.get(stage, stage)} failed: {error_message}")
+    
+    def _on_post_pipeline_finished(self, url, final_path):
+        """Point the queue item at the pipeline's final output (e.g. the MP3)."""
+        output_dir, filename = os.path.split(final_path)
+        if url in self._metadata:
+            self._metadata[url]['output_dir'] = output_dir
+            self._metadata[url]['filename'] = filename
+        self.download_complete.emit(url, output_dir, filename)
+        self._set_post_stats(url, "Post-processing complete")
     
     def _on_error(self, url, error_message):
         """Handle download error signal from worker."""
@@ -566,6 +864,8 @@ class DownloadManager(QObject):
         finally:
             self._mutex.unlock()
         
+        self._bandwidth.finish(url, completed=False)
+        
         # --- Emit signals outside lock --- 
         self.download_error.emit(url, error_message)
         if need_queue_update:
@@ -631,6 +931,9 @@ class DownloadManager(QObject):
             self._mutex.unlock()
         
         # --- Actions outside lock --- 
+        # No-op if completion/error already stopped tracking (covers cancellation)
+        self._bandwidth.finish(url, completed=False)
+        
         # Emit queue update if needed (covers cancellation finish)
         if need_queue_update:
              self.queue_updated.emit() 
@@ -654,6 +957,7 @@ class DownloadManager(QObject):
         finally:
             self._mutex.unlock()
         
+        self._post_pipeline.cancel(url)
         self.queue_updated.emit()
 
     # --- Shutdown Method --- 
@@ -661,6 +965,11 @@ class DownloadManager(QObject):
         """Gracefully shut down all active download threads."""
         self.logger.info(caller="DownloadManager", msg="Shutdown requested. Stopping active downloads...")
         
+        # Drop batch prefetches that have not started yet
+        self._thumbnail_pool.clear()
+        self._probe_pool.clear()
+        self._post_pipeline.shutdown()
+        
         # Create copies of keys to avoid modification during iteration
         active_urls = list(self._active.keys())
         
@@ -0,0 +1,129 @@
+"""
+PlaylistExpander
+----------------
+
+Expands a playlist / channel URL into its individual video entries with a single
+`yt-dlp --flat-playlist -J` call.
+
+Why:
+- Adding a playlist entry by entry means one metadata fetch and one StreamPicker
+  probe per URL, each started on its own once the item reaches the front of the queue.
+- A flat extraction returns every entry's URL, title and thumbnails in one JSON
+  document without resolving any formats, so the whole batch can be enqueued at once
+  with its display metadata already filled in.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .StreamPicker import _windows_no_window_flag
+
+
+# Thumbnails narrower than this are upscaled in the queue tiles (160x90), so prefer
+# the smallest variant that is at least this wide.
+_MIN_THUMBNAIL_WIDTH = 160
+
+
+@dataclass(frozen=True)
+class PlaylistEntry:
+    url: str
+    title: Optional[str]
+    thumbnail_url: Optional[str]
+    duration: Optional[float]
+    index: int
+
+
+def _entry_url(entry: dict[str, Any]) -> Optional[str]:
+    url = entry.get("url") or entry.get("webpage_url")
+    if url and str(url).startswith(("http://", "https://")):
+        return str(url)
+    # Older yt-dlp versions only return the bare video ID for YouTube flat entries
+    video_id = entry.get("id")
+    if video_id and entry.get("ie_key") == "Youtube":
+        return f"https://www.youtube.com/watch?v={video_id}"
+    return str(url) if url else None
+
+
+def _entry_thumbnail(entry: dict[str, Any]) -> Optional[str]:
+    thumbnails = entry.get("thumbnails") or []
+    usable = [t for t in thumbnails if isinstance(t, dict) and t.get("url")]
+    if usable:
+        wide_enough = [t for t in usable if (t.get("width") or 0) >= _MIN_THUMBNAIL_WIDTH]
+        if wide_enough:
+            return min(wide_enough, key=lambda t: t.get("width") or 0)["url"]
+        return usable[-1]["url"]
+    return entry.get("thumbnail")
+
+
+def _iter_entries(info_json: dict[str, Any]):
+    for entry in info_json.get("entries") or []:
+        if not isinstance(entry, dict):
+            continue
+        # Channel URLs can come back as a playlist of tabs (Videos, Shorts, ...)
+        if entry.get("entries"):
+            yield from _iter_entries(entry)
+        else:
+            yield entry
+
+
+def entries_from_playlist_json(info_json: dict[str, Any]) -> list[PlaylistEntry]:
+    out: list[PlaylistEntry] = []
+    seen: set[str] = set()
+    for entry in _iter_entries(info_json):
+        url = _entry_url(entry)
+        if not url or url in seen:
+            continue
+        seen.add(url)
+        duration = entry.get("duration")
+        out.append(
+            PlaylistEntry(
+                url=url,
+                title=(entry.get("title") or None),
+                thumbnail_url=_entry_thumbnail(entry),
+                duration=(float(duration) if isinstance(duration, (int, float)) else None),
+                index=len(out),
+            )
+        )
+    return out
+
+
+def expand_playlist_json(
+    *,
+    ytdlp_path: str,
+    url: str,
+    timeout_s: int = 120,
+) -> dict[str, Any]:
+    """
+    Run a single flat extraction for a playlist or channel URL (no per-entry resolution).
+    """
+    cmd = [ytdlp_path, "--flat-playlist", "--dump-single-json", "--ignore-errors", url]
+    p = subprocess.run(
+        cmd,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        errors="replace",
+        timeout=timeout_s,
+        creationflags=_windows_no_window_flag(),
+    )
+    # --ignore-errors can still yield a usable document with a non-zero exit code
+    if not p.stdout.strip():
+        raise RuntimeError(f"yt-dlp playlist expansion failed (rc={p.returncode}): {p.stderr.strip()}")
+    try:
+        return json.loads(p.stdout)
+    except Exception as e:
+        raise RuntimeError(f"yt-dlp playlist JSON parse failed: {e}")
+
+
+def expand_playlist(
+    *,
+    ytdlp_path: str,
+    url: str,
+    timeout_s: int = 120,
+) -> list[PlaylistEntry]:
+    info = expand_playlist_json(ytdlp_path=ytdlp_path, url=url, timeout_s=timeout_s)
+    return entries_from_playlist_json(info)
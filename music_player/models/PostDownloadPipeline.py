@@ -0,0 +1,269 @@
+"""
+Post-download processing pipeline for the YouTube downloader.
+
+A finished download can be passed through a chain of stages, e.g. for the audio preset:
+    downloaded .m4a -> "mp3" (ConversionWorker at the configured bitrate) -> "oplayer" (FTP upload)
+
+Each stage runs on its own bounded QThreadPool, so while one file is being transcoded the
+next one can already be downloading and the previous one uploading.
+
+Which stages run is decided per download from its format options:
+- an explicit `format_options["post_process"]` list wins
+- otherwise the preset tag (`format_options["preset"]`) is looked up in the
+  YT_POST_PROCESS_KEY setting ({preset_name: [stage, ...]}, edited in Preferences)
+"""
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable, QThreadPool
+
+from qt_base_app.models.logger import Logger
+from qt_base_app.models.settings_manager import SettingsManager, SettingType
+from music_player.models.settings_defs import YT_POST_PROCESS_KEY, DEFAULT_YT_POST_PROCESS
+from music_player.models.conversion_manager import ConversionTask, ConversionWorker
+from music_player.models.video_compression_task import VideoCompressionTask
+from music_player.models.video_compression_worker import VideoCompressionWorker, VideoFinalizeWorker
+from music_player.services.oplayer_service import OPlayerService, ftp_upload_file
+
+STAGE_MP3 = "mp3"
+STAGE_COMPRESS = "compress"
+STAGE_OPLAYER = "oplayer"
+KNOWN_STAGES = (STAGE_MP3, STAGE_COMPRESS, STAGE_OPLAYER)
+
+STAGE_LABELS = {
+    STAGE_MP3: "Converting to MP3",
+    STAGE_COMPRESS: "Compressing",
+    STAGE_OPLAYER: "Uploading to OPlayer",
+}
+
+# Presets tagged by VideoInput whose stages can be chosen in Preferences
+CONFIGURABLE_PRESETS = {
+    "audio_default": "Audio",
+    "best_video_default": "Best video",
+    "video_1080p": "1080p video",
+    "video_720p_default": "720p video",
+    "video_480p": "480p video",
+}
+
+# Per-stage concurrency. Transcoding is CPU bound, uploads share one Wi-Fi link.
+STAGE_MAX_THREADS = {
+    STAGE_MP3: 2,
+    STAGE_COMPRESS: 1,
+    STAGE_OPLAYER: 1,
+}
+
+
+@dataclass
+class PipelineJob:
+    """A downloaded file travelling through its remaining stages."""
+    url: str
+    current_path: str
+    stages: List[str]
+    stage_index: int = 0
+    outputs: List[str] = field(default_factory=list)
+
+    @property
+    def current_stage(self) -> Optional[str]:
+        return self.stages[self.stage_index] if self.stage_index < len(self.stages) else None
+
+
+class UploadWorkerSignals(QObject):
+    progress = pyqtSignal(str, int)      # job url, percent
+    completed = pyqtSignal(str, str)     # job url, uploaded filename
+    failed = pyqtSignal(str, str)        # job url, error message
+
+
+class UploadWorker(QRunnable):
+    """Uploads one file to OPlayer inside the upload stage's pool."""
+    def __init__(self, url: str, file_path: str, host: str, port: int):
+        super().__init__()
+        self.url = url
+        self.file_path = file_path
+        self.host = host
+        self.port = port
+        self.signals = UploadWorkerSignals()
+
+    def run(self):
+        try:
+            filename = ftp_upload_file(
+                self.host, self.port, self.file_path,
+                lambda percent: self.signals.progress.emit(self.url, percent)
+            )
+            self.signals.completed.emit(self.url, filename)
+        except Exception as e:
+            self.signals.failed.emit(self.url, f"Upload failed: {str(e)}")
+
+
+class PostDownloadPipeline(QObject):
+    """Runs configured post-processing stages for completed downloads."""
+
+    stage_started = pyqtSignal(str, str)            # url, stage
+    stage_progress = pyqtSignal(str, str, float)    # url, stage, progress (0.0-1.0)
+    stage_failed = pyqtSignal(str, str, str)        # url, stage, error message
+    pipeline_finished = pyqtSignal(str, str)        # url, final output path
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.settings = SettingsManager.instance()
+        self._jobs: Dict[str, PipelineJob] = {}
+        # Keep runnables (and their signal objects) alive until they report back
+        self._workers: Dict[str, object] = {}
+        self._pools: Dict[str, QThreadPool] = {}
+        for stage in KNOWN_STAGES:
+            pool = QThreadPool(self)
+            pool.setMaxThreadCount(STAGE_MAX_THREADS[stage])
+            self._pools[stage] = pool
+        # Renaming/replacing compressed files, kept off the encode slot
+        self._finalize_pool = QThreadPool(self)
+        self._finalize_pool.setMaxThreadCount(1)
+
+    def stages_for(self, format_options) -> List[str]:
+        """Resolve the stage list for a download's format options."""
+        if not isinstance(format_options, dict):
+            return []
+        stages = format_options.get("post_process")
+        if stages is None:
+            configured = self.settings.get(YT_POST_PROCESS_KEY, DEFAULT_YT_POST_PROCESS, SettingType.DICT) or {}
+            stages = configured.get(format_options.get("preset", ""), [])
+        valid = [s for s in stages if s in KNOWN_STAGES]
+        if len(valid) != len(stages):
+            Logger.instance().warning(caller="PostDownloadPipeline", msg=f"Ignoring unknown post-process stages in {stages}")
+        return valid
+
+    def start(self, url: str, file_path: str, stages: List[str]) -> bool:
+        """Start the pipeline for a finished download. Returns False if nothing to do."""
+        if not stages or url in self._jobs:
+            return False
+        job = PipelineJob(url=url, current_path=file_path, stages=list(stages))
+        self._jobs[url] = job
+        Logger.instance().info(caller="PostDownloadPipeline", msg=f"Post-processing {os.path.basename(file_path)}: {' -> '.join(stages)}")
+        self._run_stage(job)
+        return True
+
+    def is_running(self, url: str) -> bool:
+        return url in self._jobs
+
+    def cancel(self, url: str):
+        """Stop a job after its current stage; cancels the running transcode where possible."""
+        job = self._jobs.pop(url, None)
+        worker = self._workers.pop(url, None)
+        if job and worker is not None and hasattr(worker, "cancel"):
+            worker.cancel()
+
+    def shutdown(self):
+        for url in list(self._jobs):
+            self.cancel(url)
+        for pool in self._pools.values():
+            pool.clear()
+        self._finalize_pool.clear()
+
+    # --- Stage dispatch ---
+
+    def _run_stage(self, job: PipelineJob):
+        stage = job.current_stage
+        if stage is None:
+            self._jobs.pop(job.url, None)
+            self._workers.pop(job.url, None)
+            self.pipeline_finished.emit(job.url, job.current_path)
+            return
+
+        if not os.path.exists(job.current_path):
+            self._fail(job, stage, f"File not found: {job.current_path}")
+            return
+
+        if stage == STAGE_MP3:
+            worker = self._make_mp3_worker(job)
+        elif stage == STAGE_COMPRESS:
+            worker = self._make_compress_worker(job)
+        else:
+            worker = self._make_upload_worker(job)
+
+        self._workers[job.url] = worker
+        self.stage_started.emit(job.url, stage)
+        self._pools[stage].start(worker)
+
+    def _advance(self, url: str, stage: str, output_path: str):
+        job = self._jobs.get(url)
+        if job is None or job.current_stage != stage:
+            return  # Cancelled while the stage was running
+        job.outputs.append(output_path)
+        job.current_path = output_path
+        job.stage_index += 1
+        self.stage_progress.emit(url, stage, 1.0)
+        self._run_stage(job)
+
+    def _fail(self, job: PipelineJob, stage: str, error_message: str):
+        Logger.instance().error(caller="PostDownloadPipeline", msg=f"Stage '{stage}' failed for {job.url}: {error_message}")
+        self._jobs.pop(job.url, None)
+        self._workers.pop(job.url, None)
+        self.stage_failed.emit(job.url, stage, error_message)
+
+    def _on_failed(self, url: str, stage: str, error_message: str):
+        job = self._jobs.get(url)
+        if job is not None and job.current_stage == stage:
+            self._fail(job, stage, error_message)
+
+    # --- Stage workers ---
+
+    def _make_mp3_worker(self, job: PipelineJob) -> ConversionWorker:
+        input_path = Path(job.current_path)
+        task = ConversionTask(
+            input_filepath=input_path,
+            output_filepath=input_path.with_suffix(".mp3"),
+            original_filename=input_path.name,
+            task_id=job.url,
+        )
+        worker = ConversionWorker(task)
+        worker.signals.worker_progress.connect(lambda url, p: self.stage_progress.emit(url, STAGE_MP3, p))
+        worker.signals.worker_completed.connect(lambda url, out: self._advance(url, STAGE_MP3, str(out)))
+        worker.signals.worker_failed.connect(lambda url, err: self._on_failed(url, STAGE_MP3, err))
+        return worker
+
+    def _make_compress_worker(self, job: PipelineJob) -> VideoCompressionWorker:
+        task = VideoCompressionTask.create(
+            input_path=job.current_path,
+            output_directory=os.path.dirname(job.current_path),
+            file_index=0,
+            total_files=1,
+        )
+        url = job.url
+        worker = VideoCompressionWorker(task)
+        worker.signals.progress_updated.connect(lambda _tid, p: self.stage_progress.emit(url, STAGE_COMPRESS, p))
+        worker.signals.encode_completed.connect(lambda _tid: self._finalize_compress(url, task))
+        worker.signals.worker_failed.connect(lambda _tid, err: self._on_failed(url, STAGE_COMPRESS, err))
+        worker.signals.worker_cancelled.connect(lambda _tid: self._on_failed(url, STAGE_COMPRESS, "Cancelled"))
+        return worker
+
+    def _finalize_compress(self, url: str, task: VideoCompressionTask):
+        """Move the encoded file into place once FFmpeg is done; the job advances from there."""
+        job = self._jobs.get(url)
+        if job is None or job.current_stage != STAGE_COMPRESS:
+            # Cancelled just as encoding finished: drop the encoded temp file
+            if task.output_path != task.input_path and os.path.exists(task.output_path):
+                try:
+                    os.remove(task.output_path)
+                except OSError as e:
+                    Logger.instance().warning(caller="PostDownloadPipeline", msg=f"Could not remove {task.output_path}: {e}")
+            return
+        input_dir = os.path.dirname(task.input_path)
+        finalizer = VideoFinalizeWorker(task)
+        finalizer.signals.compression_completed.connect(
+            lambda _tid, _orig, out_name: self._advance(url, STAGE_COMPRESS, os.path.join(input_dir, out_name))
+        )
+        finalizer.signals.worker_failed.connect(lambda _tid, err: self._on_failed(url, STAGE_COMPRESS, err))
+        self._workers[url] = finalizer
+        self._finalize_pool.start(finalizer)
+
+    def _make_upload_worker(self, job: PipelineJob) -> UploadWorker:
+        host = self.settings.get("oplayer/ftp_host", OPlayerService.DEFAULT_HOST, SettingType.STRING)
+        port = self.settings.get("oplayer/ftp_port", OPlayerService.DEFAULT_PORT, SettingType.INT)
+        worker = UploadWorker(job.url, job.current_path, host, port)
+        worker.signals.progress.connect(lambda url, p: self.stage_progress.emit(url, STAGE_OPLAYER, p / 100.0))
+        # Uploading does not produce a new local file; the next stage sees the same path
+        worker.signals.completed.connect(
+            lambda url, _name, path=job.current_path: self._advance(url, STAGE_OPLAYER, path)
+        )
+        worker.signals.failed.connect(lambda url, err: self._on_failed(url, STAGE_OPLAYER, err))
+        return worker
@@ -181,6 +181,26 @@ class SiteModel:
             
         return None
 
+    @staticmethod
+    def is_playlist_url(url):
+        """
+        Check if a URL refers to a playlist or channel that should be expanded
+        into individual downloads.
+        
+        Args:
+            url (str): The URL to check
+            
+        Returns:
+            bool: True if the URL is a playlist/channel on a supported platform
+        """
+        site = SiteModel.detect_site(url)
+        
+        if site == SiteModel.SITE_YOUTUBE:
+            from .YoutubeModel import YoutubeModel
+            return YoutubeModel.is_playlist_url(url)
+            
+        return False
+
     @staticmethod
     def is_supported_site(url):
         """
@@ -19,6 +19,9 @@ from __future__ import annotations
 import json
 import os
 import subprocess
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, replace
 from typing import Any, Optional
 
@@ -370,6 +373,44 @@ def probe_formats_json(
         raise RuntimeError(f"yt-dlp probe JSON parse failed: {e}")
 
 
+# Probe results prefetched for queued downloads (e.g. a freshly expanded playlist).
+# Only format IDs are taken from the probe, so a short TTL is plenty. Each info JSON
+# can be hundreds of KB, so the cache is an LRU capped well above the prefetch window.
+_PROBE_CACHE_TTL_S = 30 * 60
+PROBE_CACHE_MAX_ENTRIES = 16
+_probe_cache: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+_probe_cache_lock = threading.Lock()
+
+
+def prefetch_probe(
+    *,
+    ytdlp_path: str,
+    url: str,
+    timeout_s: int = 120,
+) -> None:
+    """
+    Probe ahead of time and keep the JSON so that a later `pick_for_url` for the same
+    URL does not have to run yt-dlp again.
+    """
+    info = probe_formats_json(ytdlp_path=ytdlp_path, url=url, timeout_s=timeout_s)
+    with _probe_cache_lock:
+        _probe_cache[url] = (time.monotonic(), info)
+        _probe_cache.move_to_end(url)
+        while len(_probe_cache) > PROBE_CACHE_MAX_ENTRIES:
+            _probe_cache.popitem(last=False)
+
+
+def _take_cached_probe(url: str) -> Optional[dict[str, Any]]:
+    with _probe_cache_lock:
+        entry = _probe_cache.pop(url, None)
+    if entry is None:
+        return None
+    stored_at, info = entry
+    if time.monotonic() - stored_at > _PROBE_CACHE_TTL_S:
+        return None
+    return info
+
+
 def pick_from_info_json(info_json: dict[str, Any], policy: SelectionPolicy) -> PickResult:
     # If the caller didn't specify preferred audio languages, try to infer a reasonable default
     # from the info JSON (useful for YouTube multi-audio where "original" often aligns with
@@ -460,7 +501,9 @@ def pick_for_url(
     policy: SelectionPolicy,
     timeout_s: int = 120,
 ) -> PickResult:
-    info = probe_formats_json(ytdlp_path=ytdlp_path, url=url, timeout_s=timeout_s)
+    info = _take_cached_probe(url)
+    if info is None:
+        info = probe_formats_json(ytdlp_path=ytdlp_path, url=url, timeout_s=timeout_s)
     return pick_from_info_json(info, policy)
 
 
@@ -210,6 +210,26 @@ class YoutubeModel:
         
         return title, pixmap
 
+    @staticmethod
+    def is_playlist_url(url):
+        """
+        Check whether a YouTube URL points at a playlist or channel rather than a single video.
+        Watch URLs that also carry a list= parameter are treated as single videos.
+        """
+        if not url or YoutubeModel.extract_video_id(url):
+            return False
+        
+        parsed_url = urlparse(url)
+        if parsed_url.netloc not in ('youtube.com', 'www.youtube.com', 'm.youtube.com', 'music.youtube.com'):
+            return False
+        
+        # Playlist page youtube.com/playlist?list=PLAYLIST_ID
+        if parsed_url.path == '/playlist':
+            return 'list' in parse_qs(parsed_url.query)
+        
+        # Channel pages youtube.com/@handle, /channel/ID, /c/name, /user/name (optionally with a tab)
+        return parsed_url.path.startswith(('/@', '/channel/', '/c/', '/user/'))
+
     @staticmethod
     def clean_url(url):
         """
@@ -353,10 +353,11 @@ class YtDlpModel:
                               ('audio_default', 'video_720p_default', 'best_video_default')
         
         Returns:
-            dict: Dictionary containing format options for the specified preset
+            dict: Dictionary containing format options for the specified preset,
+                  tagged with 'preset' so post-download stages can be looked up
         """
         if preset_name == "audio_default":
-            return YtDlpModel.generate_format_string(
+            options = YtDlpModel.generate_format_string(
                 resolution=None,  # Audio only
                 use_https=False,
                 use_m4a=True,
@@ -364,7 +365,7 @@ class YtDlpModel:
                 use_cookies=False
             )
         elif preset_name == "video_720p_default":
-            return YtDlpModel.generate_format_string(
+            options = YtDlpModel.generate_format_string(
                 resolution=720,
                 use_https=True,
                 use_m4a=True,
@@ -374,7 +375,7 @@ class YtDlpModel:
             )
         elif preset_name == "best_video_default":
             # This preset doesn't limit resolution, getting the best quality available
-            return YtDlpModel.generate_format_string(
+            options = YtDlpModel.generate_format_string(
                 resolution=None,  # No resolution limit
                 use_https=True,
                 use_m4a=False,
@@ -389,6 +390,8 @@ class YtDlpModel:
                 msg=f"Unknown preset '{preset_name}'. Returning empty options.",
             )
             return {}
+        options["preset"] = preset_name
+        return options
     
     @staticmethod
     def get_video_formats(video_url):
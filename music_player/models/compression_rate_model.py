@@ -0,0 +1,122 @@
+"""
+Encode speed history used to estimate video compression times.
+
+Speeds are stored per resolution class as media seconds encoded per wall-clock
+second (FFmpeg's "speed=" figure), smoothed over past encodes and persisted as
+JSON in the working directory, so ETAs are usable from the first file of a batch.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from qt_base_app.models.logger import Logger
+from music_player.models.playlist import get_default_working_dir
+
+RATES_FILENAME = ".video_compression_rates.json"
+RATES_FORMAT_VERSION = 1
+
+# Weight of a new measurement in the running average
+SMOOTHING = 0.3
+
+# Starting guesses (speed multiples) for a 720p libx264 encode until something is measured
+DEFAULT_SPEEDS: Dict[str, float] = {
+    "sd": 6.0,
+    "720p": 4.0,
+    "1080p": 2.0,
+    "1440p": 1.2,
+    "4k": 0.6,
+    "unknown": 1.5,
+}
+
+
+def resolution_class(width: Optional[int], height: Optional[int]) -> str:
+    """Buckets a source resolution by its shorter side (orientation-independent)."""
+    if not width or not height:
+        return "unknown"
+    short_side = min(width, height)
+    if short_side <= 480:
+        return "sd"
+    if short_side <= 720:
+        return "720p"
+    if short_side <= 1080:
+        return "1080p"
+    if short_side <= 1440:
+        return "1440p"
+    return "4k"
+
+
+class CompressionRateModel:
+    """Thread-safe resolution class -> encode speed store, persisted as JSON."""
+
+    def __init__(self, rates_path: Optional[Path] = None):
+        self._path = rates_path
+        self._lock = threading.Lock()
+        self._rates: Optional[Dict[str, Dict[str, float]]] = None
+        self._dirty = False
+
+    @property
+    def path(self) -> Path:
+        if self._path is None:
+            self._path = get_default_working_dir() / RATES_FILENAME
+        return self._path
+
+    def _ensure_loaded(self):
+        if self._rates is not None:
+            return
+        self._rates = {}
+        try:
+            if self.path.exists():
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("format") == RATES_FORMAT_VERSION:
+                    self._rates = data.get("classes", {})
+        except Exception as e:
+            Logger.instance().warning(caller="CompressionRateModel", msg=f"Ignoring unreadable rate history {self.path}: {e}")
+
+    def speed(self, width: Optional[int], height: Optional[int]) -> float:
+        """Expected encode speed (media seconds per second) for a source resolution."""
+        key = resolution_class(width, height)
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._rates.get(key)
+        return entry["speed"] if entry else DEFAULT_SPEEDS[key]
+
+    def estimate_seconds(self, width: Optional[int], height: Optional[int], duration: Optional[float]) -> Optional[float]:
+        """Expected wall-clock encode time, or None without a known duration."""
+        if not duration:
+            return None
+        return duration / self.speed(width, height)
+
+    def record(self, width: Optional[int], height: Optional[int], duration: Optional[float], encode_seconds: Optional[float]):
+        """Adds a finished encode: `duration` media seconds took `encode_seconds`."""
+        if not duration or not encode_seconds or encode_seconds <= 0:
+            return
+        measured = duration / encode_seconds
+        key = resolution_class(width, height)
+        with self._lock:
+            self._ensure_loaded()
+            entry = self._rates.get(key)
+            if entry:
+                entry["speed"] += SMOOTHING * (measured - entry["speed"])
+                entry["samples"] += 1
+            else:
+                self._rates[key] = {"speed": measured, "samples": 1}
+            self._dirty = True
+
+    def save(self):
+        """Writes the history if it changed (atomic replace)."""
+        with self._lock:
+            if not self._dirty or self._rates is None:
+                return
+            payload = {"format": RATES_FORMAT_VERSION, "classes": self._rates}
+            self._dirty = False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            Logger.instance().error(caller="CompressionRateModel", msg=f"Error saving encode rate history: {e}")
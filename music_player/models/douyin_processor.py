@@ -1,6 +1,10 @@
-from PyQt6.QtCore import QObject, pyqtSignal, QThread, QSemaphore
-from typing import List
+from PyQt6.QtCore import QObject, pyqtSignal, QThread, QRunnable, QThreadPool
+from typing import Dict, List, Optional
 import json
+import queue
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 import subprocess
 import os
 import re
@@ -9,10 +13,140 @@ import uuid
 from music_player.models.ffmpeg_utils import get_video_duration, parse_ffmpeg_progress
 from qt_base_app.models.logger import Logger
 
-# Global semaphore to limit concurrent re-encoding processes
+# Concurrent ffprobe processes while planning a merge-only batch (I/O bound, cheap)
+MAX_CONCURRENT_PROBES = 8
+# Maximum number of concurrent re-encoding processes (size of the processor's job pool)
 # For Intel i7 + RTX 3050 Ti: 2-3 concurrent processes recommended
 MAX_CONCURRENT_REENCODING = 3
-encoding_semaphore = QSemaphore(MAX_CONCURRENT_REENCODING)
+
+def next_output_filename(output_directory: str) -> str:
+    """Returns the first free name of the form output00.mp4, output01.mp4, etc."""
+    counter = 0
+    while True:
+        filename = f"output{counter:02d}.mp4"
+        if not os.path.exists(os.path.join(output_directory, filename)):
+            return filename
+        counter += 1
+
+def probe_signature(filepath: str) -> Optional[dict]:
+    """Codec/format signature of a clip's first video and audio streams, or None if it cannot be probed."""
+    try:
+        # One ffprobe call for both streams
+        cmd = [
+            'ffprobe', '-v', 'quiet', '-print_format', 'json',
+            '-show_entries', 'stream=codec_type,codec_name,profile,level,width,height,pix_fmt,r_frame_rate,avg_frame_rate,sample_rate,channels,channel_layout',
+            filepath
+        ]
+        p = subprocess.run(cmd, capture_output=True, text=True, check=True, creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0)
+        streams = json.loads(p.stdout).get('streams', [])
+        v = next(st for st in streams if st.get('codec_type') == 'video')
+        a = next((st for st in streams if st.get('codec_type') == 'audio'), None)
+        return {
+            'vcodec': v.get('codec_name'),
+            'vprofile': v.get('profile'),
+            'vlevel': v.get('level'),
+            'width': v.get('width'),
+            'height': v.get('height'),
+            'pix_fmt': v.get('pix_fmt'),
+            'r_frame_rate': v.get('r_frame_rate'),
+            'avg_frame_rate': v.get('avg_frame_rate'),
+            'acodec': (a or {}).get('codec_name'),
+            'sample_rate': (a or {}).get('sample_rate'),
+            'channels': (a or {}).get('channels'),
+            'channel_layout': (a or {}).get('channel_layout'),
+        }
+    except Exception:
+        return None
+
+def signatures_match(a: dict, b: dict) -> bool:
+    keys = ['vcodec','vprofile','vlevel','width','height','pix_fmt','avg_frame_rate','acodec','sample_rate','channels','channel_layout']
+    return all(str(a.get(k)) == str(b.get(k)) for k in keys)
+
+def x264_profile_level_args(signature: dict):
+    """libx264 -profile:v / -level arguments reproducing a probed signature's profile and level."""
+    vprofile = signature.get('vprofile')
+    vlevel = signature.get('vlevel')
+    level_arg: list[str] = []
+    profile_arg: list[str] = []
+    if vprofile and isinstance(vprofile, str):
+        profile = vprofile.lower()
+        if profile == 'constrained baseline':
+            profile = 'baseline'
+        profile_arg = ['-profile:v', profile]
+    # ffprobe level often returns integers like 50 -> use 5.0
+    if vlevel not in (None, 'Unknown'):
+        try:
+            lvl_str = str(vlevel)
+            if lvl_str.isdigit() and len(lvl_str) == 2:
+                lvl_str = f"{lvl_str[0]}.{lvl_str[1]}"
+            level_arg = ['-level', lvl_str]
+        except Exception:
+            level_arg = []
+    return profile_arg, level_arg
+
+@dataclass
+class NormalizePlan:
+    """Outcome of probing a merge-only batch: which clips merge as they are and which are re-encoded."""
+    files: List[str]                        # input order
+    target: Optional[dict] = None           # majority signature
+    to_copy: List[str] = field(default_factory=list)
+    to_encode: List[str] = field(default_factory=list)
+    unprobed: List[str] = field(default_factory=list)   # merged as-is, could not be analyzed
+    mixed_audio: bool = False
+
+def plan_normalization(files: List[str], signatures: Dict[str, Optional[dict]]) -> NormalizePlan:
+    """Picks the majority signature and splits files into copy / normalize."""
+    plan = NormalizePlan(files=list(files))
+    probed = [(f, signatures.get(f)) for f in files if signatures.get(f)]
+    plan.unprobed = [f for f in files if not signatures.get(f)]
+    if not probed:
+        return plan
+    # Determine if audio is heterogeneous across inputs
+    audio_keys = {(s.get('acodec'), s.get('sample_rate'), s.get('channels'), s.get('channel_layout')) for _, s in probed}
+    plan.mixed_audio = len(audio_keys) > 1
+    common_sig_json, _ = Counter(json.dumps(s, sort_keys=True) for _, s in probed).most_common(1)[0]
+    plan.target = json.loads(common_sig_json)
+    for f, sig in probed:
+        (plan.to_copy if signatures_match(sig, plan.target) else plan.to_encode).append(f)
+    return plan
+
+# Output format of the re-encoding trim. Clips that already have it can be trimmed by
+# stream copy, re-encoding only the part after the last keyframe before the cut.
+TRIM_TARGET_SIGNATURE = {
+    'vcodec': 'h264', 'width': 720, 'height': 1280, 'pix_fmt': 'yuv420p',
+    'avg_frame_rate': '30/1', 'acodec': 'aac',
+}
+DOUYIN_OUTRO_SECONDS = 3.03
+
+def matches_trim_target(signature: Optional[dict]) -> bool:
+    if not signature:
+        return False
+    return all(str(signature.get(k)) == str(v) for k, v in TRIM_TARGET_SIGNATURE.items())
+
+def last_keyframe_before(filepath: str, position: float, search_window: float = 30.0) -> Optional[float]:
+    """Timestamp of the last video keyframe at or before position (only the window before it is read)."""
+    try:
+        start = max(0.0, position - search_window)
+        cmd = [
+            'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+            '-skip_frame', 'nokey', '-show_entries', 'frame=pts_time',
+            '-read_intervals', f"{start:.3f}%{position:.3f}",
+            '-of', 'csv=p=0', filepath
+        ]
+        p = subprocess.run(cmd, capture_output=True, text=True, timeout=30, creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0)
+        if p.returncode != 0:
+            return None
+        times = []
+        for line in p.stdout.splitlines():
+            try:
+                times.append(float(line.strip().rstrip(',')))
+            except ValueError:
+                continue
+        candidates = [t for t in times if t <= position]
+        return max(candidates) if candidates else None
+    except Exception:
+        return None
+
 
 class DouyinMergeWorker(QThread):
     progress = pyqtSignal(float)
@@ -143,12 +277,7 @@ class DouyinMergeWorker(QThread):
 
     def _generate_output_filename(self):
         """Generate output filename like output00.mp4, output01.mp4, etc."""
-        counter = 0
-        while True:
-            filename = f"output{counter:02d}.mp4"
-            if not os.path.exists(os.path.join(self.output_directory, filename)):
-                return filename
-            counter += 1
+        return next_output_filename(self.output_directory)
 
     def _attempt_ts_concat_fallback(self, output_path: str) -> bool:
         """Fallback concat via MPEG-TS (copy only). Returns True on success."""
@@ -257,86 +386,441 @@ class DouyinMergeWorker(QThread):
 
     # Removed audio-only remux per current policy (avoid re-encoding audio in final merge)
 
-class DouyinTrimWorker(QThread):
-    progress = pyqtSignal(str, float)
-    completed = pyqtSignal(str, str)
-    failed = pyqtSignal(str, str)
+class DouyinStreamMergeWorker(QThread):
+    """
+    Merges a batch while it is still being trimmed.
+
+    Trimmed clips are handed in with submit(index, path) in any order. As soon as the
+    next clip in input order is available it is remuxed (stream copy) to MPEG-TS and
+    appended to a growing intermediate file, with its timestamps offset to follow the
+    previous clip. Once every index has been submitted the intermediate is remuxed to
+    the final MP4, so the merge finishes shortly after the last trim.
+    A path of None marks a clip that failed and is skipped.
+    """
+    progress = pyqtSignal(float)
+    completed = pyqtSignal(str)
+    failed = pyqtSignal(str)
+
+    _ABORT = object()
+
+    def __init__(self, total: int, output_directory: str, parent=None):
+        super().__init__(parent)
+        self.total = total
+        self.output_directory = output_directory
+        self._queue: "queue.Queue" = queue.Queue()
+        self._ts_path = os.path.join(output_directory, f"stream_merge_{uuid.uuid4().hex}.ts")
+        self.appended_files: List[str] = []
+
+    def submit(self, index: int, path: Optional[str]):
+        self._queue.put((index, path))
+
+    def abort(self):
+        self._queue.put(self._ABORT)
+
+    def run(self):
+        ready: Dict[int, Optional[str]] = {}
+        next_index = 0
+        offset = 0.0
+        try:
+            with open(self._ts_path, 'wb') as ts_file:
+                while next_index < self.total:
+                    item = self._queue.get()
+                    if item is self._ABORT:
+                        return
+                    index, path = item
+                    ready[index] = path
+                    # Append the contiguous prefix that is now available
+                    while next_index in ready:
+                        path = ready.pop(next_index)
+                        next_index += 1
+                        if path is None:
+                            continue
+                        duration = self._append_segment(ts_file, path, offset)
+                        if duration is None:
+                            self.failed.emit(f"Could not append {os.path.basename(path)} to the merge")
+                            return
+                        offset += duration
+                        self.appended_files.append(path)
+                        # Appending is ~90% of the work; the final remux is the rest
+                        self.progress.emit(0.9 * next_index / self.total)
+
+            if not self.appended_files:
+                self.failed.emit("No files to merge.")
+                return
+            output_path = os.path.join(self.output_directory, next_output_filename(self.output_directory))
+            if not self._finalize(output_path):
+                self.failed.emit("FFmpeg could not remux the merged stream to MP4")
+                return
+            self.progress.emit(1.0)
+            self.completed.emit(output_path)
+        except Exception as e:
+            self.failed.emit(str(e))
+        finally:
+            try:
+                os.remove(self._ts_path)
+            except OSError:
+                pass
+
+    def _append_segment(self, ts_file, path: str, offset: float) -> Optional[float]:
+        """Remuxes one clip to MPEG-TS at the end of ts_file. Returns its duration, None on failure."""
+        duration = get_video_duration(path)
+        if not duration:
+            return None
+        start = ts_file.tell()
+        cmd = [
+            'ffmpeg', '-hide_banner', '-loglevel', 'error',
+            '-i', path,
+            '-map', '0:v:0', '-map', '0:a?',
+            '-c', 'copy',
+            '-bsf:v', 'h264_mp4toannexb',
+            '-output_ts_offset', f"{offset:.6f}",
+            '-muxpreload', '0', '-muxdelay', '0',
+            '-f', 'mpegts', 'pipe:1'
+        ]
+        ts_file.flush()
+        p = subprocess.run(cmd, stdout=ts_file, stderr=subprocess.PIPE, text=True,
+                           encoding='utf-8', errors='replace',
+                           creationflags=(subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0))
+        if p.returncode != 0:
+            Logger.instance().error(caller="DouyinStreamMergeWorker", msg=f"TS append failed for {path}: {p.stderr}")
+            # Drop the partial segment so the intermediate stays valid
+            ts_file.seek(start)
+            ts_file.truncate()
+            return None
+        ts_file.seek(0, os.SEEK_END)
+        return duration
 
-    def __init__(self, task_id, input_path, parent=None):
+    def _finalize(self, output_path: str) -> bool:
+        cmd = [
+            'ffmpeg', '-y', '-hide_banner', '-loglevel', 'error',
+            '-i', self._ts_path,
+            '-map', '0:v:0', '-map', '0:a?',
+            '-c', 'copy',
+            '-bsf:a', 'aac_adtstoasc',
+            '-movflags', '+faststart',
+            output_path
+        ]
+        p = subprocess.run(cmd, capture_output=True, text=True, encoding='utf-8', errors='replace',
+                           creationflags=(subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0))
+        if p.returncode != 0:
+            Logger.instance().error(caller="DouyinStreamMergeWorker", msg=f"Final remux failed: {p.stderr}")
+            try:
+                os.remove(output_path)
+            except OSError:
+                pass
+            return False
+        return True
+
+
+class DouyinPlanWorker(QThread):
+    """Probes a merge-only batch concurrently (one ffprobe per file) and builds its NormalizePlan."""
+    planned = pyqtSignal(object)    # NormalizePlan
+    failed = pyqtSignal(str)
+
+    def __init__(self, video_files: List[str], parent=None):
         super().__init__(parent)
+        self.video_files = list(video_files)
+
+    def run(self):
+        try:
+            workers = max(1, min(MAX_CONCURRENT_PROBES, len(self.video_files)))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                signatures = dict(zip(self.video_files, executor.map(probe_signature, self.video_files)))
+            self.planned.emit(plan_normalization(self.video_files, signatures))
+        except Exception as e:
+            self.failed.emit(str(e))
+
+
+class DouyinJobSignals(QObject):
+    progress = pyqtSignal(str, float)       # task id, percent
+    completed = pyqtSignal(str, str)        # task id, output path
+    failed = pyqtSignal(str, str, str)      # task id, input path, error message
+    finished = pyqtSignal(str)              # task id; always emitted last, also after failure/cancel
+
+
+class _DouyinJob(QRunnable):
+    """
+    One ffmpeg job in DouyinProcessor's bounded pool. `index` is the file's position in
+    the batch input, used to keep results in input order regardless of completion order.
+    """
+    def __init__(self, task_id: str, input_path: str, index: int = 0):
+        super().__init__()
+        self.setAutoDelete(False) # The processor keeps jobs until the batch ends (tryTake/cancel)
         self.task_id = task_id
         self.input_path = input_path
+        self.index = index
+        self.signals = DouyinJobSignals()
+        self.started = False
+        self.is_cancelled = False
+        self._process: Optional[subprocess.Popen] = None
+
+    def cancel(self):
+        """Stops a running job by killing its ffmpeg process."""
+        self.is_cancelled = True
+        process = self._process
+        if process is not None and process.poll() is None:
+            try:
+                process.kill()
+            except Exception:
+                pass
 
     def run(self):
-        # Acquire semaphore to limit concurrent re-encoding
-        Logger.instance().debug(caller="DouyinTrimWorker", msg=f"Task {self.task_id}: Waiting for encoding slot...")
-        encoding_semaphore.acquire()
-        
+        self.started = True
         try:
-            Logger.instance().info(caller="DouyinTrimWorker", msg=f"Task {self.task_id}: Starting re-encoding (slot acquired)")
-            self._perform_trimming()
+            if self.is_cancelled:
+                self.signals.failed.emit(self.task_id, self.input_path, "Cancelled")
+                return
+            self._perform()
+        except Exception as e:
+            self.signals.failed.emit(self.task_id, self.input_path, str(e))
         finally:
-            # Always release the semaphore, even if an error occurs
-            encoding_semaphore.release()
-            Logger.instance().debug(caller="DouyinTrimWorker", msg=f"Task {self.task_id}: Encoding slot released")
-    
-    def _perform_trimming(self):
-        """Perform the actual trimming operation."""
+            self._process = None
+            self.signals.finished.emit(self.task_id)
+
+    def _perform(self):
+        raise NotImplementedError
+
+    def _run_ffmpeg(self, cmd: List[str], duration: float, progress_range=(0.0, 1.0)) -> Optional[str]:
+        """
+        Runs ffmpeg, forwarding progress scaled into progress_range (for multi-step jobs).
+        Returns None on success, else an error message.
+        """
+        process = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='replace',
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        )
+        self._process = process
+        stderr_tail: List[str] = []
+        while process.poll() is None:
+            line = process.stderr.readline()
+            if line:
+                stderr_tail = (stderr_tail + [line])[-20:]
+                progress_val = parse_ffmpeg_progress(line, duration)
+                if progress_val is not None:
+                    low, high = progress_range
+                    self.signals.progress.emit(self.task_id, low + (high - low) * progress_val)
+        if self.is_cancelled:
+            return "Cancelled"
+        if process.returncode == 0:
+            return None
+        return f"FFmpeg error: {''.join(stderr_tail) + (process.stderr.read() or '')}"
+
+
+class DouyinTrimWorker(_DouyinJob):
+    """
+    Removes the Douyin outro (last 3.03 s) from a clip in place.
+
+    With fast_trim, clips already in the trim output format (TRIM_TARGET_SIGNATURE) are
+    stream-copied up to the last keyframe before the cut and only the remaining tail is
+    re-encoded; anything else, or any failure of that path, gets the full re-encode.
+    """
+
+    def __init__(self, task_id: str, input_path: str, index: int = 0, fast_trim: bool = True):
+        super().__init__(task_id, input_path, index)
+        self.fast_trim = fast_trim
+
+    def _perform(self):
+        duration = get_video_duration(self.input_path)
+        if duration is None or duration <= DOUYIN_OUTRO_SECONDS:
+            self.signals.failed.emit(self.task_id, self.input_path, "Video too short or invalid")
+            return
+        if self.fast_trim:
+            signature = probe_signature(self.input_path)
+            if matches_trim_target(signature):
+                Logger.instance().info(caller="DouyinTrimWorker", msg=f"Task {self.task_id}: Stream-copy trim")
+                if self._perform_fast_trimming(duration, signature):
+                    return
+                if self.is_cancelled:
+                    self.signals.failed.emit(self.task_id, self.input_path, "Cancelled")
+                    return
+                Logger.instance().warning(caller="DouyinTrimWorker", msg=f"Task {self.task_id}: Stream-copy trim failed, re-encoding")
+        Logger.instance().info(caller="DouyinTrimWorker", msg=f"Task {self.task_id}: Starting re-encoding")
+        self._perform_trimming(duration)
+
+    def _perform_fast_trimming(self, duration: float, signature: dict) -> bool:
+        """Copies up to the last keyframe before the cut, re-encodes the tail. Returns True on success."""
+        cut = duration - DOUYIN_OUTRO_SECONDS
+        keyframe = last_keyframe_before(self.input_path, cut)
+        if keyframe is None:
+            return False
+        input_dir = Path(self.input_path).parent
+        head_ts = str(input_dir / f'temp_{self.task_id}_head.ts')
+        tail_ts = str(input_dir / f'temp_{self.task_id}_tail.ts')
+        list_path = str(input_dir / f'temp_{self.task_id}_list.txt')
+        temp_output = str(input_dir / f'temp_{self.task_id}.mp4')
+        segments = []
         try:
-            duration = get_video_duration(self.input_path)
-            if duration is None or duration <= 3.03:
-                self.failed.emit(self.task_id, "Video too short or invalid")
-                return
-            
-            trim_duration = duration - 3.03
-            input_dir = Path(self.input_path).parent
-            temp_output = str(input_dir / f'temp_{self.task_id}.mp4')
-            
-            # Re-encode during trimming to ensure proper keyframes and sync
-            # This prevents video/audio desync issues from imprecise cuts
-            cmd = [
-                'ffmpeg', '-i', self.input_path, 
-                '-t', str(trim_duration),
-                '-vf', 'scale=720:1280:force_original_aspect_ratio=decrease,pad=720:1280:(ow-iw)/2:(oh-ih)/2',  # Scale to 720p maintaining aspect ratio
-                '-c:v', 'libx264', '-crf', '20', '-preset', 'medium',  # Re-encode video with high quality
-                '-r', '30',  # Force 30fps for consistency
-                '-force_key_frames', '0',  # Ensure first frame is keyframe
-                '-c:a', 'aac', '-b:a', '128k',  # Re-encode audio
-                '-pix_fmt', 'yuv420p',  # Ensure compatibility
-                '-avoid_negative_ts', 'make_zero',  # Fix timestamp issues
-                '-threads', '2',  # Limit FFmpeg threads per process
-                '-y',
-                temp_output
+            if keyframe > 0:
+                head_cmd = [
+                    'ffmpeg', '-hide_banner', '-i', self.input_path,
+                    '-t', f"{keyframe:.6f}",
+                    '-map', '0:v:0', '-map', '0:a?',
+                    '-c', 'copy', '-bsf:v', 'h264_mp4toannexb',
+                    '-muxpreload', '0', '-muxdelay', '0',
+                    '-f', 'mpegts', '-y', head_ts
+                ]
+                if self._run_ffmpeg(head_cmd, keyframe, (0.0, 0.2)) is not None:
+                    return False
+                segments.append(head_ts)
+            if cut - keyframe > 0.001:
+                profile_arg, level_arg = x264_profile_level_args(signature)
+                # Same settings as the full re-encode so the tail blends with the copied head
+                tail_cmd = [
+                    'ffmpeg', '-hide_banner', '-ss', f"{keyframe:.6f}", '-i', self.input_path,
+                    '-t', f"{cut - keyframe:.6f}",
+                    '-map', '0:v:0', '-map', '0:a?',
+                    '-c:v', 'libx264', '-crf', '20', '-preset', 'medium', '-r', '30', '-pix_fmt', 'yuv420p',
+                ] + profile_arg + level_arg + [
+                    '-c:a', 'aac', '-b:a', '128k',
+                    '-ar', str(signature.get('sample_rate') or 44100), '-ac', str(signature.get('channels') or 2),
+                    '-threads', '2',
+                    '-muxpreload', '0', '-muxdelay', '0',
+                    '-f', 'mpegts', '-y', tail_ts
+                ]
+                if self._run_ffmpeg(tail_cmd, cut - keyframe, (0.2, 0.9)) is not None:
+                    return False
+                segments.append(tail_ts)
+            with open(list_path, 'w', encoding='utf-8') as lf:
+                for seg in segments:
+                    lf.write(f"file '{os.path.abspath(seg)}'\n")
+            join_cmd = [
+                'ffmpeg', '-hide_banner', '-f', 'concat', '-safe', '0', '-i', list_path,
+                '-map', '0:v:0', '-map', '0:a?',
+                '-c', 'copy', '-bsf:a', 'aac_adtstoasc',
+                '-movflags', '+faststart',
+                '-y', temp_output
             ]
-            
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-            )
-            
-            while process.poll() is None:
-                line = process.stderr.readline()
-                if line:
-                    progress_val = parse_ffmpeg_progress(line, duration)
-                    if progress_val is not None:
-                        self.progress.emit(self.task_id, progress_val)
-            
-            if process.returncode == 0:
-                os.remove(self.input_path)
-                os.rename(temp_output, self.input_path)
-                self.completed.emit(self.task_id, self.input_path)
-            else:
-                stderr_output = process.stderr.read()
-                self.failed.emit(self.task_id, f"FFmpeg error: {stderr_output}")
-        except Exception as e:
-            self.failed.emit(self.task_id, str(e))
+            if self._run_ffmpeg(join_cmd, cut, (0.9, 1.0)) is not None:
+                return False
+            os.replace(temp_output, self.input_path)
+            self.signals.completed.emit(self.task_id, self.input_path)
+            return True
+        finally:
+            for path in (head_ts, tail_ts, list_path, temp_output):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _perform_trimming(self, duration: float):
+        """Perform the actual trimming operation."""
+        trim_duration = duration - DOUYIN_OUTRO_SECONDS
+        input_dir = Path(self.input_path).parent
+        temp_output = str(input_dir / f'temp_{self.task_id}.mp4')
+        
+        # Re-encode during trimming to ensure proper keyframes and sync
+        # This prevents video/audio desync issues from imprecise cuts
+        cmd = [
+            'ffmpeg', '-i', self.input_path, 
+            '-t', str(trim_duration),
+            '-vf', 'scale=720:1280:force_original_aspect_ratio=decrease,pad=720:1280:(ow-iw)/2:(oh-ih)/2',  # Scale to 720p maintaining aspect ratio
+            '-c:v', 'libx264', '-crf', '20', '-preset', 'medium',  # Re-encode video with high quality
+            '-r', '30',  # Force 30fps for consistency
+            '-force_key_frames', '0',  # Ensure first frame is keyframe
+            '-c:a', 'aac', '-b:a', '128k',  # Re-encode audio
+            '-pix_fmt', 'yuv420p',  # Ensure compatibility
+            '-avoid_negative_ts', 'make_zero',  # Fix timestamp issues
+            '-threads', '2',  # Limit FFmpeg threads per process
+            '-y',
+            temp_output
+        ]
+        
+        error = self._run_ffmpeg(cmd, duration)
+        if error is None:
+            os.remove(self.input_path)
+            os.rename(temp_output, self.input_path)
+            self.signals.completed.emit(self.task_id, self.input_path)
+        else:
+            try: os.remove(temp_output)
+            except OSError: pass
+            self.signals.failed.emit(self.task_id, self.input_path, error)
+
+
+class _NormalizeWorker(_DouyinJob):
+    """Re-encodes an outlier clip to the batch's majority signature (new temp file, original kept)."""
+
+    def __init__(self, task_id: str, input_path: str, target_sig: dict, index: int = 0):
+        super().__init__(task_id, input_path, index)
+        self.target_sig = target_sig
+
+    def _perform(self):
+        # Determine target parameters
+        width = int(self.target_sig.get('width') or 720)
+        height = int(self.target_sig.get('height') or 1280)
+        fps_expr = (self.target_sig.get('avg_frame_rate') or '30/1')
+        try:
+            num, den = fps_expr.split('/')
+            fps = str(round(float(num)/float(den)))
+        except Exception:
+            fps = '30'
+        # We normalize to H.264 for compatibility
+        vcodec = 'libx264'
+        acodec = 'aac'
+        # Match profile/level to majority signature if present
+        profile_arg, level_arg = x264_profile_level_args(self.target_sig)
+
+        # Fixed GOP length (~2 seconds) and disable scene cut for stable cadence
+        try:
+            g_frames = str(int(round(float(fps))) * 2)
+        except Exception:
+            g_frames = '60'
+
+        input_dir = Path(self.input_path).parent
+        temp_output = str(input_dir / f'normalized_{self.task_id}.mp4')
+        duration = get_video_duration(self.input_path) or 0
+        # Audio normalization targets from majority signature
+        target_sample_rate = self.target_sig.get('sample_rate') or '44100'
+        target_channels = self.target_sig.get('channels') or 2
+        try:
+            target_channels = int(str(target_channels))
+        except Exception:
+            target_channels = 2
+
+        cmd = [
+            'ffmpeg','-i', self.input_path,
+            '-vf', f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",
+            '-c:v', vcodec, '-crf', '20', '-preset', 'medium', '-pix_fmt', 'yuv420p',
+            '-r', fps,
+            '-vsync', 'cfr',
+            '-video_track_timescale', '90000',
+            '-g', g_frames, '-sc_threshold', '0',
+            # No -force_key_frames to avoid cadence distortion
+        ] + profile_arg + level_arg + [
+            '-c:a', acodec, '-profile:a', 'aac_low', '-b:a', '128k',
+            '-ar', str(target_sample_rate), '-ac', str(target_channels),
+            '-avoid_negative_ts', 'make_zero',
+            '-movflags', '+faststart',
+            '-y', temp_output
+        ]
+        error = self._run_ffmpeg(cmd, duration)
+        if error is None:
+            # Do not overwrite original in merge-only mode; return new path
+            self.signals.completed.emit(self.task_id, temp_output)
+        else:
+            try: os.remove(temp_output)
+            except OSError: pass
+            self.signals.failed.emit(self.task_id, self.input_path, error)
+
 
 class DouyinProcessor(QObject):
+    """
+    Trims and/or merges a batch of Douyin clips.
+
+    Trim and normalize jobs run on a bounded QThreadPool (MAX_CONCURRENT_REENCODING
+    threads) instead of one QThread per file. Jobs are queued with priorities that
+    follow the input order, so the front of the batch finishes first; queued jobs can be
+    cancelled without ever starting, and results are kept by input index so the merge
+    always uses the original order.
+
+    For trim+merge, a DouyinStreamMergeWorker appends each trimmed clip to the merge as
+    soon as all clips before it are done, so the merge ends shortly after the last trim.
+    If that stream merge fails, the batch falls back to the regular DouyinMergeWorker.
+    """
     trim_batch_started = pyqtSignal(int)
     trim_file_started = pyqtSignal(str, str, int, int)
     trim_file_progress = pyqtSignal(str, float)
@@ -348,6 +832,8 @@ class DouyinProcessor(QObject):
     merge_completed = pyqtSignal(str)
     merge_failed = pyqtSignal(str)
     process_finished = pyqtSignal()
+    analysis_started = pyqtSignal(int)
+    normalize_planned = pyqtSignal(object)  # NormalizePlan, emitted before any normalization starts
     normalize_started = pyqtSignal(int)
     normalize_file_started = pyqtSignal(str, str, int, int)
     normalize_file_progress = pyqtSignal(str, float)
@@ -356,41 +842,52 @@ class DouyinProcessor(QObject):
 
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.workers = []
-        self.trimmed_files = []
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(MAX_CONCURRENT_REENCODING)
+        self._jobs: Dict[str, _DouyinJob] = {}      # task id -> job, for the current stage
+        self._pending: set = set()                  # task ids not finished yet
+        self._results: Dict[int, str] = {}          # input index -> output path
+        self._stage: Optional[str] = None           # "trim" | "normalize" | None
         self._is_cancelled = False
         self.should_merge_after_trim = False
         self.completed_count = 0
         self.total_files = 0
+        self._stream_merger: Optional[DouyinStreamMergeWorker] = None
+        self._stream_merge_error: Optional[str] = None
+        self._stream_merge_done = False
+        self._merge_announced = False
+        self._last_merge_progress: Optional[float] = None
+        self._stream_merge_output: Optional[str] = None
+        self._plan_worker: Optional[DouyinPlanWorker] = None
 
     @staticmethod
     def set_max_concurrent_encoding(max_concurrent: int):
         """
         Adjust the maximum number of concurrent encoding processes.
+        Takes effect for the next batch.
         Recommended values:
         - Intel i3/i5: 1-2
         - Intel i7/i9: 2-4  
         - AMD Ryzen 5: 2-3
         - AMD Ryzen 7/9: 3-5
         """
-        global encoding_semaphore, MAX_CONCURRENT_REENCODING
+        global MAX_CONCURRENT_REENCODING
         if max_concurrent < 1:
             max_concurrent = 1
         if max_concurrent > 8:  # Safety limit
             max_concurrent = 8
             
         MAX_CONCURRENT_REENCODING = max_concurrent
-        encoding_semaphore = QSemaphore(max_concurrent)
 
-    def start_processing(self, video_files: List[str], output_directory: str, do_trim: bool, do_merge: bool):
+    def start_processing(self, video_files: List[str], output_directory: str, do_trim: bool, do_merge: bool, fast_trim: bool = True):
         # Reset state for new operation to fix bug of merging old files
-        self.trimmed_files = []
-        self.workers = []
+        self._reset_jobs()
         self._is_cancelled = False
         self.should_merge_after_trim = do_merge
         self.output_directory = output_directory
         self.completed_count = 0
         self.total_files = len(video_files) if do_trim else 0
+        self._pool.setMaxThreadCount(MAX_CONCURRENT_REENCODING)
 
         if not do_trim and not do_merge:
             self.process_finished.emit()
@@ -401,42 +898,196 @@ class DouyinProcessor(QObject):
                 caller="DouyinProcessor",
                 msg=f"Starting batch processing of {len(video_files)} files with max {MAX_CONCURRENT_REENCODING} concurrent encoders",
             )
+            self._stage = "trim"
+            self._mixed_merge = False # Trimmed clips share one encoding
+            if do_merge:
+                self._start_stream_merger(len(video_files))
             self.trim_batch_started.emit(len(video_files))
             for index, file_path in enumerate(video_files):
                 task_id = str(uuid.uuid4())
                 self.trim_file_started.emit(task_id, file_path, index + 1, len(video_files))
-                worker = DouyinTrimWorker(task_id, file_path)
-                worker.progress.connect(self.trim_file_progress.emit)
-                worker.completed.connect(self._on_trim_completed)
-                worker.failed.connect(self.trim_file_failed.emit)
-                worker.finished.connect(self._on_worker_finished)
-                self.workers.append(worker)
-                worker.start()  # All workers start immediately, but semaphore controls actual encoding
+                worker = DouyinTrimWorker(task_id, file_path, index, fast_trim=fast_trim)
+                worker.signals.progress.connect(self.trim_file_progress.emit)
+                worker.signals.completed.connect(self._on_trim_completed)
+                worker.signals.failed.connect(self._on_trim_failed)
+                self._submit(worker, len(video_files))
         else:  # No trimming
             if do_merge:
                 # Normalize to majority format, then merge via stream copy
                 self._start_normalize_then_merge(video_files)
 
+    # --- Job queue ---
+
+    def _submit(self, job: _DouyinJob, batch_size: int):
+        """Queues a job; earlier inputs get higher priority so the batch completes front to back."""
+        job.signals.finished.connect(self._on_job_finished)
+        self._jobs[job.task_id] = job
+        self._pending.add(job.task_id)
+        self._pool.start(job, batch_size - job.index)
+
+    def _reset_jobs(self):
+        self._jobs = {}
+        self._pending = set()
+        self._results = {}
+        self._stage = None
+
+    def cancel_job(self, task_id: str) -> bool:
+        """Cancels one job: a queued job is dropped without starting, a running one is killed."""
+        job = self._jobs.get(task_id)
+        if job is None or task_id not in self._pending:
+            return False
+        job.is_cancelled = True
+        if self._pool.tryTake(job):
+            job.signals.failed.emit(task_id, job.input_path, "Cancelled")
+            self._on_job_finished(task_id)
+        else:
+            job.cancel()
+        return True
+
+    def cancel_all_trimming(self):
+        """
+        Drops all queued jobs and stops the running ones; no merge is started afterwards.
+        A merge that is already running (merge_started was emitted) is not interrupted.
+        """
+        self._is_cancelled = True
+        jobs = [job for job in self._jobs.values() if job.task_id in self._pending]
+        for job in jobs:
+            job.is_cancelled = True
+        # tryTake only succeeds for jobs the pool has not started, so none is reported twice
+        queued = [job for job in jobs if self._pool.tryTake(job)]
+        Logger.instance().warning(caller="DouyinProcessor", msg=f"Cancelling {len(jobs)} jobs ({len(queued)} not started)...")
+        for job in queued:
+            job.signals.failed.emit(job.task_id, job.input_path, "Cancelled")
+        for job in queued:
+            self._pending.discard(job.task_id)
+        for job in jobs:
+            if job.task_id in self._pending:
+                job.cancel()
+        if not self._pending and self._stage is not None:
+            self._on_stage_finished()
+
+    def _on_job_finished(self, task_id: str):
+        if task_id not in self._pending:
+            return
+        self._pending.discard(task_id)
+        if not self._pending:
+            self._on_stage_finished()
+
+    def _on_stage_finished(self):
+        stage, self._stage = self._stage, None
+        if stage == "trim":
+            self._on_trim_stage_finished()
+        elif stage == "normalize":
+            self._on_normalize_stage_finished()
+
+    def _ordered_results(self) -> List[str]:
+        return [self._results[i] for i in sorted(self._results)]
+
+    # --- Trim stage ---
+
     def _on_trim_completed(self, task_id, file_path):
-        self.trimmed_files.append(file_path)
+        job = self._jobs.get(task_id)
+        if job is not None:
+            self._results[job.index] = file_path
+            if self._stream_merger is not None:
+                self._stream_merger.submit(job.index, file_path)
         self.completed_count += 1
         self.trim_file_completed.emit(task_id, file_path)
         
         Logger.instance().info(caller="DouyinProcessor", msg=f"Completed {self.completed_count}/{self.total_files} files")
 
-    def _on_worker_finished(self):
-        self.workers = [w for w in self.workers if not w.isFinished()]
-        if not self.workers:
-            Logger.instance().info(
-                caller="DouyinProcessor",
-                msg=f"All trimming workers finished. Processed {len(self.trimmed_files)} files successfully",
-            )
-            self.trim_batch_finished.emit()
-            # Start merging after trimming is complete
-            if self.trimmed_files and self.should_merge_after_trim:
-                self._start_merging(self.trimmed_files)
-            else: # Trim only, no merge
-                self.process_finished.emit()
+    def _on_trim_failed(self, task_id, file_path, error):
+        job = self._jobs.get(task_id)
+        if job is not None and self._stream_merger is not None:
+            self._stream_merger.submit(job.index, None) # Let the merge skip past this clip
+        self.trim_file_failed.emit(task_id, file_path, error)
+
+    def _on_trim_stage_finished(self):
+        trimmed_files = self._ordered_results()
+        Logger.instance().info(
+            caller="DouyinProcessor",
+            msg=f"All trimming workers finished. Processed {len(trimmed_files)} files successfully",
+        )
+        self._jobs = {}
+        self.trim_batch_finished.emit()
+        if trimmed_files and self.should_merge_after_trim and not self._is_cancelled:
+            if self._stream_merger is not None and self._stream_merge_error is None:
+                # Most of the merge already happened while trimming; show the remainder
+                self._announce_stream_merge()
+            else:
+                self._stop_stream_merger()
+                self._start_merging(trimmed_files)
+        else: # Trim only, no merge
+            self._stop_stream_merger()
+            self.process_finished.emit()
+
+    # --- Streaming merge (trim+merge) ---
+
+    def _start_stream_merger(self, total: int):
+        self._stop_stream_merger()
+        self._stream_merge_error = None
+        self._stream_merge_done = False
+        self._merge_announced = False
+        self._last_merge_progress = None
+        self._stream_merge_output = None
+        merger = DouyinStreamMergeWorker(total, self.output_directory, parent=self)
+        merger.progress.connect(self._on_stream_merge_progress)
+        merger.completed.connect(self._on_stream_merge_completed)
+        merger.failed.connect(self._on_stream_merge_failed)
+        merger.finished.connect(self._on_stream_merge_finished)
+        merger.finished.connect(merger.deleteLater)
+        self._stream_merger = merger
+        merger.start()
+
+    def _stop_stream_merger(self):
+        """Detaches and aborts the stream merger; its remaining signals are ignored."""
+        merger, self._stream_merger = self._stream_merger, None
+        if merger is not None:
+            merger.abort()
+
+    def _announce_stream_merge(self):
+        self._merge_announced = True
+        Logger.instance().info(caller="DouyinProcessor", msg="Finishing streamed merge of trimmed files")
+        self.merge_started.emit()
+        if self._last_merge_progress is not None:
+            self.merge_progress.emit(self._last_merge_progress)
+        if self._stream_merge_output is not None:
+            self.merge_completed.emit(self._stream_merge_output)
+        if self._stream_merge_done:
+            self._stream_merger = None
+            self.process_finished.emit()
+
+    def _on_stream_merge_progress(self, value: float):
+        if self.sender() is not self._stream_merger:
+            return
+        self._last_merge_progress = value
+        if self._merge_announced:
+            self.merge_progress.emit(value)
+
+    def _on_stream_merge_completed(self, output_path: str):
+        if self.sender() is not self._stream_merger:
+            return
+        self._stream_merge_output = output_path
+        if self._merge_announced:
+            self.merge_completed.emit(output_path)
+
+    def _on_stream_merge_failed(self, error: str):
+        if self.sender() is not self._stream_merger:
+            return
+        Logger.instance().warning(caller="DouyinProcessor", msg=f"Streamed merge failed, falling back to a full merge: {error}")
+        self._stream_merge_error = error
+        if self._merge_announced:
+            # Trimming is over; redo the merge from the trimmed files
+            self._stream_merger = None
+            self._start_merging(self._ordered_results())
+
+    def _on_stream_merge_finished(self):
+        if self.sender() is not self._stream_merger:
+            return
+        self._stream_merge_done = True
+        if self._merge_announced and self._stream_merge_error is None:
+            self._stream_merger = None
+            self.process_finished.emit()
 
     def _start_merging(self, files_to_merge: List[str]):
         if not files_to_merge:
@@ -460,237 +1111,89 @@ class DouyinProcessor(QObject):
 
     # --- New: Normalize then merge for merge-only mode ---
     def _start_normalize_then_merge(self, files_to_merge: List[str]):
+        if not files_to_merge:
+            self.merge_failed.emit("No files to merge.")
+            self.process_finished.emit()
+            return
+        # Probe in the background; _on_normalize_planned continues on the GUI thread
+        self.analysis_started.emit(len(files_to_merge))
+        self._plan_worker = DouyinPlanWorker(files_to_merge, parent=self)
+        self._plan_worker.planned.connect(self._on_normalize_planned)
+        self._plan_worker.failed.connect(self._on_normalize_plan_failed)
+        self._plan_worker.finished.connect(self._plan_worker.deleteLater)
+        self._plan_worker.start()
+
+    def _on_normalize_plan_failed(self, error: str):
+        self._plan_worker = None
+        self.merge_failed.emit(error)
+        self.process_finished.emit()
+
+    def _on_normalize_planned(self, plan: NormalizePlan):
+        self._plan_worker = None
+        if self._is_cancelled:
+            self.process_finished.emit()
+            return
         try:
-            if not files_to_merge:
-                self.merge_failed.emit("No files to merge.")
-                self.process_finished.emit()
-                return
-            # Analyze with ffprobe
-            signatures = []
-            for f in files_to_merge:
-                sig = self._probe_signature(f)
-                if sig:
-                    signatures.append((f, sig))
-            if not signatures:
+            if plan.target is None:
                 self.merge_failed.emit("Could not analyze inputs.")
                 self.process_finished.emit()
                 return
-            # Reset mixed flags for this run
-            self._mixed_merge = False
-            # Determine if audio is heterogeneous across inputs
-            audio_keys = set()
-            for _, s in signatures:
-                audio_keys.add((s.get('acodec'), s.get('sample_rate'), s.get('channels'), s.get('channel_layout')))
-            self._mixed_audio = len(audio_keys) > 1
-            # Pick majority signature
-            from collections import Counter
-            sig_list = [json.dumps(s, sort_keys=True) for _, s in signatures]
-            common_sig_json, _ = Counter(sig_list).most_common(1)[0]
-            common_sig = json.loads(common_sig_json)
-
-            # Plan normalization
-            to_copy = []
-            to_encode = []
-            for f, sig in signatures:
-                if self._signatures_match(sig, common_sig):
-                    to_copy.append(f)
-                else:
-                    to_encode.append(f)
-
+            self._mixed_audio = plan.mixed_audio
             # Track whether the final merge will mix originals with normalized outputs
-            self._mixed_merge = bool(to_copy and to_encode)
+            self._mixed_merge = bool(plan.to_copy and plan.to_encode)
+            self.normalize_planned.emit(plan)
 
+            files_to_merge = plan.files
+            to_encode = plan.to_encode
             # If all match, just merge
             if not to_encode:
                 self._start_merging(files_to_merge)
                 return
 
-            # Normalize outliers concurrently with semaphore
+            # Normalize outliers on the bounded pool
             self.normalize_started.emit(len(to_encode))
-            self.workers = []
+            self._reset_jobs()
+            self._stage = "normalize"
             self._temp_normalized_files = []
             self.completed_count = 0
             self.total_files = len(to_encode)
             self._merge_input_order = list(files_to_merge)
-            self._task_to_original = {}
-            self._normalized_map = {}
-            for index, f in enumerate(to_encode):
+            # Inputs that need no normalization are merged as they are
+            self._results = {i: f for i, f in enumerate(files_to_merge)}
+            input_index = {f: i for i, f in enumerate(files_to_merge)}
+            for n, f in enumerate(to_encode):
                 task_id = str(uuid.uuid4())
-                self.normalize_file_started.emit(task_id, f, index + 1, len(to_encode))
-                worker = _NormalizeWorker(task_id, f, common_sig)
-                worker.progress.connect(self.normalize_file_progress.emit)
-                worker.completed.connect(self._on_normalize_completed)
-                worker.failed.connect(self.normalize_file_failed.emit)
-                worker.finished.connect(self._on_worker_finished_normalize)
-                self.workers.append(worker)
-                self._task_to_original[task_id] = f
-                worker.start()
+                self.normalize_file_started.emit(task_id, f, n + 1, len(to_encode))
+                worker = _NormalizeWorker(task_id, f, plan.target, input_index[f])
+                worker.signals.progress.connect(self.normalize_file_progress.emit)
+                worker.signals.completed.connect(self._on_normalize_completed)
+                worker.signals.failed.connect(self.normalize_file_failed.emit)
+                self._submit(worker, len(files_to_merge))
             # Keep to_copy for later
-            self._files_to_copy_after_normalize = to_copy
+            self._files_to_copy_after_normalize = plan.to_copy
         except Exception as e:
             self.merge_failed.emit(str(e))
             self.process_finished.emit()
 
-    def _on_worker_finished_normalize(self):
-        self.workers = [w for w in self.workers if not w.isFinished()]
-        if not self.workers:
-            # Build ordered list following original input order
-            ordered = []
-            for orig in self._merge_input_order:
-                mapped = self._normalized_map.get(orig, orig)
-                ordered.append(mapped)
-            # Start merge, then cleanup temp normalized files after completion
-            self._start_merging(ordered)
+    def _on_normalize_stage_finished(self):
+        self._jobs = {}
+        if self._is_cancelled:
+            self.process_finished.emit()
+            return
+        # Results are keyed by input index, so this follows the original input order
+        self._start_merging(self._ordered_results())
 
     def _on_normalize_completed(self, task_id, file_path):
         # Map original to normalized path and track for cleanup
-        orig = self._task_to_original.get(task_id)
-        if orig:
-            self._normalized_map[orig] = file_path
+        job = self._jobs.get(task_id)
+        if job is not None:
+            self._results[job.index] = file_path
         self._temp_normalized_files.append(file_path)
         self.completed_count += 1
         self.normalize_file_completed.emit(task_id, file_path)
 
     def _probe_signature(self, filepath: str):
-        try:
-            cmd = ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_streams', '-select_streams', 'v:0', filepath]
-            p = subprocess.run(cmd, capture_output=True, text=True, check=True, creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0)
-            v = json.loads(p.stdout)['streams'][0]
-            acmd = ['ffprobe', '-v', 'quiet', '-print_format', 'json', '-show_streams', '-select_streams', 'a:0', filepath]
-            ap = subprocess.run(acmd, capture_output=True, text=True, creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0)
-            a = None
-            if ap.returncode == 0:
-                data = json.loads(ap.stdout)
-                if data.get('streams'):
-                    a = data['streams'][0]
-            return {
-                'vcodec': v.get('codec_name'),
-                'vprofile': v.get('profile'),
-                'vlevel': v.get('level'),
-                'width': v.get('width'),
-                'height': v.get('height'),
-                'pix_fmt': v.get('pix_fmt'),
-                'r_frame_rate': v.get('r_frame_rate'),
-                'avg_frame_rate': v.get('avg_frame_rate'),
-                'acodec': (a or {}).get('codec_name'),
-                'sample_rate': (a or {}).get('sample_rate'),
-                'channels': (a or {}).get('channels'),
-                'channel_layout': (a or {}).get('channel_layout'),
-            }
-        except Exception:
-            return None
+        return probe_signature(filepath)
 
     def _signatures_match(self, a: dict, b: dict) -> bool:
-        keys = ['vcodec','vprofile','vlevel','width','height','pix_fmt','avg_frame_rate','acodec','sample_rate','channels','channel_layout']
-        return all(str(a.get(k)) == str(b.get(k)) for k in keys)
-
-
-class _NormalizeWorker(QThread):
-    progress = pyqtSignal(str, float)
-    completed = pyqtSignal(str, str)
-    failed = pyqtSignal(str, str, str)
-
-    def __init__(self, task_id: str, input_path: str, target_sig: dict, parent=None):
-        super().__init__(parent)
-        self.task_id = task_id
-        self.input_path = input_path
-        self.target_sig = target_sig
-
-    def run(self):
-        encoding_semaphore.acquire()
-        try:
-            # Determine target parameters
-            width = int(self.target_sig.get('width') or 720)
-            height = int(self.target_sig.get('height') or 1280)
-            fps_expr = (self.target_sig.get('avg_frame_rate') or '30/1')
-            try:
-                num, den = fps_expr.split('/')
-                fps = str(round(float(num)/float(den)))
-            except Exception:
-                fps = '30'
-            # We normalize to H.264 for compatibility
-            vcodec = 'libx264'
-            acodec = 'aac'
-            # Match profile/level to majority signature if present
-            vprofile = self.target_sig.get('vprofile')
-            vlevel = self.target_sig.get('vlevel')
-            level_arg: list[str] = []
-            profile_arg: list[str] = []
-            if vprofile and isinstance(vprofile, str):
-                profile_arg = ['-profile:v', vprofile.lower()]
-            # ffprobe level often returns integers like 50 -> use 5.0
-            if vlevel not in (None, 'Unknown'):
-                try:
-                    lvl_str = str(vlevel)
-                    if lvl_str.isdigit() and len(lvl_str) == 2:
-                        lvl_str = f"{lvl_str[0]}.{lvl_str[1]}"
-                    level_arg = ['-level', lvl_str]
-                except Exception:
-                    level_arg = []
-
-            # Fixed GOP length (~2 seconds) and disable scene cut for stable cadence
-            try:
-                g_frames = str(int(round(float(fps))) * 2)
-            except Exception:
-                g_frames = '60'
-
-            input_dir = Path(self.input_path).parent
-            temp_output = str(input_dir / f'normalized_{self.task_id}.mp4')
-            duration = get_video_duration(self.input_path) or 0
-            # Audio normalization targets from majority signature
-            target_sample_rate = self.target_sig.get('sample_rate') or '44100'
-            target_channels = self.target_sig.get('channels') or 2
-            try:
-                target_channels = int(str(target_channels))
-            except Exception:
-                target_channels = 2
-
-            cmd = [
-                'ffmpeg','-i', self.input_path,
-                '-vf', f"scale={width}:{height}:force_original_aspect_ratio=decrease,pad={width}:{height}:(ow-iw)/2:(oh-ih)/2",
-                '-c:v', vcodec, '-crf', '20', '-preset', 'medium', '-pix_fmt', 'yuv420p',
-                '-r', fps,
-                '-vsync', 'cfr',
-                '-video_track_timescale', '90000',
-                '-g', g_frames, '-sc_threshold', '0',
-                # No -force_key_frames to avoid cadence distortion
-            ] + profile_arg + level_arg + [
-                '-c:a', acodec, '-profile:a', 'aac_low', '-b:a', '128k',
-                '-ar', str(target_sample_rate), '-ac', str(target_channels),
-                '-avoid_negative_ts', 'make_zero',
-                '-movflags', '+faststart',
-                '-y', temp_output
-            ]
-            process = subprocess.Popen(
-                cmd,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                encoding='utf-8',
-                errors='replace',
-                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-            )
-            while process.poll() is None:
-                line = process.stderr.readline()
-                if line:
-                    progress_val = parse_ffmpeg_progress(line, duration)
-                    if progress_val is not None:
-                        self.progress.emit(self.task_id, progress_val)
-            if process.returncode == 0:
-                # Do not overwrite original in merge-only mode; return new path
-                self.completed.emit(self.task_id, temp_output)
-            else:
-                stderr_output = process.stderr.read()
-                self.failed.emit(self.task_id, self.input_path, f"FFmpeg error: {stderr_output}")
-        except Exception as e:
-            self.failed.emit(self.task_id, self.input_path, str(e))
-        finally:
-            encoding_semaphore.release()
-
-    def cancel_all_trimming(self):
-        self._is_cancelled = True
-        Logger.instance().warning(caller="DouyinProcessor", msg=f"Cancelling {len(self.workers)} active workers...")
-        for worker in self.workers:
-            if worker.isRunning():
-                worker.terminate()
-                worker.wait() 
\ No newline at end of file
+        return signatures_match(a, b)
@@ -2,10 +2,12 @@
 FFmpeg utilities for video compression.
 Simplified version assuming FFmpeg is available via system PATH.
 """
+import json
 import subprocess
 import re
 import os
-from typing import Optional, Tuple
+import threading
+from typing import Dict, Optional, Tuple
 from pathlib import Path
 from qt_base_app.models.logger import Logger
 
@@ -120,6 +122,68 @@ def get_video_resolution(input_path: str, ffmpeg_path: str = "ffmpeg") -> Option
         Logger.instance().error(caller="FFmpegUtils", msg=f"Error getting video resolution: {e}", exc_info=True)
         return None
 
+# (path, size, mtime) -> probe_video_info result, shared by the compression manager and workers
+_probe_cache: Dict[Tuple[str, int, float], Dict] = {}
+_probe_cache_lock = threading.Lock()
+
+def probe_video_info(input_path: str, ffmpeg_path: str = "ffmpeg") -> Optional[Dict]:
+    """
+    Get width, height and duration of a video with one ffprobe call.
+    Results are cached per (path, size, mtime), so a file is probed once until it changes.
+
+    Args:
+        input_path: Path to input video file
+        ffmpeg_path: Path to FFmpeg executable (used to find ffprobe)
+
+    Returns:
+        Optional[Dict]: {'width', 'height', 'duration'} (each may be None), or None if probing failed
+    """
+    try:
+        st = os.stat(input_path)
+        key = (os.path.abspath(input_path), st.st_size, st.st_mtime)
+    except OSError:
+        return None
+    with _probe_cache_lock:
+        cached = _probe_cache.get(key)
+    if cached is not None:
+        return cached
+
+    ffprobe_path = ffmpeg_path.replace("ffmpeg", "ffprobe")
+    try:
+        cmd = [
+            ffprobe_path,
+            "-v", "error",
+            "-select_streams", "v:0",
+            "-show_entries", "stream=width,height:format=duration",
+            "-of", "json",
+            input_path
+        ]
+        result = subprocess.run(
+            cmd,
+            capture_output=True,
+            text=True,
+            timeout=15,
+            encoding='utf-8',
+            errors='replace',
+            creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+        )
+        if result.returncode != 0:
+            return None
+        data = json.loads(result.stdout or "{}")
+        stream = (data.get('streams') or [{}])[0]
+        duration = data.get('format', {}).get('duration')
+        info = {
+            'width': int(stream['width']) if stream.get('width') else None,
+            'height': int(stream['height']) if stream.get('height') else None,
+            'duration': float(duration) if duration not in (None, 'N/A') else None,
+        }
+        with _probe_cache_lock:
+            _probe_cache[key] = info
+        return info
+    except Exception as e:
+        Logger.instance().error(caller="FFmpegUtils", msg=f"Error probing video: {e}")
+        return None
+
 def check_ffmpeg_requirements(ffmpeg_path: str = "ffmpeg") -> dict:
     """
     Check if FFmpeg meets requirements for video compression.
@@ -423,6 +487,19 @@ def parse_ffmpeg_progress(line: str, total_duration: Optional[float]) -> Optiona
     
     return None
 
+def parse_ffmpeg_speed(line: str) -> Optional[float]:
+    """
+    Parse the encode speed multiple (speed=2.5x) from a FFmpeg progress line.
+    
+    Returns:
+        Optional[float]: Media seconds encoded per wall-clock second, or None
+    """
+    speed_match = re.search(r'speed=\s*(\d+(?:\.\d+)?)x', line)
+    if speed_match:
+        speed = float(speed_match.group(1))
+        return speed if speed > 0 else None
+    return None
+
 def parse_ffmpeg_error(stderr: str, return_code: int) -> str:
     """
     Parse FFmpeg error output to provide meaningful error messages.
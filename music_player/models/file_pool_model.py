@@ -1,12 +1,13 @@
 from qt_base_app.models.logger import Logger
 # music_player/models/file_pool_model.py
 import os
-from typing import List, Optional, Any, Set
+from typing import List, Optional, Any, Set, Dict
 
 from PyQt6.QtCore import QModelIndex
 
 # Import BaseTableModel - adjust path if necessary based on actual location
 from music_player.ui.components.base_table import BaseTableModel, ColumnDefinition
+from music_player.models.path_search_index import PathSearchIndex
 from qt_base_app.models.logger import Logger # Import Logger
 
 class FilePoolModel(BaseTableModel):
@@ -28,6 +29,8 @@ class FilePoolModel(BaseTableModel):
         self._is_path_filtered: bool = False
         self._allowed_paths: Set[str] = set()
         self._filtered_indices_map: List[int] = []
+        # Built on the first search_paths() call, then kept in sync with inserts/removals
+        self._search_index: Optional[PathSearchIndex] = None
         # -------------------------
         
         logger.debug(self.__class__.__name__, f"[FilePoolModel.__init__] Initializing. Provided source_objects count: {len(source_objects) if source_objects else 0}")
@@ -88,6 +91,8 @@ class FilePoolModel(BaseTableModel):
         self._rebuild_path_set(source_objects)
         # Assign directly to internal list
         self._source_objects = source_objects if source_objects is not None else []
+        self.invalidate_row_cache()
+        self._search_index = None
         # Clear filter state
         self._is_path_filtered = False
         self._allowed_paths.clear()
@@ -119,6 +124,8 @@ class FilePoolModel(BaseTableModel):
         if success:
             # Update our path set to match
             self._pool_paths.update(paths_added_to_set)
+            if self._search_index is not None:
+                self._search_index.add(paths_added_to_set)
             # If filtered, the structure changed, so reset is needed for the map
             if self._is_path_filtered:
                 self.beginResetModel()
@@ -130,59 +137,80 @@ class FilePoolModel(BaseTableModel):
 
     def remove_rows_by_objects(self, objects_to_remove: List[Any]):
         """Removes rows corresponding to the given objects, syncing path set and filter."""
-        logger = Logger.instance()
-        logger.debug(self.__class__.__name__, f"[FilePoolModel] remove_rows_by_objects called with {len(objects_to_remove)} objects.")
-
-        if not objects_to_remove:
-            logger.debug(self.__class__.__name__, "[FilePoolModel] No objects provided for removal.")
+        rows = self._source_rows_for_objects(objects_to_remove)
+        if not rows:
             return
-            
-        # --- Identify paths to remove BEFORE calling super() --- 
-        # We need this *before* the objects are removed from the source list
-        paths_to_remove_from_set = set()
-        valid_objects_for_super = [] # Store objects confirmed to be in the model
-        current_objects_map = {id(obj): i for i, obj in enumerate(self._source_objects)}
-        
-        for obj_to_remove in objects_to_remove:
-            if id(obj_to_remove) in current_objects_map: # Check if object exists in source
-                norm_path = self._get_path_from_obj(obj_to_remove)
-                if norm_path:
-                    paths_to_remove_from_set.add(norm_path)
-                valid_objects_for_super.append(obj_to_remove) # Add to list for super()
-            else:
-                logger.warning(self.__class__.__name__, f"[FilePoolModel] Attempted to remove object ID {id(obj_to_remove)} which is not in _source_objects.")
-                
-        if not valid_objects_for_super:
-            logger.debug(self.__class__.__name__, "[FilePoolModel] No valid objects found to pass to super().remove_rows_by_objects.")
-            return
-        # ------------------------------------------------------
-
-        logger.debug(self.__class__.__name__, f"[FilePoolModel] Calling super().remove_rows_by_objects with {len(valid_objects_for_super)} valid objects.")
-        try:
-            # Let the parent handle the actual removal from _source_objects and signals
-            super().remove_rows_by_objects(valid_objects_for_super)
-            logger.debug(self.__class__.__name__, "[FilePoolModel] super().remove_rows_by_objects finished.")
-        except Exception as e:
-            logger.exception(self.__class__.__name__, f"[FilePoolModel] EXCEPTION during super().remove_rows_by_objects: %s", e)
-            return # Don't proceed with path/filter updates if super failed
-
-        # --- Sync path set and filter map AFTER successful removal --- 
-        logger.debug(self.__class__.__name__, f"[FilePoolModel] _source_objects size AFTER super(): {len(self._source_objects)}")
-        logger.debug(self.__class__.__name__, f"[FilePoolModel] _pool_paths size BEFORE sync: {len(self._pool_paths)}. Removing {len(paths_to_remove_from_set)} paths.")
-        self._pool_paths -= paths_to_remove_from_set # Remove identified paths
-        logger.debug(self.__class__.__name__, f"[FilePoolModel] _pool_paths size AFTER sync: {len(self._pool_paths)}")
-        
-        # Rebuild filter map if filter is active
+
         if self._is_path_filtered:
-            logger.debug(self.__class__.__name__, "[FilePoolModel] Filter active, resetting model after removal.")
-            self.beginResetModel() # Filter map change requires full reset
-            logger.debug(self.__class__.__name__, f"[FilePoolModel] _filtered_indices_map size BEFORE rebuild: {len(self._filtered_indices_map)}")
-            self._rebuild_filter_map()
-            logger.debug(self.__class__.__name__, f"[FilePoolModel] _filtered_indices_map size AFTER rebuild: {len(self._filtered_indices_map)}")
+            # View rows are filtered positions, so source-row signals would be wrong.
+            # Rebuild objects, cell cache, path set and filter map in one pass under a single reset.
+            remove_set = set(rows)
+            removed_paths = []
+            cache = self._get_cell_cache()
+            self.beginResetModel()
+            kept, kept_rows, new_map = [], [], []
+            for i, obj in enumerate(self._source_objects):
+                norm_path = self._get_path_from_obj(obj)
+                if i in remove_set:
+                    if norm_path:
+                        self._pool_paths.discard(norm_path)
+                        removed_paths.append(norm_path)
+                    continue
+                if norm_path and norm_path in self._allowed_paths:
+                    new_map.append(len(kept))
+                kept.append(obj)
+                kept_rows.append(i)
+            self._source_objects = kept
+            cache.keep(kept_rows)
+            self._filtered_indices_map = new_map
             self.endResetModel()
-        else: 
-            logger.debug(self.__class__.__name__, "[FilePoolModel] Not filtered, relying on parent signals for removal update.")
-        # ----------------------------------------------------------
+            removed_count = len(remove_set)
+        else:
+            removed = self._remove_source_rows(rows)
+            removed_paths = []
+            for obj in removed:
+                norm_path = self._get_path_from_obj(obj)
+                if norm_path:
+                    self._pool_paths.discard(norm_path)
+                    removed_paths.append(norm_path)
+            self._filtered_indices_map = list(range(len(self._source_objects)))
+            removed_count = len(removed)
+
+        if self._search_index is not None:
+            self._search_index.remove(removed_paths)
+        Logger.instance().debug(self.__class__.__name__, f"[FilePoolModel] Removed {removed_count} rows; {len(self._pool_paths)} paths remain.")
+
+    def update_objects_by_path(self, updates: Dict[str, Dict[str, Any]]) -> int:
+        """
+        Merges field updates into the source objects with matching paths (in place)
+        and emits a single dataChanged for the affected range. Objects that already
+        hold the given values are left alone.
+        Used for values computed off the UI thread, e.g. file stats.
+
+        Returns:
+            int: The number of objects updated.
+        """
+        if not updates:
+            return 0
+        first_row, last_row, updated = -1, -1, 0
+        changed_rows = []
+        for i, obj in enumerate(self._source_objects):
+            fields = updates.get(self._get_path_from_obj(obj))
+            if fields and isinstance(obj, dict) and any(obj.get(k) != v for k, v in fields.items()):
+                obj.update(fields)
+                changed_rows.append(i)
+                updated += 1
+                if first_row == -1:
+                    first_row = i
+                last_row = i
+        if updated:
+            self.invalidate_row_cache(changed_rows)
+            if self._is_path_filtered:
+                # Source rows don't map contiguously onto view rows; refresh all visible rows
+                first_row, last_row = 0, self.rowCount() - 1
+            if last_row >= first_row >= 0:
+                self.dataChanged.emit(self.index(first_row, 0), self.index(last_row, self.columnCount() - 1))
+        return updated
 
     def rowCount(self, parent=QModelIndex()) -> int:
         """Returns the number of rows, considering the filter."""
@@ -211,10 +239,13 @@ class FilePoolModel(BaseTableModel):
 
     # --- Path Filtering Methods --- 
 
-    def apply_path_filter(self, allowed_paths: Set[str]):
-        """Filters the model to only show items whose paths are in allowed_paths."""
+    def apply_path_filter(self, allowed_paths: Set[str], normalized: bool = False):
+        """
+        Filters the model to only show items whose paths are in allowed_paths.
+        Pass normalized=True when the paths already come from this model (e.g. search_paths()).
+        """
         # Normalize the input paths immediately
-        normalized_allowed = {os.path.normpath(p) for p in allowed_paths}
+        normalized_allowed = set(allowed_paths) if normalized else {os.path.normpath(p) for p in allowed_paths}
         Logger.instance().debug(caller="FilePoolModel", msg=f"[FilePoolModel] Applying path filter with {len(normalized_allowed)} allowed paths.")
         self.beginResetModel()
         self._is_path_filtered = True
@@ -239,6 +270,13 @@ class FilePoolModel(BaseTableModel):
         """Returns True if a path filter is currently active."""
         return self._is_path_filtered
 
+    def search_paths(self, query: str) -> Set[str]:
+        """Returns the (normalized) paths whose file or folder names contain every term of the query."""
+        if self._search_index is None:
+            self._search_index = PathSearchIndex()
+            self._search_index.add(self._pool_paths)
+        return self._search_index.search(query)
+
     # --- Existing Helper Methods ---
 
     def contains_path(self, path_str: str) -> bool:
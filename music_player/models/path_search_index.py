@@ -0,0 +1,117 @@
+"""
+Incremental word/trigram index over file names, used for the track filter fields.
+
+The selection pool and playlist used to filter with a QSortFilterProxyModel regex,
+which re-evaluates every row on each keystroke. Instead the FilePoolModel keeps
+this index up to date as rows are added/removed, and a query is answered from the
+index's word vocabulary. The matching path set is then applied with
+FilePoolModel.apply_path_filter.
+
+Queries are split on whitespace; every term must appear in the file name or in
+one of its folder names, e.g. an artist directory (case- and accent-insensitive,
+'_' '-' '.' treated as spaces).
+"""
+import os
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+_SEPARATORS = re.compile(r"[\s_\-.]+")
+
+
+def normalize_search_text(text: str) -> str:
+    """Lower-cases, strips accents and collapses separators to single spaces."""
+    folded = unicodedata.normalize("NFKD", text)
+    folded = "".join(ch for ch in folded if not unicodedata.combining(ch)).lower()
+    return _SEPARATORS.sub(" ", folded).strip()
+
+
+def path_words(path: str) -> Tuple[str, ...]:
+    """Distinct normalized words of a path's file name and parent folder names."""
+    _, rest = os.path.splitdrive(path)
+    parts = [p for p in re.split(r"[\\/]+", rest) if p]
+    return tuple(set(normalize_search_text(" ".join(parts)).split(" ")) - {""})
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class PathSearchIndex:
+    """
+    Token-level index: file and folder names are split into words, each distinct word is
+    indexed by its trigrams once, and words map to the paths containing them. Since query
+    terms contain no separators, a term matches a path exactly when it is a substring of
+    one of its words, so the (small) vocabulary is searched instead of every path.
+    """
+
+    def __init__(self):
+        self._names: Dict[str, Tuple[str, ...]] = {}    # path -> distinct words of its file/folder names
+        self._word_paths: Dict[str, Set[str]] = {}      # word -> paths
+        self._gram_words: Dict[str, Set[str]] = {}      # trigram -> words
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    def add(self, paths: Iterable[str]):
+        for path in paths:
+            if path in self._names:
+                continue
+            words = path_words(path)
+            self._names[path] = words
+            for word in words:
+                holders = self._word_paths.get(word)
+                if holders is None:
+                    holders = self._word_paths[word] = set()
+                    for gram in _trigrams(word):
+                        self._gram_words.setdefault(gram, set()).add(word)
+                holders.add(path)
+
+    def remove(self, paths: Iterable[str]):
+        for path in paths:
+            words = self._names.pop(path, None)
+            if words is None:
+                continue
+            for word in words:
+                holders = self._word_paths.get(word)
+                if holders is None:
+                    continue
+                holders.discard(path)
+                if not holders:
+                    del self._word_paths[word]
+                    for gram in _trigrams(word):
+                        bucket = self._gram_words.get(gram)
+                        if bucket is not None:
+                            bucket.discard(word)
+                            if not bucket:
+                                del self._gram_words[gram]
+
+    def clear(self):
+        self._names.clear()
+        self._word_paths.clear()
+        self._gram_words.clear()
+
+    def _words_containing(self, term: str) -> List[str]:
+        grams = _trigrams(term)
+        if not grams:
+            candidates = self._word_paths.keys() # Short term: scan the vocabulary
+        else:
+            buckets = sorted((self._gram_words.get(g, set()) for g in grams), key=len)
+            candidates = set(buckets[0]).intersection(*buckets[1:])
+        # Trigrams only prove the pieces are present; confirm the term itself
+        return [word for word in candidates if term in word]
+
+    def search(self, query: str) -> Set[str]:
+        """Returns the paths whose file or folder names contain every term of the query."""
+        terms = [t for t in normalize_search_text(query).split(" ") if t]
+        if not terms:
+            return set(self._names)
+        result: Optional[Set[str]] = None
+        for term in sorted(terms, key=len, reverse=True): # Longer terms are usually more selective
+            matches: Set[str] = set()
+            for word in self._words_containing(term):
+                matches |= self._word_paths[word]
+            result = matches if result is None else result & matches
+            if not result:
+                return set()
+        return result
@@ -3,6 +3,7 @@ import json
 import os
 import re
 import random # Import random for shuffle
+from dataclasses import dataclass
 from pathlib import Path
 from typing import List, Optional, Dict, Any, Union
 from qt_base_app.models.settings_manager import SettingsManager, SettingType
@@ -16,6 +17,44 @@ from music_player.models.settings_defs import PREF_WORKING_DIR_KEY, DEFAULT_WORK
 # Module-level cache for working directory
 _cached_working_dir: Optional[Path] = None
 
+# Header cache for the playlists directory (see PlaylistManager.load_catalog)
+CATALOG_FILENAME = ".playlist_catalog.json"
+CATALOG_VERSION = 2
+
+# Track additions/removals are appended to "<playlist>.journal" next to the JSON
+# snapshot instead of rewriting it; the journal is folded back into the JSON file
+# once it grows past this many entries (or half the playlist, if larger).
+JOURNAL_SUFFIX = ".journal"
+JOURNAL_COMPACT_MIN_ENTRIES = 200
+
+
+def journal_path_for(filepath: Path) -> Path:
+    """Returns the journal file that belongs to a playlist JSON file."""
+    return filepath.with_suffix(JOURNAL_SUFFIX)
+
+
+def read_journal(journal_path: Path) -> List[Dict[str, str]]:
+    """Reads journal operations; a torn last line from an interrupted write is skipped."""
+    ops: List[Dict[str, str]] = []
+    try:
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    op = json.loads(line)
+                except json.JSONDecodeError:
+                    Logger.instance().warning("Playlist", f"Skipping corrupt journal line in {journal_path}")
+                    continue
+                if isinstance(op, dict) and op.get("op") in ("add", "remove") and op.get("path"):
+                    ops.append(op)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        Logger.instance().error("Playlist", f"Error reading playlist journal {journal_path}: {e}")
+    return ops
+
 # --- Define a default location for the working directory ---
 def get_default_working_dir() -> Path:
     global _cached_working_dir
@@ -114,19 +153,33 @@ class Playlist:
             raise ValueError("Playlist name cannot be empty.")
         self.name: str = name
         self.filepath: Optional[Path] = filepath
-        # Use a set for quick uniqueness checks on paths
-        self._track_set: set[str] = set()
+        # path -> index in self.tracks, for O(1) uniqueness checks and lookups
+        self._track_index: Dict[str, int] = {}
         # Store tracks as list of dicts: {'path': str, 'added_time': str}
         self.tracks: List[Dict[str, str]] = []
         # Initialize current index to -1 (no track selected)
         self._current_index: int = -1
+        # False for playlists created from a catalog header until ensure_loaded() runs
+        self._loaded: bool = True
+        self._header_track_count: int = 0
+        # Journal state: the file/name the on-disk snapshot+journal describe, how many
+        # entries the journal holds and the changes not yet written
+        self._journal_base: Optional[Path] = None
+        self._journal_name: Optional[str] = None
+        self._journal_entries: int = 0
+        self._pending_journal: List[Dict[str, str]] = []
+        # Set by move_to(): the journal at _journal_base is ours to drop on the next snapshot.
+        # Otherwise it may belong to a file we were only imported from and is left alone.
+        self._journal_moved: bool = False
         
         # Add tracking for repeat mode
         self._current_repeat_mode: str = REPEAT_ALL  # Default to REPEAT_ALL
         self._shuffled_indices: List[int] = []       # For REPEAT_RANDOM mode
         self._shuffle_index: int = -1                # Current position in shuffle list
+        self._shuffle_positions: List[int] = []      # Track index -> position in _shuffled_indices
         self._sorted_indices: List[int] = []         # For sorted REPEAT_ALL mode
         self._sorted_playback_index: int = -1        # Current position in sorted list
+        self._sorted_positions: List[int] = []       # Track index -> position in _sorted_indices
 
         # If filepath is provided but no tracks list was given, attempt to load
         if self.filepath and self.filepath.exists() and tracks is None:
@@ -135,10 +188,38 @@ class Playlist:
         elif tracks:
             self._initialize_tracks(tracks)
 
+    @classmethod
+    def from_catalog_entry(cls, entry: 'PlaylistCatalogEntry') -> 'Playlist':
+        """Creates an unloaded playlist from a catalog header; tracks are read by ensure_loaded()."""
+        playlist = cls(name=entry.name)
+        playlist.filepath = entry.filepath
+        playlist._loaded = False
+        playlist._header_track_count = entry.track_count
+        return playlist
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def track_count(self) -> int:
+        """Number of tracks, known from the catalog header even before loading."""
+        return len(self.tracks) if self._loaded else self._header_track_count
+
+    def ensure_loaded(self) -> None:
+        """Reads the track list from disk if this playlist was created from a catalog header."""
+        if self._loaded:
+            return
+        # The header already gave us the name; keep it in case the playlist was renamed before loading
+        name = self.name
+        self._load()
+        self.name = name
+        self._loaded = True
+
     def _initialize_tracks(self, initial_tracks: List[Union[str, Dict[str, str]]]):
         """Initializes the tracks list, handling potential old format."""
         self.tracks = []
-        self._track_set = set()
+        self._track_index = {}
         current_time_iso = datetime.now().isoformat()
 
         for item in initial_tracks:
@@ -146,7 +227,7 @@ class Playlist:
             if isinstance(item, str):
                 # Old format: Convert string path to new dict format
                 norm_path = os.path.normpath(item)
-                if norm_path not in self._track_set:
+                if norm_path not in self._track_index:
                     track_data = {
                         'path': norm_path,
                         'added_time': current_time_iso # Use current time for migration
@@ -154,7 +235,7 @@ class Playlist:
             elif isinstance(item, dict) and 'path' in item and 'added_time' in item:
                 # New format: Validate and use
                 norm_path = os.path.normpath(item['path'])
-                if norm_path not in self._track_set:
+                if norm_path not in self._track_index:
                     # Basic validation of timestamp format
                     try:
                         datetime.fromisoformat(item['added_time'])
@@ -164,8 +245,9 @@ class Playlist:
                         track_data = {'path': norm_path, 'added_time': current_time_iso}
             
             if track_data:
+                 self._track_index[track_data['path']] = len(self.tracks)
                  self.tracks.append(track_data)
-                 self._track_set.add(track_data['path'])
+        self._reset_play_orders()
 
     def add_track(self, track_path: str) -> bool:
         """
@@ -177,24 +259,54 @@ class Playlist:
         Returns:
             bool: True if the track was added, False if it was already present.
         """
-        norm_path = os.path.normpath(track_path)
-        if norm_path not in self._track_set:
-            # Create track data dictionary with current timestamp
-            added_time_iso = datetime.now().isoformat()
-            track_data = {'path': norm_path, 'added_time': added_time_iso}
-            
-            self.tracks.append(track_data)
-            self._track_set.add(norm_path)
-            
-            # If we're in REPEAT_RANDOM mode, update the shuffle indices
-            if self._current_repeat_mode == REPEAT_RANDOM:
-                self._regenerate_shuffle_indices()
-            # Invalidate sorted indices as the order might change
-            self._sorted_indices = []
-            self._sorted_playback_index = -1
-                
-            return True
-        return False
+        return self.add_tracks([track_path]) == 1
+
+    def add_tracks(self, track_paths: List[str]) -> int:
+        """
+        Adds several tracks in one pass, skipping paths already in the playlist.
+        New tracks are appended to the sorted order and shuffled into the
+        not-yet-played part of the shuffle order.
+
+        Args:
+            track_paths (List[str]): Absolute paths of the tracks to add.
+
+        Returns:
+            int: The number of tracks actually added.
+        """
+        self.ensure_loaded()
+        added_time_iso = datetime.now().isoformat()
+        new_indices: List[int] = []
+        for track_path in track_paths:
+            norm_path = os.path.normpath(track_path)
+            if norm_path in self._track_index:
+                continue
+            index = len(self.tracks)
+            self.tracks.append({'path': norm_path, 'added_time': added_time_iso})
+            self._track_index[norm_path] = index
+            new_indices.append(index)
+            self._pending_journal.append({'op': 'add', 'path': norm_path, 'added_time': added_time_iso})
+
+        if not new_indices:
+            return 0
+
+        if self._shuffled_indices:
+            # Keep the played prefix, mix the new tracks into the remainder
+            played = self._shuffled_indices[:self._shuffle_index + 1]
+            remaining = self._shuffled_indices[self._shuffle_index + 1:] + new_indices
+            random.shuffle(remaining)
+            self._shuffled_indices = played + remaining
+            self._rebuild_shuffle_positions()
+        elif self._current_repeat_mode == REPEAT_RANDOM:
+            self._regenerate_shuffle_indices()
+
+        if self._sorted_indices:
+            # Until the UI re-sorts, new tracks play after the sorted ones
+            self._sorted_indices.extend(new_indices)
+            self._sorted_positions.extend(
+                range(len(self._sorted_indices) - len(new_indices), len(self._sorted_indices))
+            )
+
+        return len(new_indices)
 
     def remove_track(self, track_path: str) -> bool:
         """
@@ -206,31 +318,109 @@ class Playlist:
         Returns:
             bool: True if the track was found and removed, False otherwise.
         """
-        norm_path = os.path.normpath(track_path)
-        try:
-            # Find the index of the track dictionary to remove
-            index_to_remove = -1
-            for i, track_data in enumerate(self.tracks):
-                if track_data.get('path') == norm_path:
-                    index_to_remove = i
-                    break
-            
-            if index_to_remove != -1:
-                del self.tracks[index_to_remove]
-                self._track_set.remove(norm_path)
-                
-                # If we're in REPEAT_RANDOM mode, update the shuffle indices
-                if self._current_repeat_mode == REPEAT_RANDOM:
-                    self._regenerate_shuffle_indices()
-                # Invalidate sorted indices as the order will change
-                self._sorted_indices = []
-                self._sorted_playback_index = -1
-                
-            return True
-        except ValueError:
-            return False # Track not found in list
-        except KeyError:
-            return False # Track not found in set (shouldn't happen if list succeeded)
+        return self.remove_tracks([track_path]) == 1
+
+    def remove_tracks(self, track_paths: List[str]) -> int:
+        """
+        Removes several tracks in a single pass over the track list.
+        The shuffle and sorted orders keep their relative order, and the
+        current position moves to the closest preceding surviving track.
+
+        Args:
+            track_paths (List[str]): Absolute paths of the tracks to remove.
+
+        Returns:
+            int: The number of tracks actually removed.
+        """
+        self.ensure_loaded()
+        removed = set()
+        for track_path in track_paths:
+            norm_path = os.path.normpath(track_path)
+            index = self._track_index.get(norm_path)
+            if index is not None and index not in removed:
+                removed.add(index)
+                self._pending_journal.append({'op': 'remove', 'path': norm_path})
+        if not removed:
+            return 0
+
+        # old index -> new index (-1 for removed tracks)
+        remap: List[int] = []
+        kept: List[Dict[str, str]] = []
+        for i, track_data in enumerate(self.tracks):
+            if i in removed:
+                remap.append(-1)
+            else:
+                remap.append(len(kept))
+                kept.append(track_data)
+        self.tracks = kept
+        self._track_index = {track_data['path']: i for i, track_data in enumerate(kept)}
+
+        self._current_index = self._remap_current(self._current_index, remap)
+        self._shuffled_indices, self._shuffle_index = self._remap_order(
+            self._shuffled_indices, self._shuffle_index, remap)
+        self._sorted_indices, self._sorted_playback_index = self._remap_order(
+            self._sorted_indices, self._sorted_playback_index, remap)
+        self._rebuild_shuffle_positions()
+        self._rebuild_sorted_positions()
+        return len(removed)
+
+    def contains_track(self, track_path: str) -> bool:
+        """Returns True if the (normalized) path is in the playlist."""
+        return os.path.normpath(track_path) in self._track_index
+
+    def index_of(self, track_path: str) -> int:
+        """Returns the index of a track in self.tracks, or -1 if not present."""
+        return self._track_index.get(os.path.normpath(track_path), -1)
+
+    # --- Index bookkeeping ---
+
+    @staticmethod
+    def _remap_current(index: int, remap: List[int]) -> int:
+        """Maps a track index across a removal; removed tracks map to the previous survivor."""
+        if not 0 <= index < len(remap):
+            return -1
+        if remap[index] != -1:
+            return remap[index]
+        for old in range(index - 1, -1, -1):
+            if remap[old] != -1:
+                return remap[old]
+        return -1
+
+    @staticmethod
+    def _remap_order(order: List[int], position: int, remap: List[int]):
+        """Drops removed tracks from a play order and translates the rest; returns (order, position)."""
+        new_order: List[int] = []
+        new_position = -1
+        for pos, old in enumerate(order):
+            new = remap[old] if 0 <= old < len(remap) else -1
+            if new != -1:
+                new_order.append(new)
+            if pos == position:
+                # Point at the last surviving entry at or before the old position
+                new_position = len(new_order) - 1
+        return new_order, new_position
+
+    def _rebuild_shuffle_positions(self) -> None:
+        self._shuffle_positions = [-1] * len(self.tracks)
+        for pos, index in enumerate(self._shuffled_indices):
+            if 0 <= index < len(self._shuffle_positions):
+                self._shuffle_positions[index] = pos
+
+    def _rebuild_sorted_positions(self) -> None:
+        self._sorted_positions = [-1] * len(self.tracks)
+        for pos, index in enumerate(self._sorted_indices):
+            if 0 <= index < len(self._sorted_positions):
+                self._sorted_positions[index] = pos
+
+    def _reset_play_orders(self) -> None:
+        """Drops shuffle/sorted state after the track list was replaced wholesale."""
+        self._current_index = -1
+        self._shuffled_indices = []
+        self._shuffle_index = -1
+        self._shuffle_positions = []
+        self._sorted_indices = []
+        self._sorted_playback_index = -1
+        self._sorted_positions = []
 
     def _load(self) -> None:
         """Loads the playlist tracks from its filepath (JSON format)."""
@@ -248,16 +438,15 @@ class Playlist:
                 
                 # Process loaded tracks, handling old/new format
                 self._initialize_tracks(loaded_tracks_raw)
+            self._apply_journal()
 
         except (json.JSONDecodeError, IOError, TypeError) as e:
             Logger.instance().error("Playlist", f"Error loading playlist from {self.filepath}: {e}")
             # Reset to empty state if loading fails
-            self.tracks = []
-            self._track_set = set()
+            self._initialize_tracks([])
         except Exception as e: # Catch other potential errors
              Logger.instance().error("Playlist", f"Unexpected error loading playlist {self.filepath}: {e}")
-             self.tracks = []
-             self._track_set = set()
+             self._initialize_tracks([])
 
     def save(self, working_dir: Optional[Path] = None) -> bool:
         """
@@ -271,6 +460,8 @@ class Playlist:
         Returns:
             bool: True if saving was successful, False otherwise.
         """
+        # Never overwrite the file with an empty track list from an unloaded header
+        self.ensure_loaded()
         if working_dir is None:
             working_dir = get_default_working_dir()
 
@@ -286,23 +477,134 @@ class Playlist:
             Logger.instance().warning("Playlist", f"Playlist filepath '{self.filepath}' is outside the expected directory '{playlist_subdir}'. Correcting path.")
             self.filepath = PlaylistManager.get_playlist_path(self.name, playlist_subdir)
 
+        if self._can_append_journal():
+            return self._append_journal()
+        return self._write_snapshot()
+
+    def move_to(self, filepath: Path, name: Optional[str] = None) -> None:
+        """
+        Points the playlist at a new file after its own file was renamed or moved.
+        The journal left at the old location is removed by the next save.
+        """
+        self.ensure_loaded()
+        if name is not None:
+            self.name = name
+        self.filepath = filepath
+        self._journal_moved = True
+
+    def _compact_threshold(self) -> int:
+        return max(JOURNAL_COMPACT_MIN_ENTRIES, len(self.tracks) // 2)
+
+    def _can_append_journal(self) -> bool:
+        """True if the on-disk snapshot + journal describe this playlist up to the pending changes."""
+        return (self._journal_base is not None
+                and self._journal_base == self.filepath
+                and self._journal_name == self.name
+                and self.filepath.exists()
+                and self._journal_entries + len(self._pending_journal) <= self._compact_threshold())
+
+    def _append_journal(self) -> bool:
+        """Writes only the pending adds/removes (O(changes) instead of O(playlist))."""
+        if not self._pending_journal:
+            return True
+        journal_path = journal_path_for(self.filepath)
+        try:
+            with open(journal_path, 'a', encoding='utf-8') as f:
+                f.write("".join(json.dumps(op) + "\n" for op in self._pending_journal))
+        except OSError as e:
+            Logger.instance().warning("Playlist", f"Could not append to journal {journal_path}, writing full playlist instead: {e}")
+            return self._write_snapshot()
+        self._journal_entries += len(self._pending_journal)
+        self._pending_journal = []
+        return True
+
+    def _write_snapshot(self) -> bool:
+        """Writes the full JSON file and drops the journal it supersedes."""
+        if not self.export_json(self.filepath):
+            return False
+        stale_bases = {self.filepath}
+        if self._journal_moved and self._journal_base is not None:
+            stale_bases.add(self._journal_base)
+        for stale in stale_bases:
+            try:
+                journal_path_for(stale).unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                Logger.instance().warning("Playlist", f"Could not remove playlist journal for {stale}: {e}")
+        self._journal_base = self.filepath
+        self._journal_name = self.name
+        self._journal_entries = 0
+        self._pending_journal = []
+        self._journal_moved = False
+        return True
+
+    def compact(self) -> bool:
+        """Folds the journal back into the JSON file."""
+        self.ensure_loaded()
+        if not self.filepath:
+            return False
+        return self._write_snapshot()
+
+    def export_json(self, target: Path) -> bool:
+        """
+        Writes the complete playlist in the plain JSON format ({"name", "tracks"}),
+        which is also the snapshot format read by _load.
+
+        Args:
+            target (Path): The file to write.
+
+        Returns:
+            bool: True if writing was successful, False otherwise.
+        """
+        self.ensure_loaded()
         data: Dict[str, Any] = {
             "name": self.name,
             "tracks": self.tracks # Already normalized
         }
+        tmp_path = target.with_name(target.name + ".tmp")
         try:
             # Ensure the specific directory exists (already done for playlist_subdir, but safe)
-            self.filepath.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.filepath, 'w', encoding='utf-8') as f:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=4) # Use indent for readability
+            os.replace(tmp_path, target)
             return True
         except (IOError, TypeError) as e:
-            Logger.instance().error("Playlist", f"Error saving playlist to {self.filepath}: {e}")
+            Logger.instance().error("Playlist", f"Error saving playlist to {target}: {e}")
             return False
         except Exception as e: # Catch other potential errors
-             Logger.instance().error("Playlist", f"Unexpected error saving playlist {self.filepath}: {e}")
+             Logger.instance().error("Playlist", f"Unexpected error saving playlist {target}: {e}")
              return False
 
+    def _apply_journal(self) -> None:
+        """Replays the journal next to self.filepath on top of the loaded snapshot."""
+        self._journal_base = self.filepath
+        self._journal_name = self.name
+        self._journal_entries = 0
+        self._pending_journal = []
+        self._journal_moved = False
+        if not self.filepath:
+            return
+        ops = read_journal(journal_path_for(self.filepath))
+        if not ops:
+            return
+
+        # Insertion-ordered path -> track dict; removals and re-adds are O(1) each
+        by_path: Dict[str, Dict[str, str]] = {t['path']: t for t in self.tracks}
+        for op in ops:
+            path = os.path.normpath(op['path'])
+            if op['op'] == 'add':
+                if path not in by_path:
+                    by_path[path] = {'path': path, 'added_time': op.get('added_time') or datetime.now().isoformat()}
+            else:
+                by_path.pop(path, None)
+        self.tracks = list(by_path.values())
+        self._track_index = {path: i for i, path in enumerate(by_path)}
+        self._reset_play_orders()
+        self._journal_entries = len(ops)
+        Logger.instance().debug("Playlist", f"Applied {len(ops)} journal entries to playlist '{self.name}'")
+
     @staticmethod
     def load_from_file(filepath: Path) -> Optional['Playlist']:
         """
@@ -327,6 +629,7 @@ class Playlist:
                     return None
                 # Pass tracks_raw directly to the constructor
                 playlist = Playlist(name=name, filepath=filepath, tracks=tracks_raw)
+                playlist._apply_journal()
                 # Initialize index after loading, but leave as -1 for potential random first track
                 # This allows get_first_file() to work correctly for REPEAT_RANDOM mode
                 return playlist
@@ -344,6 +647,7 @@ class Playlist:
                         return None
                     # Pass tracks_raw directly to the constructor for fallback encoding
                     playlist = Playlist(name=name, filepath=filepath, tracks=tracks_raw)
+                    playlist._apply_journal()
                     Logger.instance().info("Playlist", f"Successfully loaded playlist with latin-1 encoding: {name}")
                     return playlist
             except Exception as alt_e:
@@ -397,23 +701,27 @@ class Playlist:
             return
 
         self._sorted_indices = sorted_indices
-        Logger.instance().debug("Playlist", f"Updated sorted indices: {self._sorted_indices}")
+        self._rebuild_sorted_positions()
+        Logger.instance().debug("Playlist", f"Updated sorted order ({len(self._sorted_indices)} tracks)")
 
-        # Reset sorted playback index, will be updated when track selected/played
-        # Or try to find current track in new order?
+        # Keep playing from the current track's position in the new order
         if 0 <= self._current_index < len(self.tracks):
-            try:
-                # Find the position of the currently playing track's original index
-                # within the new sorted list.
-                self._sorted_playback_index = self._sorted_indices.index(self._current_index)
-                Logger.instance().debug("Playlist", f"Updated sorted playback index to: {self._sorted_playback_index}")
-            except ValueError:
-                # Current track index not found in new sort order (shouldn't happen if list is complete)
-                Logger.instance().warning("Playlist", f"Current index {self._current_index} not found in new sorted indices {self._sorted_indices}. Resetting playback index.")
+            self._sorted_playback_index = self._sorted_positions[self._current_index]
+            if self._sorted_playback_index == -1:
+                # Current track not in the new sort order (e.g. filtered out of the view)
+                Logger.instance().warning("Playlist", f"Current index {self._current_index} not found in new sort order. Resetting playback index.")
                 self._sorted_playback_index = 0 # Start from beginning of new sort
         else:
             self._sorted_playback_index = 0 # Default to start if no track was playing
 
+    def update_sort_order_by_paths(self, sorted_paths: List[str]):
+        """
+        Same as update_sort_order, but takes track paths in display order.
+        Unlike row-level indices, paths stay valid across additions and removals.
+        """
+        indices = [self._track_index[p] for p in map(os.path.normpath, sorted_paths) if p in self._track_index]
+        self.update_sort_order(indices)
+
     def _regenerate_shuffle_indices(self, after_completion=False) -> None:
         """
         Regenerates the shuffled indices to ensure all tracks are played once 
@@ -428,6 +736,7 @@ class Playlist:
         if num_tracks == 0:
             self._shuffled_indices = []
             self._shuffle_index = -1
+            self._shuffle_positions = []
             return
             
         # Generate a list of all indices
@@ -460,9 +769,10 @@ class Playlist:
             
             self._shuffled_indices = indices
             
+        self._rebuild_shuffle_positions()
         # Reset shuffle index to beginning
         self._shuffle_index = 0
-        Logger.instance().debug("Playlist", f"Generated new shuffle order: {self._shuffled_indices}")
+        Logger.instance().debug("Playlist", f"Generated new shuffle order ({num_tracks} tracks)")
 
     def get_track_at(self, index: int) -> Optional[str]:
         """Returns the track path at the given index, or None if index is invalid."""
@@ -709,67 +1019,52 @@ class Playlist:
             bool: True if the track was found and index was set, False otherwise.
         """
         norm_path = os.path.normpath(filepath)
-        try:
-            # Find the index in the main track list by iterating through dicts
-            track_index = -1
-            for i, track_data in enumerate(self.tracks):
-                if track_data.get('path') == norm_path:
-                    track_index = i
-                    break
-            
-            if track_index == -1:
-                 raise ValueError # Path not found
-                 
-            self._current_index = track_index
-            Logger.instance().debug("Playlist", f"Selected track index {self._current_index} for path: {norm_path}")
-
-            # If in random mode, update the shuffle index
-            if self._current_repeat_mode == REPEAT_RANDOM:
-                if not self._shuffled_indices:
-                    # Regenerate if shuffle isn't active, ensure current track is first
-                    Logger.instance().debug("Playlist", "Regenerating shuffle indices for track selection.")
-                    self._regenerate_shuffle_indices() # This now handles putting _current_index first
-                    self._shuffle_index = 0 # We are at the start of the (new) shuffle sequence
-                else:
-                    # Find the position of the selected track_index in the shuffle list
-                    try:
-                        self._shuffle_index = self._shuffled_indices.index(track_index)
-                        Logger.instance().debug("Playlist", f"Set shuffle index to {self._shuffle_index}")
-                    except ValueError:
-                        # Should not happen if _regenerate_shuffle_indices is called correctly
-                        # when tracks are added/removed, but handle defensively.
-                        Logger.instance().warning("Playlist", f"Track index {track_index} not found in shuffle indices {self._shuffled_indices}. Regenerating.")
-                        self._regenerate_shuffle_indices()
-                        try:
-                           self._shuffle_index = self._shuffled_indices.index(track_index)
-                        except ValueError:
-                             Logger.instance().error("Playlist", f"Could not find track index {track_index} even after regenerating shuffle.")
-                             self._shuffle_index = 0 # Fallback
-            # If in sorted REPEAT_ALL mode, update the sorted playback index
-            elif self._current_repeat_mode == REPEAT_ALL and self._sorted_indices:
-                try:
-                    self._sorted_playback_index = self._sorted_indices.index(track_index)
-                    Logger.instance().debug("Playlist", f"Set sorted playback index to {self._sorted_playback_index}")
-                except ValueError:
-                    # Should not happen if update_sort_order called correctly
-                    Logger.instance().warning("Playlist", f"Track index {track_index} not found in sorted indices {self._sorted_indices}. Resetting.")
-                    self._sorted_playback_index = 0 # Fallback
-
-            return True
-        except ValueError:
+        track_index = self._track_index.get(norm_path)
+        if track_index is None:
             Logger.instance().error("Playlist", f"Track path not found in playlist: {norm_path}")
             self._current_index = -1 # Indicate no valid track selected
             return False
 
+        self._current_index = track_index
+        Logger.instance().debug("Playlist", f"Selected track index {self._current_index} for path: {norm_path}")
+
+        # If in random mode, update the shuffle index
+        if self._current_repeat_mode == REPEAT_RANDOM:
+            if not self._shuffled_indices:
+                # Regenerate if shuffle isn't active, ensure current track is first
+                Logger.instance().debug("Playlist", "Regenerating shuffle indices for track selection.")
+                self._regenerate_shuffle_indices() # This now handles putting _current_index first
+                self._shuffle_index = 0 # We are at the start of the (new) shuffle sequence
+            else:
+                position = self._shuffle_positions[track_index] if track_index < len(self._shuffle_positions) else -1
+                if position == -1:
+                    # Should not happen as add/remove keep the shuffle order in sync, but handle defensively
+                    Logger.instance().warning("Playlist", f"Track index {track_index} not found in shuffle order. Regenerating.")
+                    self._regenerate_shuffle_indices()
+                    position = 0
+                self._shuffle_index = position
+                Logger.instance().debug("Playlist", f"Set shuffle index to {self._shuffle_index}")
+        # If in sorted REPEAT_ALL mode, update the sorted playback index
+        elif self._current_repeat_mode == REPEAT_ALL and self._sorted_indices:
+            position = self._sorted_positions[track_index] if track_index < len(self._sorted_positions) else -1
+            if position == -1:
+                # Should not happen if update_sort_order called correctly
+                Logger.instance().warning("Playlist", f"Track index {track_index} not found in sorted order. Resetting.")
+                position = 0 # Fallback
+            self._sorted_playback_index = position
+            Logger.instance().debug("Playlist", f"Set sorted playback index to {self._sorted_playback_index}")
+
+        return True
+
     # --- Standard Dunder Methods ---
 
     def __len__(self) -> int:
         """Returns the number of tracks in the playlist."""
-        return len(self.tracks)
+        return self.track_count
 
     def __repr__(self) -> str:
         """Returns a string representation of the playlist."""
-        return f"Playlist(name='{self.name}', tracks={len(self.tracks)}, filepath='{self.filepath}')"
+        return f"Playlist(name='{self.name}', tracks={self.track_count}, filepath='{self.filepath}')"
 
     def __eq__(self, other: object) -> bool:
         """Checks equality based on filepath if available, otherwise name."""
@@ -787,6 +1082,71 @@ class Playlist:
         # Fallback hash (less reliable)
         return hash((self.name, tuple(self.tracks)))
 
+# --- Playlist Catalog ---
+
+@dataclass
+class PlaylistCatalogEntry:
+    """Header information for one playlist file, enough to list it without loading tracks."""
+    name: str
+    filepath: Path
+    track_count: int
+    mtime: float
+    size: int
+    journal_mtime: Optional[float] = None
+    journal_size: Optional[int] = None
+
+    def to_json(self) -> Dict[str, Any]:
+        return {"name": self.name, "track_count": self.track_count, "mtime": self.mtime, "size": self.size,
+                "journal_mtime": self.journal_mtime, "journal_size": self.journal_size}
+
+
+def read_playlist_header(filepath: Path) -> Optional[PlaylistCatalogEntry]:
+    """
+    Reads name and track count from a playlist file without validating each track
+    (no normpath/fromisoformat per entry, unlike Playlist._initialize_tracks); paths are
+    only normalized when a journal has to be replayed on top.
+    """
+    try:
+        stat = filepath.stat()
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except UnicodeDecodeError:
+            with open(filepath, 'r', encoding='latin-1') as f:
+                data = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        Logger.instance().error("PlaylistManager", f"Error reading playlist header from {filepath}: {e}")
+        return None
+
+    if not isinstance(data, dict):
+        return None
+    name = data.get("name")
+    tracks = data.get("tracks", [])
+    if not name or not isinstance(tracks, list):
+        Logger.instance().error("PlaylistManager", f"Error: Invalid playlist format in {filepath}")
+        return None
+    entry = PlaylistCatalogEntry(name=name, filepath=filepath, track_count=len(tracks),
+                                 mtime=stat.st_mtime, size=stat.st_size)
+
+    journal_path = journal_path_for(filepath)
+    try:
+        journal_stat = journal_path.stat()
+    except OSError:
+        return entry
+    # Pending journal entries change the count; replay them on the path set, normalized
+    # on both sides as in Playlist._initialize_tracks/_apply_journal
+    raw_paths = (t.get('path') if isinstance(t, dict) else t for t in tracks)
+    paths = {os.path.normpath(p) for p in raw_paths if isinstance(p, str)}
+    for op in read_journal(journal_path):
+        if op['op'] == 'add':
+            paths.add(os.path.normpath(op['path']))
+        else:
+            paths.discard(os.path.normpath(op['path']))
+    entry.track_count = len(paths)
+    entry.journal_mtime = journal_stat.st_mtime
+    entry.journal_size = journal_stat.st_size
+    return entry
+
 # --- Playlist Manager ---
 
 class PlaylistManager:
@@ -859,29 +1219,107 @@ class PlaylistManager:
         filename = f"{PlaylistManager._sanitize_filename(playlist_name)}.json"
         return playlist_dir / filename
 
+    def _read_catalog_cache(self) -> Dict[str, Dict[str, Any]]:
+        catalog_path = self.playlist_dir / CATALOG_FILENAME
+        try:
+            with open(catalog_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get("version") == CATALOG_VERSION and isinstance(data.get("entries"), dict):
+                return data["entries"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, AttributeError) as e:
+            Logger.instance().warning("PlaylistManager", f"Ignoring unreadable playlist catalog {catalog_path}: {e}")
+        return {}
+
+    def _write_catalog_cache(self, entries: List[PlaylistCatalogEntry]) -> None:
+        catalog_path = self.playlist_dir / CATALOG_FILENAME
+        tmp_path = catalog_path.with_suffix(".tmp")
+        data = {
+            "version": CATALOG_VERSION,
+            "entries": {entry.filepath.name: entry.to_json() for entry in entries},
+        }
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, catalog_path)
+        except OSError as e:
+            Logger.instance().warning("PlaylistManager", f"Could not write playlist catalog {catalog_path}: {e}")
+
+    def load_catalog(self) -> List[PlaylistCatalogEntry]:
+        """
+        Lists the playlists in the managed directory from their headers only.
+
+        Headers are cached in CATALOG_FILENAME and reused while a file's mtime and
+        size are unchanged, so an unchanged directory costs one stat per playlist.
+
+        Returns:
+            List[PlaylistCatalogEntry]: One entry per valid playlist file.
+        """
+        playlist_dir = self.playlist_dir
+        cached = self._read_catalog_cache()
+        entries: List[PlaylistCatalogEntry] = []
+        changed = False
+
+        try:
+            dir_entries = list(os.scandir(playlist_dir))
+        except OSError as e:
+            Logger.instance().error("PlaylistManager", f"Error listing playlist directory {playlist_dir}: {e}")
+            return []
+
+        journals = {}
+        for dir_entry in dir_entries:
+            if dir_entry.name.endswith(JOURNAL_SUFFIX):
+                try:
+                    journals[dir_entry.name] = dir_entry.stat()
+                except OSError:
+                    pass
+
+        for dir_entry in dir_entries:
+            filename = dir_entry.name
+            # Skip the AI prompt config, the catalog itself and non-playlist files
+            if (filename.lower() == 'aiprompts.json' or filename.startswith('.')
+                    or not filename.lower().endswith('.json') or not dir_entry.is_file()):
+                continue
+            try:
+                stat = dir_entry.stat()
+            except OSError:
+                continue
+
+            journal_stat = journals.get(str(Path(filename).with_suffix(JOURNAL_SUFFIX)))
+            journal_mtime = journal_stat.st_mtime if journal_stat else None
+            journal_size = journal_stat.st_size if journal_stat else None
+
+            hit = cached.get(filename)
+            if (hit and hit.get("mtime") == stat.st_mtime and hit.get("size") == stat.st_size
+                    and hit.get("journal_mtime") == journal_mtime and hit.get("journal_size") == journal_size):
+                entries.append(PlaylistCatalogEntry(
+                    name=hit["name"], filepath=playlist_dir / filename,
+                    track_count=hit.get("track_count", 0), mtime=stat.st_mtime, size=stat.st_size,
+                    journal_mtime=journal_mtime, journal_size=journal_size))
+                continue
+
+            changed = True
+            entry = read_playlist_header(playlist_dir / filename)
+            if entry is not None:
+                entries.append(entry)
+
+        if changed or len(entries) != len(cached):
+            self._write_catalog_cache(entries)
+        return entries
+
     def load_playlists(self) -> List[Playlist]:
         """
-        Loads all playlists (*.json) from the managed directory.
+        Lists all playlists (*.json) from the managed directory.
+
+        The returned Playlist objects are built from catalog headers and do not have
+        their tracks loaded yet; call Playlist.ensure_loaded() (ideally off the UI
+        thread) before using the track list.
 
         Returns:
-            List[Playlist]: A list of loaded Playlist objects.
-        """
-        playlists: List[Playlist] = []
-        for filename in os.listdir(self.playlist_dir):
-            # === Add check to skip aiprompts.json ===
-            if filename.lower() == 'aiprompts.json':
-                continue # Skip this specific file
-            # ==========================================
-            
-            # Construct the full path
-            filepath = self.playlist_dir / filename
-            playlist = Playlist.load_from_file(filepath)
-            # Check explicitly for None instead of using boolean evaluation
-            # This ensures empty playlists (0 tracks) are still considered valid
-            if playlist is not None:
-                playlists.append(playlist)
-        
-        return playlists
+            List[Playlist]: A list of (unloaded) Playlist objects.
+        """
+        return [Playlist.from_catalog_entry(entry) for entry in self.load_catalog()]
 
     def save_playlist(self, playlist: Playlist) -> bool:
         """
@@ -921,6 +1359,9 @@ class PlaylistManager:
                 Logger.instance().info("PlaylistManager", f"Deleted playlist file: {playlist.filepath}")
             else:
                  Logger.instance().warning("PlaylistManager", f"Playlist file not found for deletion: {playlist.filepath}")
+            journal_path = journal_path_for(playlist.filepath)
+            if journal_path.exists():
+                os.remove(journal_path)
             return True
         except OSError as e:
             Logger.instance().error("PlaylistManager", f"Error deleting playlist file {playlist.filepath}: {e}")
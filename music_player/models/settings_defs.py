@@ -26,6 +26,8 @@ YT_API_QSETTINGS_KEY = 'youtube/api_key'
 GROQ_API_QSETTINGS_KEY = 'ai/groq/api_key' 
 # Add key for max concurrent downloads
 YT_MAX_CONCURRENT_KEY = 'youtube_downloader/max_concurrent'
+# Post-download stages per format preset, e.g. {"audio_default": ["mp3", "oplayer"]}
+YT_POST_PROCESS_KEY = 'youtube_downloader/post_process'
 
 # --- NEW: Conversion Settings ---
 CONVERSION_MP3_BITRATE_KEY = 'conversion/mp3_bitrate_kbps'
@@ -51,6 +53,7 @@ DEFAULT_YT_API_KEY = ""
 DEFAULT_GROQ_API_KEY = "" 
 # Add default for max concurrent downloads
 DEFAULT_YT_MAX_CONCURRENT = 3
+DEFAULT_YT_POST_PROCESS = {}
 
 # --- NEW: Conversion Defaults ---
 DEFAULT_CONVERSION_MP3_BITRATE = 128 # Stored as integer (e.g., 128 for 128kbps)
@@ -81,6 +84,7 @@ MUSIC_PLAYER_DEFAULTS = {
     GROQ_API_QSETTINGS_KEY: (DEFAULT_GROQ_API_KEY, SettingType.STRING),
     # Add max concurrent downloads to defaults
     YT_MAX_CONCURRENT_KEY: (DEFAULT_YT_MAX_CONCURRENT, SettingType.INT),
+    YT_POST_PROCESS_KEY: (DEFAULT_YT_POST_PROCESS, SettingType.DICT),
     # --- NEW: Conversion Settings Default ---
     CONVERSION_MP3_BITRATE_KEY: (DEFAULT_CONVERSION_MP3_BITRATE, SettingType.INT),
 } 
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+Shared cache of file stats (size, mtime) for track tables.
+
+Table columns such as Size and Modified used to call Path.stat() from their
+data/sort accessors, so sorting a large playlist issued O(n log n) stat calls
+(often against network drives). Instead, a view looks up cached values when it
+builds its rows and asks TrackStatRefresher to re-stat the paths on a background
+pool. Every stat taken is reported back and the view keeps the values that differ
+from its rows: the shared cache may have been updated by another view's refresh
+after these rows were built, so comparing against the cache would miss them.
+"""
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable, QThreadPool
+
+from qt_base_app.models.logger import Logger
+
+# (size in bytes, modification timestamp); (None, None) for missing files
+StatTuple = Tuple[Optional[int], Optional[float]]
+
+STAT_BATCH_SIZE = 500
+MAX_STAT_THREADS = 4
+
+
+class TrackStatCache:
+    """Process-wide path -> (size, mtime) cache. Thread-safe."""
+    _instance = None
+
+    @classmethod
+    def instance(cls) -> 'TrackStatCache':
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, StatTuple] = {}
+
+    def get(self, path: str) -> Optional[StatTuple]:
+        with self._lock:
+            return self._stats.get(path)
+
+    def get_many(self, paths: Iterable[str]) -> Dict[str, StatTuple]:
+        with self._lock:
+            return {p: self._stats[p] for p in paths if p in self._stats}
+
+    def refresh(self, paths: Iterable[str]) -> Dict[str, StatTuple]:
+        """Stats the given paths, stores the results and returns all of them."""
+        stats: Dict[str, StatTuple] = {}
+        for path in paths:
+            try:
+                st = os.stat(path)
+                value: StatTuple = (st.st_size, st.st_mtime)
+            except OSError:
+                value = (None, None)
+            stats[path] = value
+        with self._lock:
+            self._stats.update(stats)
+        return stats
+
+    def prime(self, path: str, size: Optional[int], mtime: Optional[float]) -> None:
+        """Stores stats obtained elsewhere (e.g. from a directory scan) without touching the disk."""
+        with self._lock:
+            self._stats[path] = (size, mtime)
+
+    def invalidate(self, path: str) -> None:
+        with self._lock:
+            self._stats.pop(path, None)
+
+
+class StatRefreshSignals(QObject):
+    stats_ready = pyqtSignal(int, dict)  # generation, {path: (size, mtime)} for every path in the batch
+
+
+class StatRefreshWorker(QRunnable):
+    def __init__(self, generation: int, paths: List[str], signals: StatRefreshSignals):
+        super().__init__()
+        self.generation = generation
+        self.paths = paths
+        self.signals = signals
+
+    def run(self):
+        try:
+            stats = TrackStatCache.instance().refresh(self.paths)
+        except Exception as e:
+            Logger.instance().error(caller="StatRefreshWorker", msg=f"Error refreshing file stats: {e}")
+            return
+        if stats:
+            self.signals.stats_ready.emit(self.generation, stats)
+
+
+class TrackStatRefresher(QObject):
+    """
+    Re-stats a set of paths on a bounded pool, in batches.
+    Results from an older refresh() call (a previous playlist) are dropped.
+    """
+    stats_ready = pyqtSignal(dict)  # {path: (size, mtime)} for every refreshed path
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(MAX_STAT_THREADS)
+        self._generation = 0
+        self._signals = StatRefreshSignals()
+        self._signals.stats_ready.connect(self._on_stats_ready)
+
+    def refresh(self, paths: List[str]) -> None:
+        """Drops pending work from earlier calls and re-stats `paths`."""
+        self.cancel()
+        self.add(paths)
+
+    def add(self, paths: List[str]) -> None:
+        """Queues more paths for the current refresh."""
+        for start in range(0, len(paths), STAT_BATCH_SIZE):
+            self._pool.start(StatRefreshWorker(self._generation, paths[start:start + STAT_BATCH_SIZE], self._signals))
+
+    def cancel(self) -> None:
+        self._generation += 1
+        self._pool.clear()
+
+    def _on_stats_ready(self, generation: int, stats: dict):
+        if generation == self._generation:
+            self.stats_ready.emit(stats)
@@ -4,11 +4,81 @@ import json
 import logging
 import threading
 import tempfile
+from collections import OrderedDict
 from pathlib import Path
 from typing import List, Optional, Tuple, Dict
-from PyQt6.QtCore import QObject, pyqtSignal, QRunnable, QThreadPool, QSize, QRect, QStandardPaths
+from PyQt6.QtCore import QObject, pyqtSignal, QRunnable, QThreadPool, QSize, QRect, QStandardPaths, Qt, QTimer, QBuffer, QIODevice
+from PyQt6.QtGui import QImage
 
 from music_player.models.vid_proc_model import VidProcItem
+from music_player.models.vid_scan_cache import VidScanCacheManager
+
+# Encodes run side by side; each gets cores // parallel ffmpeg threads so the total
+# roughly matches the CPU. x264 scales sub-linearly with threads, so a few parallel
+# encodes with fewer threads each finish a batch sooner than one wide encode at a time.
+MAX_PARALLEL_ENCODES = 4
+MIN_THREADS_PER_ENCODE = 2
+# Thumbnail ffmpeg processes running at once across all files
+MAX_PREVIEW_JOBS = 2
+# Preview frames are decoded at most this tall: a full-height 9:16 crop then is 360x640,
+# exactly the thumbnail size, so nothing is lost by not decoding at full resolution
+PREVIEW_FRAME_MAX_HEIGHT = 640
+PREVIEW_THUMB_WIDTH = 360
+FRAMES_PER_FILE = 3
+FRAME_CACHE_MAX_FRAMES = 32
+# Scan cache writes are batched into one transaction after this quiet period
+SCAN_CACHE_FLUSH_MS = 2000
+# Cache hits are handed to the GUI thread this many at a time
+SCAN_CACHE_EMIT_BATCH = 24
+
+def preview_frame_size(source: QSize) -> Tuple[int, int]:
+    """(width, height) preview frames of a source are decoded at (even, aspect kept)."""
+    w, h = max(2, source.width()), max(2, source.height())
+    target_h = min(h, PREVIEW_FRAME_MAX_HEIGHT)
+    target_w = max(2, int(round(w * target_h / h / 2)) * 2)
+    return target_w, max(2, target_h - target_h % 2)
+
+def default_preview_ts(duration: float) -> float:
+    """Timestamp the preview of a newly scanned clip is taken from."""
+    return min(5.0, duration * 0.2)
+
+class FrameCache:
+    """LRU of decoded preview frames keyed by (path, timestamp), bounded per file and overall."""
+    def __init__(self, per_file: int = FRAMES_PER_FILE, max_frames: int = FRAME_CACHE_MAX_FRAMES):
+        self.per_file = per_file
+        self.max_frames = max_frames
+        self._frames: "OrderedDict[Tuple[Path, float], QImage]" = OrderedDict()
+
+    @staticmethod
+    def _key(file_path: Path, ts: float) -> Tuple[Path, float]:
+        return (file_path, round(float(ts), 3))
+
+    def get(self, file_path: Path, ts: float) -> Optional[QImage]:
+        key = self._key(file_path, ts)
+        frame = self._frames.get(key)
+        if frame is not None:
+            self._frames.move_to_end(key)
+        return frame
+
+    def put(self, file_path: Path, ts: float, frame: QImage):
+        key = self._key(file_path, ts)
+        self._frames[key] = frame
+        self._frames.move_to_end(key)
+        same_file = [k for k in self._frames if k[0] == file_path]
+        for k in same_file[:-self.per_file]: # Oldest first
+            del self._frames[k]
+        while len(self._frames) > self.max_frames:
+            self._frames.popitem(last=False)
+
+    def discard(self, file_path: Path):
+        for k in [k for k in self._frames if k[0] == file_path]:
+            del self._frames[k]
+
+def encode_thread_budget(job_count: int, cpu_count: Optional[int] = None) -> Tuple[int, int]:
+    """Returns (parallel encodes, ffmpeg -threads per encode) for a batch of job_count encodes."""
+    cores = cpu_count or os.cpu_count() or 4
+    parallel = max(1, min(MAX_PARALLEL_ENCODES, cores // MIN_THREADS_PER_ENCODE, job_count))
+    return parallel, max(1, cores // parallel)
 
 class WorkerSignals(QObject):
     finished = pyqtSignal()
@@ -63,13 +133,93 @@ class ProbeWorker(QRunnable):
         except Exception as e:
             self.signals.error.emit(str(e))
 
+class ScanCacheSignals(QObject):
+    cached = pyqtSignal(int, list) # scan id, [(path, entry, decoded preview frame or None)]
+    done = pyqtSignal(int, list) # scan id, paths that still need probing
+
+class ScanCacheWorker(QRunnable):
+    """Looks up a scan's files in the cache, prunes stale rows and decodes cached preview frames."""
+    def __init__(self, cache: VidScanCacheManager, scan_id: int, folder: Path,
+                 stats: Dict[Path, Tuple[int, float]], prune_expired: bool):
+        super().__init__()
+        self.cache = cache
+        self.scan_id = scan_id
+        self.folder = folder
+        self.stats = stats
+        self.prune_expired = prune_expired
+        self.signals = ScanCacheSignals()
+
+    def run(self):
+        emitted = set()
+        try:
+            str_stats = {str(p): v for p, v in self.stats.items()}
+            if self.prune_expired:
+                self.cache.prune_expired()
+            self.cache.prune_folder(str(self.folder), str_stats)
+            entries = self.cache.get_many(str_stats)
+            self.cache.touch_many(entries)
+
+            batch = []
+            for f in self.stats:
+                entry = entries.get(str(f))
+                if entry is None:
+                    continue
+                frame = QImage.fromData(entry['frame_in']) if entry.get('frame_in') else None
+                batch.append((f, entry, frame if frame is not None and not frame.isNull() else None))
+                if len(batch) >= SCAN_CACHE_EMIT_BATCH:
+                    self.signals.cached.emit(self.scan_id, batch)
+                    emitted.update(item[0] for item in batch)
+                    batch = []
+            if batch:
+                self.signals.cached.emit(self.scan_id, batch)
+                emitted.update(item[0] for item in batch)
+        except Exception as e:
+            logging.getLogger(__name__).error(f"Scan cache lookup failed: {e}")
+        finally:
+            # Everything not served from the cache (all of it if the lookup failed) gets probed
+            self.signals.done.emit(self.scan_id, [f for f in self.stats if f not in emitted])
+
+class FrameDecodeWorker(QRunnable):
+    """
+    Decodes one frame as raw RGB24 over stdout straight into a QImage (no temp files).
+    Reports {'path', 'ts', 'frame' (QImage or None)} via signals.result.
+    """
+    def __init__(self, file_path: Path, ts: float, size: Tuple[int, int], signals: WorkerSignals):
+        super().__init__()
+        self.file_path = file_path
+        self.ts = ts
+        self.size = size
+        self.signals = signals
+
+    def run(self):
+        w, h = self.size
+        frame = None
+        try:
+            cmd = [
+                "ffmpeg", "-v", "error", "-ss", str(self.ts),
+                "-i", str(self.file_path),
+                "-frames:v", "1",
+                "-vf", f"scale={w}:{h}",
+                "-f", "rawvideo", "-pix_fmt", "rgb24", "pipe:1"
+            ]
+            result = subprocess.run(cmd, capture_output=True, check=True)
+            data = result.stdout
+            if len(data) < w * h * 3:
+                raise ValueError(f"short frame ({len(data)} of {w * h * 3} bytes)")
+            # copy() so the image owns its pixels once `data` goes away
+            frame = QImage(data, w, h, 3 * w, QImage.Format.Format_RGB888).copy()
+        except Exception as e:
+            self.signals.error.emit(f"Frame decode failed for {self.file_path.name}: {e}")
+        self.signals.result.emit({'path': self.file_path, 'ts': self.ts, 'frame': frame})
+
 class EncodeWorker(QRunnable):
-    def __init__(self, item: VidProcItem, out_dir: Path, signals: WorkerSignals, target_height: int = 1920):
+    def __init__(self, item: VidProcItem, out_dir: Path, signals: WorkerSignals, target_height: int = 1920, threads: int = 0):
         super().__init__()
         self.item = item
         self.out_dir = out_dir
         self.signals = signals
         self.target_height = target_height
+        self.threads = threads # ffmpeg -threads; 0 lets ffmpeg decide
         self._is_cancelled = False
         self.process = None # Keep reference to process
 
@@ -123,7 +273,9 @@ class EncodeWorker(QRunnable):
             
             # Duration/End args (after input)
             duration_args = []
+            expected_duration = max(0.0, float(self.item.get('duration') or 0) - start_sec)
             if clip_end is not None:
+                expected_duration = max(0.0, clip_end - start_sec)
                 if clip_start is not None and clip_start > 0:
                      # Calculate duration
                      duration = clip_end - clip_start
@@ -140,6 +292,8 @@ class EncodeWorker(QRunnable):
                 "-r", "30",
                 "-c:v", "libx264", "-preset", "veryfast", "-crf", "20",
                 "-c:a", "aac", "-b:a", "128k", "-ar", "48000", "-ac", "2"] + duration_args + [
+                "-threads", str(self.threads),
+                "-progress", "pipe:1", "-nostats",
                 str(out_path)
             ]
             
@@ -150,7 +304,14 @@ class EncodeWorker(QRunnable):
                 universal_newlines=True
             )
             
-            stdout, stderr = self.process.communicate()
+            # Drain stderr on the side so a chatty ffmpeg can't block on a full pipe
+            stderr_lines: List[str] = []
+            stderr_thread = threading.Thread(target=lambda: stderr_lines.extend(self.process.stderr), daemon=True)
+            stderr_thread.start()
+            self._read_progress(expected_duration)
+            self.process.wait()
+            stderr_thread.join(timeout=5)
+            stderr = "".join(stderr_lines)
             
             if self._is_cancelled:
                 return # Don't emit result if cancelled
@@ -169,6 +330,25 @@ class EncodeWorker(QRunnable):
             if not self._is_cancelled:
                 self.signals.error.emit(str(e))
 
+    def _read_progress(self, expected_duration: float):
+        """Forwards ffmpeg's -progress key=value stream as 0..1 fractions of the output duration."""
+        file_key = str(self.item['path'])
+        last = -1.0
+        for line in self.process.stdout:
+            key, _, value = line.strip().partition('=')
+            if key == 'out_time_us' or key == 'out_time_ms': # Both are microseconds
+                if expected_duration <= 0:
+                    continue
+                try:
+                    fraction = min(1.0, max(0.0, int(value) / 1_000_000 / expected_duration))
+                except ValueError:
+                    continue
+                if fraction - last >= 0.005: # Don't flood the GUI thread
+                    last = fraction
+                    self.signals.progress.emit(file_key, fraction)
+            elif key == 'progress' and value == 'end':
+                self.signals.progress.emit(file_key, 1.0)
+
 class MergeWorker(QRunnable):
     def __init__(self, files: List[Path], out_path: Path, signals: WorkerSignals):
         super().__init__()
@@ -246,7 +426,7 @@ class VidProcManager(QObject):
     scan_started = pyqtSignal(int)
     scan_progress = pyqtSignal(int, int)
     scan_finished = pyqtSignal()
-    preview_ready = pyqtSignal(Path, str, int)
+    preview_ready = pyqtSignal(Path, str, int, object) # path, 'in'/'out', version, QImage
     process_progress = pyqtSignal(str, float)
     process_finished = pyqtSignal(str, bool, str)
     merge_finished = pyqtSignal(bool, str)
@@ -255,13 +435,38 @@ class VidProcManager(QObject):
         super().__init__(parent)
         self.thread_pool = QThreadPool()
         self.process_pool = QThreadPool()
-        self.process_pool.setMaxThreadCount(1)
+        self.process_pool.setMaxThreadCount(1) # Sized per batch by process_items
         self.logger = logging.getLogger(__name__)
         
         self._scan_total = 0
         self._scan_current = 0
         self._preview_versions: Dict[Path, int] = {}
+        # Preview scheduling: at most one decode in flight per file; only the latest request
+        # per file is kept and rendered once its frame is available
+        self.preview_pool = QThreadPool()
+        self.preview_pool.setMaxThreadCount(MAX_PREVIEW_JOBS)
+        self._preview_inflight = set() # Paths with a running decode
+        self._preview_requests: Dict[Path, dict] = {} # path -> latest {'ts', 'size', 'crop', 'version'}
+        self._source_sizes: Dict[Path, QSize] = {}
+        self.frame_cache = FrameCache()
+        
+        # Persistent probe/preview frame cache for folder scans
+        self._scan_cache: Optional[VidScanCacheManager] = None
+        self._scan_stats: Dict[Path, Tuple[int, float]] = {} # (size, mtime) of scanned files
+        self._default_preview_ts: Dict[Path, float] = {} # Timestamp whose frame is persisted
+        self._cached_frame_ts: Dict[Path, float] = {}
+        self._scan_id = 0 # Results of lookups for an older scan are dropped
+        self._scan_cache_workers: Dict[int, ScanCacheWorker] = {}
+        self._expired_pruned = False
+        self._pending_probe_writes: Dict[Path, dict] = {}
+        self._pending_frame_writes: Dict[Path, Tuple[float, bytes]] = {}
+        self._cache_flush_timer = QTimer(self)
+        self._cache_flush_timer.setSingleShot(True)
+        self._cache_flush_timer.setInterval(SCAN_CACHE_FLUSH_MS)
+        self._cache_flush_timer.timeout.connect(self._flush_scan_cache)
         self._active_workers = [] # Track active workers for cancellation
+        self._pending_encodes = set() # Paths (str) of encodes not finished yet
+        self._deferred_merge: Optional[Tuple[List[Path], Path]] = None
         
         # IMPORTANT: do NOT base temp paths on os.getcwd(). When the app is launched
         # via a Windows protocol handler (e.g. from Chrome), the working directory
@@ -273,15 +478,22 @@ class VidProcManager(QObject):
         self.temp_dir.mkdir(parents=True, exist_ok=True)
 
     def scan_folder(self, folder_path: Path):
-        """Scan folder for videos and start probing."""
+        """Scan folder for videos; files unchanged since a previous scan come from the cache, the rest are probed."""
         extensions = {'.mp4', '.mov', '.mkv', '.webm'}
-        files_to_probe = []
+        files_to_scan = []
         try:
-            for f in folder_path.iterdir():
-                if f.is_file() and f.suffix.lower() in extensions:
-                    files_to_probe.append(f)
+            stats: Dict[Path, Tuple[int, float]] = {}
+            with os.scandir(folder_path) as entries:
+                for entry in entries:
+                    if entry.is_file() and os.path.splitext(entry.name)[1].lower() in extensions:
+                        f = Path(entry.path)
+                        st = entry.stat()
+                        stats[f] = (st.st_size, st.st_mtime)
+                        files_to_scan.append(f)
+            self._scan_stats.update(stats)
             
-            self._scan_total = len(files_to_probe)
+            self._scan_id += 1
+            self._scan_total = len(files_to_scan)
             self._scan_current = 0
             self.scan_started.emit(self._scan_total)
             
@@ -289,13 +501,86 @@ class VidProcManager(QObject):
                 self.scan_finished.emit()
                 return
 
-            for f in files_to_probe:
-                self._probe_file(f)
+            cache = self.scan_cache
+            if cache is None:
+                for f in files_to_scan:
+                    self._probe_file(f)
+                return
+
+            # Cache lookup and frame decoding run on the pool; hits arrive in batches
+            worker = ScanCacheWorker(cache, self._scan_id, folder_path, stats, not self._expired_pruned)
+            self._expired_pruned = True
+            worker.signals.cached.connect(self._on_cached_probes)
+            worker.signals.done.connect(self._on_cache_lookup_done)
+            self._scan_cache_workers[self._scan_id] = worker
+            self.thread_pool.start(worker)
                 
         except Exception as e:
             self.logger.error(f"Error scanning folder: {e}")
             self.scan_finished.emit()
 
+    @property
+    def scan_cache(self) -> Optional[VidScanCacheManager]:
+        if self._scan_cache is None:
+            try:
+                self._scan_cache = VidScanCacheManager.instance()
+            except Exception as e:
+                self.logger.error(f"Video scan cache unavailable: {e}")
+        return self._scan_cache
+
+    def _on_cached_probes(self, scan_id: int, items: list):
+        if scan_id != self._scan_id:
+            return
+        for file_path, entry, frame in items:
+            self._emit_cached_probe(file_path, entry, frame)
+
+    def _on_cache_lookup_done(self, scan_id: int, uncached: list):
+        self._scan_cache_workers.pop(scan_id, None)
+        if scan_id != self._scan_id:
+            return
+        self.logger.info(f"Scan: {self._scan_total - len(uncached)} of {self._scan_total} files from cache")
+        for f in uncached:
+            self._probe_file(f)
+
+    def _emit_cached_probe(self, file_path: Path, entry: dict, frame: Optional[QImage]):
+        size = QSize(int(entry['width']), int(entry['height']))
+        info = {
+            'path': file_path,
+            'size': size,
+            'fps': entry['fps'],
+            'duration': entry['duration'],
+            'codec_v': entry['codec_v'] or 'unknown',
+        }
+        self._source_sizes[file_path] = size
+        self._default_preview_ts[file_path] = default_preview_ts(info['duration'])
+        if frame is not None:
+            # Seeded before item_probed, so the preview requested for the new row renders
+            # both thumbnails from it without running ffmpeg
+            self.frame_cache.put(file_path, entry['frame_ts'], frame)
+            self._cached_frame_ts[file_path] = entry['frame_ts']
+            self.item_probed.emit(info)
+        else:
+            self.item_probed.emit(info)
+            self.generate_thumb_in(file_path, self._default_preview_ts[file_path])
+        self._on_probe_finished()
+
+    def _queue_cache_write(self):
+        if not self._cache_flush_timer.isActive():
+            self._cache_flush_timer.start()
+
+    def _flush_scan_cache(self):
+        """Writes buffered probe results and preview frames in one transaction."""
+        cache = self.scan_cache
+        probes = [
+            (str(p), *self._scan_stats[p], info)
+            for p, info in self._pending_probe_writes.items() if p in self._scan_stats
+        ]
+        frames = [(str(p), ts, data) for p, (ts, data) in self._pending_frame_writes.items()]
+        self._pending_probe_writes.clear()
+        self._pending_frame_writes.clear()
+        if cache is not None and (probes or frames):
+            cache.save_many(probes, frames)
+
     def _probe_file(self, file_path: Path):
         signals = WorkerSignals()
         signals.result.connect(self._on_probe_result)
@@ -312,57 +597,114 @@ class VidProcManager(QObject):
             self.scan_finished.emit()
 
     def _on_probe_result(self, info):
+        # Probed because the file is new or changed since the last scan: frames decoded from an older version are stale
+        self.frame_cache.discard(info['path'])
+        self._source_sizes[info['path']] = info['size']
+        self._default_preview_ts[info['path']] = default_preview_ts(info['duration'])
+        if info['path'] in self._scan_stats:
+            self._pending_probe_writes[info['path']] = {
+                'width': info['size'].width(), 'height': info['size'].height(),
+                'fps': info['fps'], 'duration': info['duration'], 'codec_v': info['codec_v'],
+            }
+            self._cached_frame_ts.pop(info['path'], None)
+            self._queue_cache_write()
         self.item_probed.emit(info)
-        self.generate_thumb_in(info['path'], min(5.0, info['duration'] * 0.2))
+        self.generate_thumb_in(info['path'], self._default_preview_ts[info['path']])
 
     def generate_thumb_in(self, file_path: Path, timestamp: float):
-        out_path = self.temp_dir / f"{file_path.stem}_in.jpg"
-        cmd = [
-            "ffmpeg", "-y", "-ss", str(timestamp), 
-            "-i", str(file_path), 
-            "-frames:v", "1", 
-            "-vf", "scale=360:-2", 
-            str(out_path)
-        ]
-        t = threading.Thread(target=self._run_ffmpeg_thumb, args=(cmd, file_path, 'in', 0))
-        t.start()
+        """Requests just the input thumbnail, unless a full preview is already requested for the file."""
+        size = self._source_sizes.get(file_path)
+        if size is None or file_path in self._preview_requests:
+            return
+        self._request_preview(file_path, {'ts': float(timestamp), 'size': size, 'crop': None, 'version': 0})
 
     def generate_preview(self, item: VidProcItem):
+        """
+        Renders the input and cropped thumbnails. The source frame is decoded once per
+        timestamp and cached, so crop changes are re-rendered by QImage cropping alone.
+        """
         if not item: return
         file_path = item['path']
-        crop_rect = item['crop_rect']
-        out_path = self.temp_dir / f"{file_path.stem}_out.jpg"
         
         if item.get('preview_time') is not None:
              ts = float(item['preview_time'])
         else:
-             ts = min(5.0, item['duration'] * 0.2)
-        
-        self.generate_thumb_in(file_path, ts)
-
-        crop_filter = f"crop={crop_rect.width()}:{crop_rect.height()}:{crop_rect.x()}:{crop_rect.y()}"
-        vf = f"{crop_filter},scale=360:-2"
-        
-        cmd = [
-            "ffmpeg", "-y", "-ss", str(ts),
-            "-i", str(file_path),
-            "-frames:v", "1",
-            "-vf", vf,
-            str(out_path)
-        ]
+             ts = default_preview_ts(item['duration'])
 
         current_version = self._preview_versions.get(file_path, 0) + 1
         self._preview_versions[file_path] = current_version
+        self._source_sizes[file_path] = item['size_in']
         
-        t = threading.Thread(target=self._run_ffmpeg_thumb, args=(cmd, file_path, 'out', current_version))
-        t.start()
-    
-    def _run_ffmpeg_thumb(self, cmd, file_path, type_, version):
-        try:
-            subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-            self.preview_ready.emit(file_path, type_, version)
-        except Exception as e:
-            self.logger.error(f"Thumb gen failed: {e}")
+        self._request_preview(file_path, {
+            'ts': ts, 'size': item['size_in'], 'crop': QRect(item['crop_rect']) if item.get('crop_rect') is not None else None,
+            'version': current_version
+        })
+
+    def _request_preview(self, file_path: Path, request: dict):
+        self._preview_requests[file_path] = request
+        frame = self.frame_cache.get(file_path, request['ts'])
+        if frame is not None:
+            self._render_preview(file_path, frame)
+        elif file_path not in self._preview_inflight:
+            self._start_frame_decode(file_path, request)
+        # Otherwise the running decode picks up the latest request when it finishes
+
+    def _start_frame_decode(self, file_path: Path, request: dict):
+        self._preview_inflight.add(file_path)
+        signals = WorkerSignals()
+        signals.result.connect(self._on_frame_decoded)
+        signals.error.connect(self.logger.error)
+        size = preview_frame_size(request['size'])
+        self.preview_pool.start(FrameDecodeWorker(file_path, request['ts'], size, signals))
+
+    def _on_frame_decoded(self, result: dict):
+        file_path = result['path']
+        self._preview_inflight.discard(file_path)
+        if result['frame'] is not None:
+            self.frame_cache.put(file_path, result['ts'], result['frame'])
+            self._cache_frame(file_path, result['ts'], result['frame'])
+        request = self._preview_requests.get(file_path)
+        if request is None:
+            return
+        frame = self.frame_cache.get(file_path, request['ts'])
+        if frame is not None:
+            self._render_preview(file_path, frame)
+        elif round(request['ts'], 3) != round(result['ts'], 3):
+            self._start_frame_decode(file_path, request) # Timestamp changed while decoding
+        else:
+            self._preview_requests.pop(file_path, None) # Decode failed; don't retry in a loop
+
+    def _render_preview(self, file_path: Path, frame: QImage):
+        """Emits the thumbnails for the file's latest request from a decoded source frame."""
+        request = self._preview_requests.pop(file_path)
+        thumb_in = frame.scaledToWidth(PREVIEW_THUMB_WIDTH, Qt.TransformationMode.SmoothTransformation)
+        self.preview_ready.emit(file_path, 'in', request['version'], thumb_in)
+        crop = request['crop']
+        if crop is None:
+            return
+        source = request['size']
+        scale = frame.height() / max(1, source.height())
+        rect = QRect(
+            int(crop.x() * scale), int(crop.y() * scale),
+            max(1, int(crop.width() * scale)), max(1, int(crop.height() * scale))
+        ).intersected(frame.rect())
+        if rect.isEmpty():
+            return
+        thumb_out = frame.copy(rect).scaledToWidth(PREVIEW_THUMB_WIDTH, Qt.TransformationMode.SmoothTransformation)
+        self.preview_ready.emit(file_path, 'out', request['version'], thumb_out)
+
+    def _cache_frame(self, file_path: Path, ts: float, frame: QImage):
+        """Persists the decoded frame at the clip's default preview time; a rescan seeds frame_cache with it."""
+        default_ts = self._default_preview_ts.get(file_path)
+        if (file_path not in self._scan_stats or default_ts is None
+                or round(ts, 3) != round(default_ts, 3) or self._cached_frame_ts.get(file_path) == ts):
+            return
+        buffer = QBuffer()
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        if frame.save(buffer, "JPG", 90):
+            self._cached_frame_ts[file_path] = ts
+            self._pending_frame_writes[file_path] = (ts, bytes(buffer.data()))
+            self._queue_cache_write()
 
     def get_preview_version(self, file_path: Path) -> int:
         return self._preview_versions.get(file_path, 0)
@@ -373,35 +715,54 @@ class VidProcManager(QObject):
         for worker in self._active_workers:
             worker.cancel()
         self._active_workers.clear()
+        self._pending_encodes.clear()
+        self._deferred_merge = None
 
     def process_items(self, items: List[VidProcItem], out_dir: Path, target_height: int = 1920):
-        """Start batch processing."""
+        """Start batch processing: up to K encodes at once, with the CPU threads split between them."""
         self._active_workers.clear() # Should be empty but safety first
         
-        for item in items:
-            if item['included'] and item['status'] != 'ok':
-                signals = WorkerSignals()
-                signals.result.connect(self._on_process_result)
-                signals.error.connect(lambda err, p=item['path']: self.process_finished.emit(str(p), False, err))
-                
-                worker = EncodeWorker(item, out_dir, signals, target_height=target_height)
-                
-                # Manage active workers list
-                self._active_workers.append(worker)
-                # We need to remove from list when finished to avoid leaks or double cancel
-                # But signals.finished can be called on separate thread.
-                # For simplicity in this architecture, we just clear list on cancel or start.
-                # Since process_pool is sequential (1 thread), we know they run one by one.
-                # But wait, if we have multiple items, they are all queued.
-                # If we want to cancel *all*, we need the list.
-                
-                self.process_pool.start(worker)
+        jobs = [item for item in items if item['included'] and item['status'] != 'ok']
+        parallel, threads = encode_thread_budget(len(jobs))
+        self.process_pool.setMaxThreadCount(parallel)
+        self.logger.info(f"Encoding {len(jobs)} videos, {parallel} at a time with {threads} threads each")
+        
+        for item in jobs:
+            signals = WorkerSignals()
+            signals.result.connect(self._on_process_result)
+            signals.error.connect(lambda err, p=item['path']: self._on_process_error(str(p), err))
+            signals.progress.connect(self.process_progress.emit)
+            
+            worker = EncodeWorker(item, out_dir, signals, target_height=target_height, threads=threads)
+            
+            # Kept until the next batch/cancel so cancel_all_processing can reach running encodes
+            self._active_workers.append(worker)
+            self._pending_encodes.add(str(item['path']))
+            self.process_pool.start(worker)
 
     def _on_process_result(self, result):
+        self._encode_done(str(result['path']))
         self.process_finished.emit(str(result['path']), True, str(result['out_path']))
 
+    def _on_process_error(self, path_str: str, error: str):
+        self._encode_done(path_str)
+        self.process_finished.emit(path_str, False, error)
+
+    def _encode_done(self, path_str: str):
+        self._pending_encodes.discard(path_str)
+        if not self._pending_encodes and self._deferred_merge is not None:
+            output_files, out_path = self._deferred_merge
+            self._deferred_merge = None
+            self._start_merge_worker(output_files, out_path)
+
     def merge_videos(self, output_files: List[Path], out_path: Path):
-        """Merge multiple processed videos into one."""
+        """Merge multiple processed videos into one. Waits for any encodes still running."""
+        if self._pending_encodes:
+            self._deferred_merge = (list(output_files), out_path)
+            return
+        self._start_merge_worker(output_files, out_path)
+
+    def _start_merge_worker(self, output_files: List[Path], out_path: Path):
         signals = WorkerSignals()
         signals.result.connect(lambda res: self.merge_finished.emit(True, str(res['out_path'])))
         signals.error.connect(lambda err: self.merge_finished.emit(False, err))
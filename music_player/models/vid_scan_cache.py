@@ -0,0 +1,158 @@
+"""
+Persistent scan cache for the video processing page.
+
+Stores ffprobe results and the downscaled preview frame of each scanned clip,
+keyed by path and validated by (size, mtime), so rescanning a folder only runs
+ffprobe/ffmpeg for files that are new or changed since the last scan. Rows of files that were deleted or
+changed, and rows not seen by any scan for SCAN_CACHE_MAX_AGE_DAYS, are pruned.
+"""
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+from music_player.models.database import BaseDatabaseManager, DatabaseUtils
+
+# SQLite's default limit on bound parameters is 999
+_QUERY_CHUNK = 500
+
+# Rows whose file has not been scanned for this long are dropped
+SCAN_CACHE_MAX_AGE_DAYS = 60
+
+
+class VidScanCacheManager(BaseDatabaseManager):
+    """Singleton (path, size, mtime) -> probe info + preview frame bytes store."""
+
+    def _get_database_path(self) -> str:
+        # Preview frames are blobs; keep them out of the shared playback database
+        return str(Path(super()._get_database_path()).with_name("vidproc_cache.db"))
+
+    def _init_database(self):
+        """Create the cache table if it doesn't exist."""
+        table_creation_query = """
+            CREATE TABLE IF NOT EXISTS vidproc_scan_cache (
+                file_path TEXT PRIMARY KEY,
+                file_size INTEGER NOT NULL,
+                mtime REAL NOT NULL,
+                width INTEGER NOT NULL,
+                height INTEGER NOT NULL,
+                fps REAL NOT NULL,
+                duration REAL NOT NULL,
+                codec_v TEXT,
+                frame_ts REAL,
+                frame_in BLOB,
+                last_updated TEXT NOT NULL
+            )
+        """
+        result = self._execute_with_retry(table_creation_query)
+        if result is None:
+            raise RuntimeError("Video scan cache initialization failed")
+        # Caches created before preview frames were stored held 360px thumbnails instead
+        self._add_column_if_missing("vidproc_scan_cache", "frame_ts", "REAL")
+        self._add_column_if_missing("vidproc_scan_cache", "frame_in", "BLOB")
+
+    def get_many(self, stats: Dict[str, Tuple[int, float]]) -> Dict[str, dict]:
+        """
+        Returns cached entries for the paths whose size and mtime still match.
+
+        Args:
+            stats: {path: (size, mtime)} of the files found by the scan
+
+        Returns:
+            {path: {'width', 'height', 'fps', 'duration', 'codec_v', 'frame_ts', 'frame_in'}}
+        """
+        entries: Dict[str, dict] = {}
+        paths = list(stats)
+        for start in range(0, len(paths), _QUERY_CHUNK):
+            chunk = paths[start:start + _QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._execute_with_retry(
+                f"SELECT file_path, file_size, mtime, width, height, fps, duration, codec_v, frame_ts, frame_in "
+                f"FROM vidproc_scan_cache WHERE file_path IN ({placeholders})",
+                tuple(chunk), fetch_all=True
+            )
+            for row in rows or []:
+                path, size, mtime, width, height, fps, duration, codec_v, frame_ts, frame_in = row
+                if (size, mtime) != stats.get(path):
+                    continue # Changed since it was cached
+                entries[path] = {
+                    'width': width, 'height': height, 'fps': fps, 'duration': duration,
+                    'codec_v': codec_v, 'frame_ts': frame_ts,
+                    'frame_in': bytes(frame_in) if frame_in is not None else None,
+                }
+        return entries
+
+    def save_many(self, probes: List[Tuple[str, int, float, dict]], frames: Iterable[Tuple[str, float, bytes]] = ()) -> bool:
+        """
+        Writes probe results and preview frames in one transaction.
+
+        Args:
+            probes: (path, size, mtime, info) with info keys width/height/fps/duration/codec_v;
+                    replaces the row, dropping any frame of an older version of the file
+            frames: (path, timestamp, jpeg bytes) for rows that already exist
+        """
+        timestamp = DatabaseUtils.normalize_timestamp()
+        operations = [(
+            """INSERT OR REPLACE INTO vidproc_scan_cache
+               (file_path, file_size, mtime, width, height, fps, duration, codec_v, frame_ts, frame_in, last_updated)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, NULL, NULL, ?)""",
+            (path, size, mtime, info['width'], info['height'], info['fps'], info['duration'], info.get('codec_v'), timestamp)
+        ) for path, size, mtime, info in probes]
+        operations += [(
+            "UPDATE vidproc_scan_cache SET frame_ts = ?, frame_in = ?, last_updated = ? WHERE file_path = ?",
+            (ts, data, timestamp, path)
+        ) for path, ts, data in frames]
+        if not operations:
+            return True
+        return self._execute_transaction(operations)
+
+    def touch_many(self, paths: Iterable[str]) -> bool:
+        """Marks cache hits as seen so they are not pruned by age."""
+        timestamp = DatabaseUtils.normalize_timestamp()
+        paths = list(paths)
+        operations = []
+        for start in range(0, len(paths), _QUERY_CHUNK):
+            chunk = paths[start:start + _QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            operations.append((
+                f"UPDATE vidproc_scan_cache SET last_updated = ? WHERE file_path IN ({placeholders})",
+                (timestamp, *chunk)
+            ))
+        if not operations:
+            return True
+        return self._execute_transaction(operations)
+
+    def prune_folder(self, folder: str, stats: Dict[str, Tuple[int, float]]) -> int:
+        """
+        Drops rows for files directly in `folder` that are gone or whose size/mtime changed.
+
+        Args:
+            folder: The scanned folder
+            stats: {path: (size, mtime)} of the files the scan found there
+
+        Returns:
+            Number of rows removed
+        """
+        prefix = os.path.join(str(folder), "") # Stored paths are os.scandir paths under the folder
+        rows = self._execute_with_retry(
+            "SELECT file_path, file_size, mtime FROM vidproc_scan_cache WHERE substr(file_path, 1, ?) = ?",
+            (len(prefix), prefix), fetch_all=True
+        )
+        stale = [
+            (path,) for path, size, mtime in rows or []
+            if Path(path).parent == Path(folder) and stats.get(path) != (size, mtime)
+        ]
+        if not stale:
+            return 0
+        operations = [("DELETE FROM vidproc_scan_cache WHERE file_path = ?", params) for params in stale]
+        return len(stale) if self._execute_transaction(operations) else 0
+
+    def prune_expired(self, max_age_days: int = SCAN_CACHE_MAX_AGE_DAYS) -> int:
+        """Drops rows not written or seen by a scan within `max_age_days`. Returns the number removed."""
+        cutoff = (datetime.now() - timedelta(days=max_age_days)).isoformat()
+        result = self._execute_with_retry("DELETE FROM vidproc_scan_cache WHERE last_updated < ?", (cutoff,))
+        return result or 0
+
+    def clear(self) -> bool:
+        return self._execute_with_retry("DELETE FROM vidproc_scan_cache") is not None
+
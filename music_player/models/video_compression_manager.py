@@ -11,9 +11,10 @@ from qt_base_app.models.logger import Logger
 from PyQt6.QtCore import QObject, pyqtSignal, QThreadPool
 
 from .video_compression_task import VideoCompressionTask, CompressionStatus
-from .video_compression_worker import VideoCompressionWorker
+from .video_compression_worker import VideoCompressionWorker, VideoFinalizeWorker
 from .video_file_utils import discover_video_files, validate_video_files, get_video_file_info
-from .ffmpeg_utils import get_video_resolution
+from .ffmpeg_utils import probe_video_info
+from .compression_rate_model import CompressionRateModel
 
 class VideoCompressionManager(QObject):
     """
@@ -21,8 +22,9 @@ class VideoCompressionManager(QObject):
     
     This class handles:
     - File discovery and validation
-    - Task creation and management
-    - Worker thread coordination
+    - Task creation and management (files can be queued while a batch runs)
+    - Worker thread coordination, shortest files first
+    - Renaming/replacing finished files on a separate I/O pool
     - Progress tracking and reporting
     - Cancellation handling
     """
@@ -31,6 +33,7 @@ class VideoCompressionManager(QObject):
     compression_batch_started = pyqtSignal(int)  # total_files
     compression_batch_finished = pyqtSignal()
     compression_batch_cancelled = pyqtSignal()
+    compression_batch_extended = pyqtSignal(int, int)  # added_files, total_files
     
     # File-level signals
     compression_file_started = pyqtSignal(str, str, int, int)  # task_id, filename, index, total
@@ -62,6 +65,15 @@ class VideoCompressionManager(QObject):
         
         # Thread pool for workers
         self.thread_pool = QThreadPool.globalInstance()
+        # File finalization (rename/replace) is pure disk I/O; run it one at a time
+        # off the encode slots so the next encode starts as soon as FFmpeg exits
+        self.io_pool = QThreadPool(self)
+        self.io_pool.setMaxThreadCount(1)
+        self.finalizing_tasks: Dict[str, VideoFinalizeWorker] = {}
+        self.started_tasks = 0
+        
+        # Measured encode speeds per resolution class, for ETAs and scheduling
+        self.rate_model = CompressionRateModel()
         
         # Configuration - simplified since FFmpeg is assumed to be in PATH
         self.ffmpeg_path = "ffmpeg"  # Use system PATH
@@ -104,17 +116,21 @@ class VideoCompressionManager(QObject):
         """
         Start compression process for selected items.
         
+        If a batch is already running, the new files are added to its queue instead.
+        
         Args:
             selected_objects: List of selected file/directory objects from browser
             output_directory: Directory where compressed files will be saved
+            rotate_direction: Optional rotation for these files ('cw' | 'ccw')
         """
-        if self.is_batch_active:
-            self.error_message.emit("Compression batch is already active")
+        if self.is_batch_active and self.batch_cancelled:
+            self.error_message.emit("Compression batch is being cancelled")
             return
         
         try:
-            # Reset state
-            self._reset_batch_state()
+            if not self.is_batch_active:
+                # Reset state
+                self._reset_batch_state()
             # Store optional rotation
             self.rotate_direction = rotate_direction
             
@@ -153,6 +169,14 @@ class VideoCompressionManager(QObject):
                 self.error_message.emit("No valid video files found")
                 return
             
+            # Skip files that are already queued or running in the active batch
+            if self.is_batch_active:
+                queued = {task.input_path for task in self.tasks.values() if not task.is_finished()}
+                valid_video_files = [f for f in valid_video_files if f not in queued]
+                if not valid_video_files:
+                    self.error_message.emit("Selected videos are already queued for compression")
+                    return
+            
             # Filter out videos that do not need compression
             files_to_compress = self._filter_videos_for_compression(valid_video_files)
 
@@ -169,7 +193,7 @@ class VideoCompressionManager(QObject):
                     free_bytes = stat.free
                     
                     # Calculate total input file size
-                    total_input_size = sum(task.original_size_bytes for task in self.tasks.values())
+                    total_input_size = sum(os.path.getsize(path) for path in files_to_compress)
                     
                     # Estimate required space (assume compression might not reduce size significantly)
                     # Add 20% buffer for safety
@@ -193,8 +217,11 @@ class VideoCompressionManager(QObject):
                 self.error_message.emit("Failed to create compression tasks")
                 return
             
-            # Start batch processing
-            self._start_batch_processing(tasks)
+            # Start batch processing, or extend the running batch
+            if self.is_batch_active:
+                self._extend_batch(tasks)
+            else:
+                self._start_batch_processing(tasks)
             
         except Exception as e:
             error_msg = f"Failed to start compression: {str(e)}"
@@ -234,6 +261,7 @@ class VideoCompressionManager(QObject):
             'failed': self.failed_tasks,
             'cancelled': self.cancelled_tasks,
             'active_workers': len(self.active_workers),
+            'finalizing': len(self.finalizing_tasks),
             'pending_tasks': len([t for t in self.tasks.values() if t.status == CompressionStatus.PENDING])
         }
     
@@ -263,38 +291,51 @@ class VideoCompressionManager(QObject):
         """
         Get estimated time remaining for the current batch.
         
+        Each unfinished task is estimated from its probed duration and the encode
+        speed of its resolution class (the live FFmpeg speed for running tasks).
+        
         Returns:
             Optional[float]: Estimated seconds remaining, or None if not available
         """
-        if not self.is_batch_active or self.completed_tasks == 0:
+        if not self.is_batch_active:
             return None
         
-        # Calculate average time per completed task
-        total_time = 0
-        completed_count = 0
-        
+        known: List[float] = []
+        unknown_count = 0
         for task in self.tasks.values():
-            if task.status == CompressionStatus.COMPLETED:
-                duration = task.get_duration_seconds()
-                if duration:
-                    total_time += duration
-                    completed_count += 1
-        
-        if completed_count == 0:
-            return None
+            if task.is_finished() or task.task_id in self.finalizing_tasks:
+                continue
+            estimate = self._estimate_task_seconds(task)
+            if estimate is None:
+                unknown_count += 1
+            else:
+                known.append(estimate)
         
-        avg_time_per_task = total_time / completed_count
-        remaining_tasks = self.current_batch_size - self.completed_tasks - self.failed_tasks
+        if not known:
+            return None if unknown_count else 0.0
         
-        return avg_time_per_task * remaining_tasks
+        # Files without a duration are assumed to be average
+        total = sum(known) + unknown_count * (sum(known) / len(known))
+        return total / max(1, min(self.max_concurrent_workers, len(known) + unknown_count))
+    
+    def _estimate_task_seconds(self, task: VideoCompressionTask) -> Optional[float]:
+        """Remaining encode seconds for one task, or None without a probed duration."""
+        if not task.duration_seconds:
+            return None
+        if task.status == CompressionStatus.PROCESSING:
+            remaining = task.duration_seconds * (1.0 - task.progress)
+            speed = task.encode_speed or self.rate_model.speed(task.width, task.height)
+            return remaining / speed
+        return self.rate_model.estimate_seconds(task.width, task.height, task.duration_seconds)
     
     def _filter_videos_for_compression(self, video_files: List[str]) -> List[str]:
         """Filter list of videos to only include those that need compression."""
         files_to_compress = []
         for video_file in video_files:
-            resolution = get_video_resolution(video_file, self.ffmpeg_path)
-            if resolution:
-                width, height = resolution
+            # Probe results are cached, so tasks and workers reuse them below
+            info = probe_video_info(video_file, self.ffmpeg_path)
+            if info and info['width'] and info['height']:
+                width, height = info['width'], info['height']
                 # Compress if larger than 720p in any dimension
                 if width > 720 or height > 720:
                     files_to_compress.append(video_file)
@@ -310,7 +351,9 @@ class VideoCompressionManager(QObject):
         """Reset state for a new batch."""
         self.tasks.clear()
         self.active_workers.clear()
+        self.finalizing_tasks.clear()
         self.current_batch_size = 0
+        self.started_tasks = 0
         self.completed_tasks = 0
         self.failed_tasks = 0
         self.cancelled_tasks = 0
@@ -353,9 +396,10 @@ class VideoCompressionManager(QObject):
             List[VideoCompressionTask]: List of created tasks
         """
         tasks = []
-        total_files = len(video_files)
+        first_index = self.current_batch_size
+        total_files = first_index + len(video_files)
         
-        for index, video_file in enumerate(video_files):
+        for index, video_file in enumerate(video_files, start=first_index):
             try:
                 task = VideoCompressionTask.create(
                     input_path=video_file,
@@ -363,6 +407,11 @@ class VideoCompressionManager(QObject):
                     file_index=index,
                     total_files=total_files
                 )
+                task.rotate_direction = self.rotate_direction
+                info = probe_video_info(video_file, self.ffmpeg_path)
+                if info:
+                    task.width, task.height = info['width'], info['height']
+                    task.duration_seconds = info['duration']
                 tasks.append(task)
                 self.tasks[task.task_id] = task
                 
@@ -394,13 +443,40 @@ class VideoCompressionManager(QObject):
         # Start processing tasks (respecting max concurrent workers)
         self._process_next_tasks()
     
+    def _extend_batch(self, tasks: List[VideoCompressionTask]):
+        """
+        Add tasks to the running batch.
+        
+        Args:
+            tasks: Newly created tasks
+        """
+        if not tasks:
+            return
+        
+        self.current_batch_size += len(tasks)
+        for task in self.tasks.values():
+            task.total_files = self.current_batch_size
+        
+        Logger.instance().info(caller="VideoCompressionManager", msg=f"[VideoCompressionManager] Added {len(tasks)} files to the running batch ({self.current_batch_size} total)")
+        self.compression_batch_extended.emit(len(tasks), self.current_batch_size)
+        
+        self._process_next_tasks()
+    
+    def _task_cost(self, task: VideoCompressionTask):
+        """Scheduling key: shortest estimated encode first, unprobed files last by size."""
+        estimate = self._estimate_task_seconds(task)
+        return (estimate is None, estimate or 0.0, task.original_size_bytes)
+    
     def _process_next_tasks(self):
         """Process the next available tasks up to the maximum concurrent limit."""
         if self.batch_cancelled:
             return
         
-        # Find pending tasks
-        pending_tasks = [task for task in self.tasks.values() if task.status == CompressionStatus.PENDING]
+        # Find pending tasks, shortest first so finished files show up early
+        pending_tasks = sorted(
+            (task for task in self.tasks.values() if task.status == CompressionStatus.PENDING),
+            key=self._task_cost
+        )
         
         # Start workers up to the concurrent limit
         while (len(self.active_workers) < self.max_concurrent_workers and 
@@ -408,6 +484,9 @@ class VideoCompressionManager(QObject):
                not self.batch_cancelled):
             
             task = pending_tasks.pop(0)
+            # Number files in the order they actually run
+            task.file_index = self.started_tasks
+            self.started_tasks += 1
             self._start_worker_for_task(task)
     
     def _start_worker_for_task(self, task: VideoCompressionTask):
@@ -418,7 +497,7 @@ class VideoCompressionManager(QObject):
             task: Task to process
         """
         try:
-            worker = VideoCompressionWorker(task, self.ffmpeg_path, rotate=self.rotate_direction)
+            worker = VideoCompressionWorker(task, self.ffmpeg_path)
             
             # Connect worker signals
             worker.signals.worker_started.connect(self._on_worker_started)
@@ -427,7 +506,7 @@ class VideoCompressionManager(QObject):
             worker.signals.worker_cancelled.connect(self._on_worker_cancelled)
             worker.signals.progress_updated.connect(self._on_progress_updated)
             worker.signals.compression_started.connect(self._on_compression_started)
-            worker.signals.compression_completed.connect(self._on_compression_completed)
+            worker.signals.encode_completed.connect(self._on_encode_completed)
             
             # Add to active workers
             self.active_workers[task.task_id] = worker
@@ -462,6 +541,29 @@ class VideoCompressionManager(QObject):
         if not self.batch_cancelled:
             self._process_next_tasks()
     
+    def _on_encode_completed(self, task_id: str):
+        """Queue the encoded file for renaming/replacing on the I/O pool."""
+        task = self.tasks.get(task_id)
+        if not task:
+            return
+        
+        # Skipped files (output is the input) were never encoded
+        if task.encode_seconds and task.output_path != task.input_path:
+            self.rate_model.record(task.width, task.height, task.duration_seconds, task.encode_seconds)
+        
+        finalizer = VideoFinalizeWorker(task)
+        finalizer.signals.compression_completed.connect(self._on_compression_completed)
+        finalizer.signals.worker_failed.connect(self._on_worker_failed)
+        finalizer.signals.worker_finished.connect(self._on_finalize_finished)
+        
+        self.finalizing_tasks[task_id] = finalizer
+        self.io_pool.start(finalizer)
+    
+    def _on_finalize_finished(self, task_id: str):
+        """Handle finalize worker finished signal."""
+        self.finalizing_tasks.pop(task_id, None)
+        self._check_batch_completion()
+    
     def _on_worker_failed(self, task_id: str, error_message: str):
         """Handle worker failed signal."""
         task = self.tasks.get(task_id)
@@ -524,8 +626,9 @@ class VideoCompressionManager(QObject):
         # Check if all tasks are finished
         finished_tasks = [task for task in self.tasks.values() if task.is_finished()]
         
-        if len(finished_tasks) == self.current_batch_size:
+        if len(finished_tasks) == self.current_batch_size and not self.finalizing_tasks:
             self.is_batch_active = False
+            self.rate_model.save()
             
             if self.batch_cancelled:
                 Logger.instance().debug(caller="VideoCompressionManager", msg="[VideoCompressionManager] Batch cancelled")
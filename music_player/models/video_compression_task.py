@@ -47,6 +47,18 @@ class VideoCompressionTask:
     start_time: Optional[float] = None
     end_time: Optional[float] = None
     
+    # Probe information (filled by the manager when available)
+    duration_seconds: Optional[float] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    
+    # Optional rotation to apply during compression ('cw' | 'ccw')
+    rotate_direction: Optional[str] = None
+    
+    # Measured encode speed: live FFmpeg speed multiple and final FFmpeg wall time
+    encode_speed: Optional[float] = None
+    encode_seconds: Optional[float] = None
+    
     def __post_init__(self):
         """Initialize computed fields after dataclass creation."""
         if not self.original_filename:
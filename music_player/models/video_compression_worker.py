@@ -20,6 +20,7 @@ from .ffmpeg_utils import (
     get_video_resolution, # Import new function
     build_compression_command,
     parse_ffmpeg_progress,
+    parse_ffmpeg_speed,
     parse_ffmpeg_error
 )
 
@@ -44,14 +45,16 @@ class VideoCompressionWorkerSignals(QObject):
     
     # File operation signals
     compression_started = pyqtSignal(str, str)  # task_id, input_filename
+    encode_completed = pyqtSignal(str)  # task_id; output is ready for VideoFinalizeWorker
     compression_completed = pyqtSignal(str, str, str)  # task_id, input_filename, output_filename
     
 class VideoCompressionWorker(QRunnable):
     """
     Worker class that performs video compression in a background thread.
     
-    This class handles the actual FFmpeg execution, progress monitoring,
-    and file operations for a single video compression task.
+    This class handles the actual FFmpeg execution and progress monitoring
+    for a single video compression task. Renaming/replacing files afterwards is
+    done by VideoFinalizeWorker, so the encode slot is freed as soon as FFmpeg ends.
     """
     
     def __init__(self, task: VideoCompressionTask, ffmpeg_path: str = "ffmpeg", rotate: Optional[str] = None):
@@ -68,7 +71,7 @@ class VideoCompressionWorker(QRunnable):
         self.cancelled = False
         self.process: Optional[subprocess.Popen] = None
         self.signals = VideoCompressionWorkerSignals()
-        self.rotate_direction: Optional[str] = rotate
+        self.rotate_direction: Optional[str] = rotate or task.rotate_direction
         
         # Progress tracking
         self.total_duration_seconds: Optional[float] = None
@@ -86,8 +89,8 @@ class VideoCompressionWorker(QRunnable):
         1. Validate inputs and FFmpeg
         2. Get video duration
         3. Execute FFmpeg compression
-        4. Handle file operations
-        5. Clean up
+        4. Hand the output over for file operations (encode_completed)
+        5. Clean up on failure
         """
         Logger.instance().info(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] Starting compression for task: {self.task.task_id}")
         
@@ -125,22 +128,10 @@ class VideoCompressionWorker(QRunnable):
                 self._handle_cancellation()
                 return
             
-            # Handle file operations (rename, delete original)
-            final_output_path = self._handle_file_operations()
-            
-            # Mark as completed
-            compressed_size = 0
-            if os.path.exists(final_output_path):
-                compressed_size = os.path.getsize(final_output_path)
-            
-            self.task.mark_completed(compressed_size)
-            self.signals.compression_completed.emit(
-                self.task.task_id, 
-                self.task.original_filename, 
-                os.path.basename(final_output_path)
-            )
+            # File operations (rename, delete original) run in the manager's I/O stage
+            self.signals.encode_completed.emit(self.task.task_id)
             
-            Logger.instance().info(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] Compression completed: {self.task.original_filename}")
+            Logger.instance().info(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] Encoding finished: {self.task.original_filename}")
             
         except Exception as e:
             error_msg = str(e)
@@ -220,7 +211,10 @@ class VideoCompressionWorker(QRunnable):
     
     def _is_compression_needed(self) -> bool:
         """Check if video resolution is larger than 720p."""
-        resolution = get_video_resolution(self.task.input_path, self.ffmpeg_path)
+        if self.task.width and self.task.height:
+            resolution = (self.task.width, self.task.height) # Probed by the manager
+        else:
+            resolution = get_video_resolution(self.task.input_path, self.ffmpeg_path)
         if resolution:
             width, height = resolution
             if width <= 720 and height <= 720:
@@ -229,7 +223,7 @@ class VideoCompressionWorker(QRunnable):
 
     def _get_video_duration(self):
         """Get the total duration of the video for progress calculation."""
-        self.total_duration_seconds = get_video_duration(self.task.input_path, self.ffmpeg_path)
+        self.total_duration_seconds = self.task.duration_seconds or get_video_duration(self.task.input_path, self.ffmpeg_path)
         
         if self.total_duration_seconds:
             Logger.instance().debug(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] Video duration: {self.total_duration_seconds:.2f} seconds")
@@ -253,6 +247,7 @@ class VideoCompressionWorker(QRunnable):
         Logger.instance().debug(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] Command: {' '.join(cmd)}")
         
         try:
+            encode_start = time.monotonic()
             # Enhanced subprocess configuration for Unicode filename support
             self.process = subprocess.Popen(
                 cmd,
@@ -284,6 +279,9 @@ class VideoCompressionWorker(QRunnable):
             # Verify output file was created and is valid
             self._verify_output_file()
             
+            # Feeds the manager's encode rate history
+            self.task.encode_seconds = time.monotonic() - encode_start
+            
         except subprocess.TimeoutExpired:
             raise Exception("FFmpeg process timed out")
         except Exception as e:
@@ -334,6 +332,10 @@ class VideoCompressionWorker(QRunnable):
                 if not line:
                     break
                 
+                speed = parse_ffmpeg_speed(line)
+                if speed is not None:
+                    self.task.encode_speed = speed
+                
                 # Parse progress from FFmpeg output
                 progress = self._parse_ffmpeg_progress(line)
                 if progress is not None:
@@ -359,6 +361,60 @@ class VideoCompressionWorker(QRunnable):
         """
         return parse_ffmpeg_progress(line, self.total_duration_seconds)
     
+    def _handle_cancellation(self):
+        """Handle cancellation cleanup."""
+        self.task.mark_cancelled()
+        self.signals.worker_cancelled.emit(self.task.task_id)
+        self._cleanup_temp_files()
+    
+    def _cleanup_temp_files(self):
+        """Clean up temporary files."""
+        if os.path.exists(self.task.output_path):
+            try:
+                os.remove(self.task.output_path)
+                Logger.instance().debug(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] Cleaned up temp file: {self.task.output_path}")
+            except Exception as e:
+                Logger.instance().error(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] Error cleaning up temp file: {e}")
+
+
+class VideoFinalizeWorker(QRunnable):
+    """
+    I/O stage of a compression task: moves the encoded temp file to its final name,
+    replacing the original. Runs on the manager's I/O pool, separate from encoding.
+    """
+    
+    def __init__(self, task: VideoCompressionTask):
+        super().__init__()
+        self.task = task
+        self.signals = VideoCompressionWorkerSignals()
+    
+    def run(self):
+        try:
+            final_output_path = self._handle_file_operations()
+            
+            # Mark as completed
+            compressed_size = 0
+            if os.path.exists(final_output_path):
+                compressed_size = os.path.getsize(final_output_path)
+            
+            self.task.mark_completed(compressed_size)
+            self.signals.compression_completed.emit(
+                self.task.task_id, 
+                self.task.original_filename, 
+                os.path.basename(final_output_path)
+            )
+            
+            Logger.instance().info(caller="VideoFinalizeWorker", msg=f"[VideoFinalizeWorker] Compression completed: {self.task.original_filename}")
+            
+        except Exception as e:
+            error_msg = str(e)
+            Logger.instance().error(caller="VideoFinalizeWorker", msg=f"[VideoFinalizeWorker] Finalization failed: {error_msg}")
+            self.task.mark_failed(error_msg)
+            self.signals.worker_failed.emit(self.task.task_id, error_msg)
+            
+        finally:
+            self.signals.worker_finished.emit(self.task.task_id)
+    
     def _handle_file_operations(self) -> str:
         """
         Handle file operations after successful compression with enhanced error handling.
@@ -371,7 +427,7 @@ class VideoCompressionWorker(QRunnable):
         try:
             # If compression was skipped, the output path is the same as the input path
             if self.task.output_path == self.task.input_path:
-                Logger.instance().debug(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] No file operations needed for skipped video: {self.task.original_filename}")
+                Logger.instance().debug(caller="VideoFinalizeWorker", msg=f"[VideoFinalizeWorker] No file operations needed for skipped video: {self.task.original_filename}")
                 return self.task.input_path # The "final" path is the original path
 
             # Verify compressed file exists and is valid
@@ -388,7 +444,7 @@ class VideoCompressionWorker(QRunnable):
                 # Check if the conflict is with the original input file
                 if os.path.abspath(final_output_path) == os.path.abspath(self.task.input_path):
                     # This is expected - we want to replace the original file
-                    Logger.instance().debug(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] Will replace original file: {os.path.basename(final_output_path)}")
+                    Logger.instance().debug(caller="VideoFinalizeWorker", msg=f"[VideoFinalizeWorker] Will replace original file: {os.path.basename(final_output_path)}")
                 else:
                     # Genuine conflict with a different file, need to resolve
                     base_path = Path(final_output_path)
@@ -400,16 +456,16 @@ class VideoCompressionWorker(QRunnable):
                             raise Exception("Too many filename conflicts")
                     
                     if final_output_path != original_final_path:
-                        Logger.instance().debug(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] Filename conflict resolved: {os.path.basename(final_output_path)}")
+                        Logger.instance().debug(caller="VideoFinalizeWorker", msg=f"[VideoFinalizeWorker] Filename conflict resolved: {os.path.basename(final_output_path)}")
             
             # Handle the case where we need to replace the original file
             if os.path.abspath(final_output_path) == os.path.abspath(self.task.input_path):
                 # Delete original file first since we want to replace it
                 try:
                     os.remove(self.task.input_path)
-                    Logger.instance().debug(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] Deleted original file: {self.task.original_filename}")
+                    Logger.instance().debug(caller="VideoFinalizeWorker", msg=f"[VideoFinalizeWorker] Deleted original file: {self.task.original_filename}")
                 except Exception as e:
-                    Logger.instance().warning(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] Warning: Could not delete original file: {e}")
+                    Logger.instance().warning(caller="VideoFinalizeWorker", msg=f"[VideoFinalizeWorker] Warning: Could not delete original file: {e}")
                     # If we can't delete the original, we'll need a different filename
                     base_path = Path(final_output_path)
                     counter = 1
@@ -418,20 +474,20 @@ class VideoCompressionWorker(QRunnable):
                         counter += 1
                         if counter > 1000:  # Prevent infinite loop
                             raise Exception("Too many filename conflicts")
-                    Logger.instance().debug(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] Using alternative filename: {os.path.basename(final_output_path)}")
+                    Logger.instance().debug(caller="VideoFinalizeWorker", msg=f"[VideoFinalizeWorker] Using alternative filename: {os.path.basename(final_output_path)}")
             
             # Rename compressed file to final name
             if self.task.output_path != final_output_path:
                 os.rename(self.task.output_path, final_output_path)
-                Logger.instance().debug(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] Renamed to: {os.path.basename(final_output_path)}")
+                Logger.instance().debug(caller="VideoFinalizeWorker", msg=f"[VideoFinalizeWorker] Renamed to: {os.path.basename(final_output_path)}")
             
             # Delete original file (only if we haven't already deleted it above)
             if os.path.abspath(final_output_path) != os.path.abspath(self.task.input_path) and os.path.exists(self.task.input_path):
                 try:
                     os.remove(self.task.input_path)
-                    Logger.instance().debug(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] Deleted original file: {self.task.original_filename}")
+                    Logger.instance().debug(caller="VideoFinalizeWorker", msg=f"[VideoFinalizeWorker] Deleted original file: {self.task.original_filename}")
                 except Exception as e:
-                    Logger.instance().warning(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] Warning: Could not delete original file: {e}")
+                    Logger.instance().warning(caller="VideoFinalizeWorker", msg=f"[VideoFinalizeWorker] Warning: Could not delete original file: {e}")
                     # Don't fail the entire operation if we can't delete the original
             
             return final_output_path
@@ -444,18 +500,3 @@ class VideoCompressionWorker(QRunnable):
                 except:
                     pass
             raise Exception(f"File operation failed: {e}")
-    
-    def _handle_cancellation(self):
-        """Handle cancellation cleanup."""
-        self.task.mark_cancelled()
-        self.signals.worker_cancelled.emit(self.task.task_id)
-        self._cleanup_temp_files()
-    
-    def _cleanup_temp_files(self):
-        """Clean up temporary files."""
-        if os.path.exists(self.task.output_path):
-            try:
-                os.remove(self.task.output_path)
-                Logger.instance().debug(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] Cleaned up temp file: {self.task.output_path}")
-            except Exception as e:
-                Logger.instance().error(caller="VideoCompressionWorker", msg=f"[VideoCompressionWorker] Error cleaning up temp file: {e}")
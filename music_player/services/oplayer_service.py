@@ -10,6 +10,56 @@ from qt_base_app.models.logger import Logger
 
 from qt_base_app.models.settings_manager import SettingsManager, SettingType
 
+def ftp_upload_file(host, port, file_path, progress_callback=None):
+    """
+    Upload a single file to the OPlayer FTP server (blocking).
+    
+    Shared by FTPUploadThread and the post-download pipeline's upload stage.
+    
+    Args:
+        host (str): FTP host address
+        port (int): FTP port
+        file_path (str): Path to the file to upload
+        progress_callback (callable, optional): Called with the upload percentage (0-100)
+        
+    Returns:
+        str: The uploaded filename
+    """
+    file_size = os.path.getsize(file_path)
+    filename = os.path.basename(file_path)
+    
+    # Set up the FTP client
+    Logger.instance().debug(caller="FTPUploadThread", msg=f"[FTPUploadThread] Connecting to FTP server at {host}:{port}")
+    ftp = ftplib.FTP()
+    ftp.connect(host, port)
+    ftp.login()  # Anonymous login, no username or password needed
+    
+    # Change to the appropriate directory if needed
+    # For OPlayer, we'll upload to the root directory
+    Logger.instance().debug(caller="FTPUploadThread", msg=f"[FTPUploadThread] Connected to FTP server successfully")
+    
+    # Define callback function to track upload progress
+    bytes_transferred = 0
+    
+    def callback(data):
+        nonlocal bytes_transferred
+        bytes_transferred += len(data)
+        if progress_callback and file_size:
+            progress_callback(int((bytes_transferred / file_size) * 100))
+    
+    # Open the file for binary reading
+    with open(file_path, 'rb') as file:
+        # Start the upload with progress tracking
+        Logger.instance().debug(caller="FTPUploadThread", msg=f"[FTPUploadThread] Uploading {filename}...")
+        ftp.storbinary(f'STOR {filename}', file, 8192, callback)
+    
+    # Close the FTP connection
+    ftp.quit()
+    
+    Logger.instance().info(caller="FTPUploadThread", msg=f"[FTPUploadThread] Upload completed successfully: {filename}")
+    return filename
+
+
 class FTPUploadThread(QThread):
     """
     Thread for handling FTP uploads to avoid blocking the UI.
@@ -29,37 +79,10 @@ class FTPUploadThread(QThread):
     def run(self):
         """Execute the FTP upload in a separate thread"""
         try:
-            # Set up the FTP client
-            Logger.instance().debug(caller="FTPUploadThread", msg=f"[FTPUploadThread] Connecting to FTP server at {self.host}:{self.port}")
-            ftp = ftplib.FTP()
-            ftp.connect(self.host, self.port)
-            ftp.login()  # Anonymous login, no username or password needed
-            
-            # Change to the appropriate directory if needed
-            # For OPlayer, we'll upload to the root directory
-            Logger.instance().debug(caller="FTPUploadThread", msg=f"[FTPUploadThread] Connected to FTP server successfully")
-            
-            # Define callback function to track upload progress
-            bytes_transferred = 0
-            
-            def callback(data):
-                nonlocal bytes_transferred
-                bytes_transferred += len(data)
-                progress = int((bytes_transferred / self.file_size) * 100)
-                self.progress_updated.emit(progress)
-            
-            # Open the file for binary reading
-            with open(self.file_path, 'rb') as file:
-                # Start the upload with progress tracking
-                Logger.instance().debug(caller="FTPUploadThread", msg=f"[FTPUploadThread] Uploading {self.filename}...")
-                ftp.storbinary(f'STOR {self.filename}', file, 8192, callback)
-            
-            # Close the FTP connection
-            ftp.quit()
+            filename = ftp_upload_file(self.host, self.port, self.file_path, self.progress_updated.emit)
             
             # Emit completion signal
-            Logger.instance().info(caller="FTPUploadThread", msg=f"[FTPUploadThread] Upload completed successfully: {self.filename}")
-            self.upload_completed.emit(self.filename)
+            self.upload_completed.emit(filename)
             
         except Exception as e:
             error_msg = f"Upload failed: {str(e)}"
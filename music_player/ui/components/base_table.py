@@ -46,11 +46,67 @@ class ColumnDefinition:
     # Stretch factor (optional) - used by BaseTableView
     stretch: int = 0
 
+# --- Row Cache ---
+_MISSING = object() # Marks a cell whose value has not been computed yet
+# Above this many separate row ranges, removal resets the model instead of emitting per range
+REMOVE_RANGES_RESET_THRESHOLD = 64
+
+class _CellCache:
+    """
+    Formatted display strings and sort keys stored column-wise: one flat list per
+    column, parallel to the source objects and only allocated once that column is
+    painted or sorted. Costs one list slot per row and used column, with no per-row objects.
+    """
+    __slots__ = ("rows", "display", "sort")
+
+    def __init__(self, column_count: int, row_count: int):
+        self.rows = row_count
+        self.display: List[Optional[List[Any]]] = [None] * column_count
+        self.sort: List[Optional[List[Any]]] = [None] * column_count
+
+    def column(self, columns: List[Optional[List[Any]]], col: int) -> List[Any]:
+        values = columns[col]
+        if values is None:
+            values = columns[col] = [_MISSING] * self.rows
+        return values
+
+    def _all_columns(self):
+        return [values for values in self.display + self.sort if values is not None]
+
+    def invalidate(self, rows: List[int]):
+        for values in self._all_columns():
+            for row in rows:
+                if 0 <= row < self.rows:
+                    values[row] = _MISSING
+
+    def insert(self, row: int, count: int):
+        for values in self._all_columns():
+            values[row:row] = [_MISSING] * count
+        self.rows += count
+
+    def delete(self, first: int, last: int):
+        for values in self._all_columns():
+            del values[first:last + 1]
+        self.rows -= last - first + 1
+
+    def keep(self, kept_rows: List[int]):
+        """Keeps only the given source rows, in order (one-pass rebuild after a scattered removal)."""
+        for columns in (self.display, self.sort):
+            for col, values in enumerate(columns):
+                if values is not None:
+                    columns[col] = [values[i] for i in kept_rows]
+        self.rows = len(kept_rows)
+
 # --- Base Table Model ---
 class BaseTableModel(QAbstractTableModel):
     """
     A reusable table model that adapts a list of arbitrary Python objects
     for display in a QTableView using ColumnDefinition specifications.
+
+    Display strings and sort keys are computed once per cell and cached column-wise
+    parallel to the source objects, so repaints and proxy sorts don't re-run
+    data_key/display_formatter. Call update_row_data() (or invalidate_row_cache())
+    after mutating a source object in place.
     """
 
     def __init__(self,
@@ -61,6 +117,7 @@ class BaseTableModel(QAbstractTableModel):
         self._source_objects: List[Any] = source_objects if source_objects is not None else []
         self._column_definitions: List[ColumnDefinition] = column_definitions if column_definitions is not None else []
         self._headers = [cd.header for cd in self._column_definitions]
+        self._cell_cache = _CellCache(len(self._column_definitions), len(self._source_objects))
 
     @property
     def column_definitions(self) -> List[ColumnDefinition]:
@@ -71,8 +128,22 @@ class BaseTableModel(QAbstractTableModel):
         """Replaces the entire dataset and notifies the view."""
         self.beginResetModel()
         self._source_objects = source_objects if source_objects is not None else []
+        self.invalidate_row_cache()
         self.endResetModel()
 
+    def invalidate_row_cache(self, source_rows: Optional[List[int]] = None):
+        """Drops cached display/sort values for the given source rows (all rows if None)."""
+        if source_rows is None or self._cell_cache.rows != len(self._source_objects):
+            self._cell_cache = _CellCache(len(self._column_definitions), len(self._source_objects))
+            return
+        self._cell_cache.invalidate(source_rows)
+
+    def _get_cell_cache(self) -> _CellCache:
+        if self._cell_cache.rows != len(self._source_objects):
+            # A subclass replaced/mutated _source_objects directly; start over
+            self.invalidate_row_cache()
+        return self._cell_cache
+
     def rowCount(self, parent=QModelIndex()) -> int:
         """Returns the number of rows (objects)."""
         return 0 if parent.isValid() else len(self._source_objects)
@@ -111,16 +182,27 @@ class BaseTableModel(QAbstractTableModel):
         col_def = self._column_definitions[col]
 
         if role == Qt.ItemDataRole.DisplayRole:
-            raw_value = self._get_value_from_key(obj, col_def.data_key)
-            if col_def.display_formatter:
-                try: return col_def.display_formatter(raw_value)
-                except Exception: return "FmtErr"
-            else:
-                return str(raw_value if raw_value is not None else "")
+            cache = self._get_cell_cache()
+            column = cache.column(cache.display, col)
+            text = column[row]
+            if text is _MISSING:
+                raw_value = self._get_value_from_key(obj, col_def.data_key)
+                if col_def.display_formatter:
+                    try: text = col_def.display_formatter(raw_value)
+                    except Exception: text = "FmtErr"
+                else:
+                    text = str(raw_value if raw_value is not None else "")
+                column[row] = text
+            return text
 
         elif role == col_def.sort_role:
-            sort_key = col_def.sort_key if col_def.sort_key is not None else col_def.data_key
-            return self._get_value_from_key(obj, sort_key)
+            cache = self._get_cell_cache()
+            column = cache.column(cache.sort, col)
+            key = column[row]
+            if key is _MISSING:
+                sort_key = col_def.sort_key if col_def.sort_key is not None else col_def.data_key
+                key = column[row] = self._get_value_from_key(obj, sort_key)
+            return key
 
         elif role == Qt.ItemDataRole.TextAlignmentRole:
             return col_def.alignment
@@ -138,65 +220,66 @@ class BaseTableModel(QAbstractTableModel):
     def update_row_data(self, row: int):
         """Notify views that data for a specific row may have changed."""
         if 0 <= row < self.rowCount():
+            self.invalidate_row_cache([row])
             start_index = self.index(row, 0)
             end_index = self.index(row, self.columnCount() - 1)
             self.dataChanged.emit(start_index, end_index) # Emit for all roles
 
     def remove_rows_by_objects(self, objects_to_remove: List[Any]):
         """Removes rows corresponding to the given objects."""
-        logger = Logger.instance() # Get logger instance
-        logger.debug(self.__class__.__name__, f"[BaseTableModel] remove_rows_by_objects called with {len(objects_to_remove)} objects.")
-        
-        if not objects_to_remove: 
-            logger.debug(self.__class__.__name__, "[BaseTableModel] No objects provided for removal.")
+        rows = self._source_rows_for_objects(objects_to_remove)
+        if not rows:
             return
-            
-        # Map object IDs to their current row indices
-        current_objects_map = {id(obj): i for i, obj in enumerate(self._source_objects)}
-        rows_to_remove_indices = []
-        
-        for obj_to_remove in objects_to_remove:
-            row_index = current_objects_map.get(id(obj_to_remove))
-            if row_index is not None:
-                # Ensure index is still valid (list size might change if duplicates were passed)
-                if 0 <= row_index < len(self._source_objects):
-                    # Double check the object ID matches at that index now
-                    if id(self._source_objects[row_index]) == id(obj_to_remove):
-                         rows_to_remove_indices.append(row_index)
-                    else:
-                         logger.warning(self.__class__.__name__, f"[BaseTableModel] Index {row_index} found for object ID {id(obj_to_remove)}, but object ID mismatch occurred later.")
-                else:
-                    logger.warning(self.__class__.__name__, f"[BaseTableModel] Index {row_index} found for object ID {id(obj_to_remove)}, but index became invalid.")
-            else:
-                logger.warning(self.__class__.__name__, f"[BaseTableModel] Object ID {id(obj_to_remove)} not found in current map.")
+        removed = self._remove_source_rows(rows)
+        Logger.instance().debug(self.__class__.__name__, f"[BaseTableModel] Removed {len(removed)} of {len(objects_to_remove)} requested rows.")
 
-        if not rows_to_remove_indices:
-            logger.debug(self.__class__.__name__, "[BaseTableModel] No valid row indices found for removal after mapping.")
-            return
+    def _source_rows_for_objects(self, objects: List[Any]) -> List[int]:
+        """Returns the sorted, unique source rows holding the given objects (matched by identity)."""
+        if not objects:
+            return []
+        wanted = {id(obj) for obj in objects}
+        return [i for i, obj in enumerate(self._source_objects) if id(obj) in wanted]
 
-        # Remove duplicates and sort reversed
-        unique_rows_to_remove = sorted(list(set(rows_to_remove_indices)), reverse=True)
-        logger.debug(self.__class__.__name__, f"[BaseTableModel] Attempting to remove rows at indices: {unique_rows_to_remove}")
-
-        removed_count = 0
-        for row_index in unique_rows_to_remove:
-            # Final check before emitting signals and popping
-            if 0 <= row_index < len(self._source_objects): 
-                logger.debug(self.__class__.__name__, f"[BaseTableModel] Emitting beginRemoveRows for index {row_index}")
-                self.beginRemoveRows(QModelIndex(), row_index, row_index) # SIGNAL 1
-                try:
-                    removed_obj = self._source_objects.pop(row_index) # <-- THE ACTUAL REMOVAL
-                    removed_count += 1
-                    logger.debug(self.__class__.__name__, f"[BaseTableModel] Popped object from index {row_index}. List size now {len(self._source_objects)}")
-                except IndexError as e:
-                    # Use %s for standard formatting of exception
-                    logger.error(self.__class__.__name__, f"[BaseTableModel] IndexError trying to pop row {row_index}: %s", e)
-                finally:
-                    self.endRemoveRows() # SIGNAL 2
+    def _remove_source_rows(self, rows: List[int]) -> List[Any]:
+        """
+        Removes the given sorted, unique source rows and returns the removed objects.
+        Contiguous rows are removed as one begin/endRemoveRows range (bottom-up so
+        earlier ranges keep their indices). When the selection is scattered into many
+        ranges, a single model reset and one-pass rebuild is cheaper than deleting
+        slice by slice.
+        """
+        ranges = []
+        for row in rows:
+            if ranges and row == ranges[-1][1] + 1:
+                ranges[-1][1] = row
             else:
-                logger.warning(self.__class__.__name__, f"[BaseTableModel] Skipping removal for index {row_index} as it became invalid.")
-        
-        logger.debug(self.__class__.__name__, f"[BaseTableModel] Finished remove_rows_by_objects. Actually removed {removed_count} items.")
+                ranges.append([row, row])
+
+        cache = self._get_cell_cache()
+
+        if len(ranges) > REMOVE_RANGES_RESET_THRESHOLD:
+            remove_set = set(rows)
+            self.beginResetModel()
+            removed, kept, kept_rows = [], [], []
+            for i, obj in enumerate(self._source_objects):
+                if i in remove_set:
+                    removed.append(obj)
+                else:
+                    kept.append(obj)
+                    kept_rows.append(i)
+            self._source_objects = kept
+            cache.keep(kept_rows)
+            self.endResetModel()
+            return removed
+
+        removed = []
+        for first, last in reversed(ranges):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            removed[0:0] = self._source_objects[first:last + 1]
+            del self._source_objects[first:last + 1]
+            cache.delete(first, last)
+            self.endRemoveRows()
+        return removed
 
     def insert_rows(self, row: int, objects_to_insert: List[Any], parent=QModelIndex()) -> bool:
          """Inserts rows into the model."""
@@ -204,9 +287,10 @@ class BaseTableModel(QAbstractTableModel):
          if count <= 0 or row < 0 or row > len(self._source_objects):
              return False
 
+         cache = self._get_cell_cache()
          self.beginInsertRows(parent, row, row + count - 1)
-         for i in range(count):
-             self._source_objects.insert(row + i, objects_to_insert[i])
+         self._source_objects[row:row] = objects_to_insert
+         cache.insert(row, count)
          self.endInsertRows()
          return True
 
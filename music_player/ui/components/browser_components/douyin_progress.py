@@ -11,12 +11,30 @@ class DouyinProgress(QWidget):
         self.main_layout = QVBoxLayout(self)
         self.status_label = QLabel("Starting...")
         self.main_layout.addWidget(self.status_label)
+        # Normalization plan; stays up under the changing status until the next run
+        self.plan_label = QLabel()
+        self.plan_label.hide()
+        self.main_layout.addWidget(self.plan_label)
         self.setStyleSheet(f"background-color: {self.theme.get_color('background', 'primary')}; border: 1px solid {self.theme.get_color('border', 'primary')}; border-radius: 5px;")
 
     def show_trimming_started(self, total_files):
+        self.plan_label.hide()
         self.status_label.setText(f"Re-encoding & trimming {total_files} files (720p, max 3 concurrent)...")
         self.show()
 
+    def show_analysis_started(self, total_files):
+        self.plan_label.hide()
+        self.status_label.setText(f"Analyzing {total_files} files...")
+        self.show()
+
+    def show_normalize_plan(self, copy_count, encode_count, unprobed_count=0):
+        text = f"Plan: {copy_count} merged as-is, {encode_count} to normalize"
+        if unprobed_count:
+            text += f", {unprobed_count} not analyzable (merged as-is)"
+        self.plan_label.setText(text)
+        self.plan_label.show()
+        self.show()
+
     def show_normalization_started(self, total_files):
         self.status_label.setText(f"Analyzing & normalizing {total_files} files to majority format (max 3 concurrent)...")
         self.show()
@@ -6,6 +6,7 @@ from PyQt6.QtCore import Qt, QTimer
 from typing import Optional
 from PyQt6.QtGui import QPainter, QColor
 from qt_base_app.models.logger import Logger
+from music_player.models.CLIDownloadWorker import format_eta
 
 from qt_base_app.theme.theme_manager import ThemeManager
 
@@ -20,6 +21,9 @@ class VideoCompressionProgress(QWidget):
 
         # Internal state for current file progress tracking
         self._current_task_id: Optional[str] = None
+        self._current_file_index: Optional[int] = None
+        self._total_files = 0
+        self._eta_seconds: Optional[float] = None # Whole-batch estimate from the manager
         
         self._default_progress_bar_chunk_style = ""
 
@@ -115,6 +119,9 @@ class VideoCompressionProgress(QWidget):
 
     def show_compression_started(self, total_files: int):
         self._current_task_id = None # No specific task active yet
+        self._current_file_index = None
+        self._total_files = total_files
+        self._eta_seconds = None
         self._reset_progress_bar_style()
         self.status_label.setText(f"Starting video compression for {total_files} file(s)...")
         self.details_label.setText("Please wait...")
@@ -128,6 +135,7 @@ class VideoCompressionProgress(QWidget):
     # --- Reuse for Rotation Batch ---
     def show_rotation_started(self, total_files: int):
         self._current_task_id = None
+        self._current_file_index = None
         self._reset_progress_bar_style()
         self.status_label.setText(f"Rotating {total_files} video(s)...")
         self.details_label.setText("Please wait...")
@@ -177,21 +185,42 @@ class VideoCompressionProgress(QWidget):
         """Called when a new file starts or its progress updates for the first time."""
         Logger.instance().debug(caller="video_compression_progress", msg=f"[VideoCompressionProgress DEBUG] show_file_progress: task_id={task_id}, filename={filename}, current_task_id={self._current_task_id}")
         self._current_task_id = task_id
+        self._current_file_index = current_file_index
+        self._total_files = total_files
         self._reset_progress_bar_style() # Reset style in case previous was an error
         
         self.status_label.setText(f"Compressing video {current_file_index + 1} of {total_files}:")
         self.details_label.setText(filename)
         self.progress_bar.setValue(int(percentage * 100))
-        self.progress_bar.setFormat(f"{int(percentage * 100)}%")
+        self.progress_bar.setFormat(self._progress_format(percentage))
         if not self.isVisible():
             self.show()
         self.adjustSize()
 
+    def update_total_files(self, total_files: int):
+        """Called when files are added to the running batch."""
+        self._total_files = total_files
+        if self._current_file_index is None:
+            self.status_label.setText(f"Starting video compression for {total_files} file(s)...")
+        else:
+            self.status_label.setText(f"Compressing video {self._current_file_index + 1} of {total_files}:")
+        self.adjustSize()
+
+    def set_time_remaining(self, seconds: Optional[float]):
+        """Sets the batch ETA shown next to the file percentage (None hides it)."""
+        self._eta_seconds = seconds
+
+    def _progress_format(self, percentage: float) -> str:
+        text = f"{int(percentage * 100)}%"
+        if self._eta_seconds is not None:
+            text += f" - {format_eta(self._eta_seconds)} left"
+        return text
+
     def update_current_file_progress(self, task_id: str, percentage: float):
         """Updates progress for the currently displayed file if task_id matches."""
         if self._current_task_id == task_id:
             self.progress_bar.setValue(int(percentage * 100))
-            self.progress_bar.setFormat(f"{int(percentage * 100)}%")
+            self.progress_bar.setFormat(self._progress_format(percentage))
             # self.adjustSize() # Usually not needed for just progress value change
         else:
             Logger.instance().debug(caller="video_compression_progress", msg=f"[VideoCompressionProgress DEBUG] Ignoring progress update for task_id={task_id}, current_task_id={self._current_task_id}")
@@ -227,6 +256,8 @@ class VideoCompressionProgress(QWidget):
 
     def show_batch_finished(self):
         self._current_task_id = None # No specific task active
+        self._current_file_index = None
+        self._eta_seconds = None
         self._reset_progress_bar_style()
         self.status_label.setText("All video compressions finished!")
         self.details_label.setText("")
@@ -10,7 +10,7 @@ from PyQt6.QtWidgets import (
     QPushButton, QScrollArea,
     QMenu, QApplication
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QSize, QSortFilterProxyModel, QModelIndex
+from PyQt6.QtCore import Qt, pyqtSignal, QSize, QSortFilterProxyModel, QModelIndex, QTimer
 from PyQt6.QtGui import QFont, QIcon, QCursor
 import qtawesome as qta
 
@@ -20,8 +20,10 @@ from music_player.models.playlist import Playlist
 from music_player.models import player_state
 from .selection_pool import SelectionPoolWidget, format_file_size, format_modified_time
 from music_player.ui.components.icon_button import IconButton
+from music_player.ui.components.search_field import SearchField
 from music_player.ui.components.base_table import BaseTableModel, ColumnDefinition
 from music_player.models.file_pool_model import FilePoolModel
+from music_player.models.track_stat_cache import TrackStatCache, TrackStatRefresher
 from qt_base_app.models.logger import Logger
 from .playlist_table_view import PlaylistTableView
 
@@ -31,20 +33,12 @@ AUDIO_EXTENSIONS = {
     '.opus', '.aiff', '.ape', '.mpc'
 }
 
-# --- Column Definitions for Playlist Table ---
-def get_track_stat(track_data: dict, stat_key: str) -> Any:
-    """Helper to safely get file stats, returning 0 on error."""
-    path_str = track_data.get('path')
-    if not path_str:
-        return 0
-    try:
-        stats = Path(path_str).stat()
-        if stat_key == 'size': return stats.st_size
-        if stat_key == 'modified': return stats.st_mtime
-    except Exception:
-        pass
-    return 0
+# Coalesce background stat results into one model update per interval
+STAT_FLUSH_INTERVAL_MS = 200
+# Filter text is applied this long after the last keystroke
+SEARCH_DEBOUNCE_MS = 150
 
+# --- Column Definitions for Playlist Table ---
 def get_added_timestamp(track_data: dict) -> float:
     """Helper to safely parse added_time string to timestamp."""
     added_time_str = track_data.get('added_time')
@@ -55,6 +49,22 @@ def get_added_timestamp(track_data: dict) -> float:
             pass
     return 0
 
+def make_track_row(track_data: dict, original_index: int) -> dict:
+    """
+    Builds the model row for a playlist track with precomputed sort keys.
+    Size/modified come from TrackStatCache (None until the background refresh reports them),
+    so neither painting nor sorting touches the filesystem.
+    """
+    row = track_data.copy()
+    path = row.get('path', '')
+    row['original_index'] = original_index
+    row['name_key'] = os.path.basename(path).lower()
+    row['added_stamp'] = get_added_timestamp(track_data)
+    size_bytes, mod_stamp = TrackStatCache.instance().get(path) or (None, None)
+    row['size_bytes'] = size_bytes
+    row['mod_stamp'] = mod_stamp
+    return row
+
 def format_added_time(timestamp: float) -> str:
     """Helper to format timestamp from get_added_timestamp."""
     if not timestamp:
@@ -70,32 +80,32 @@ playlist_col_defs = [
         header="Filename",
         # Get filename from the 'path' in track_data dict
         data_key=lambda td: Path(td.get('path', '')).name,
-        sort_key=lambda td: Path(td.get('path', '')).name.lower(), # Sort by lowercased filename
+        sort_key='name_key', # Precomputed lowercased filename
         width=300, stretch=1, # Give it stretch factor
         tooltip_key='path' # Show full path in tooltip
     ),
     ColumnDefinition(
         header="Size",
-        data_key=lambda td: get_track_stat(td, 'size'),
+        data_key='size_bytes', # Filled from TrackStatCache
         display_formatter=format_file_size,
-        sort_key=lambda td: get_track_stat(td, 'size'), # Sort by raw bytes
+        sort_key='size_bytes', # Sort by raw bytes
         width=100,
         alignment=Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter,
         sort_role=Qt.ItemDataRole.EditRole # Use EditRole for sorting raw bytes
     ),
     ColumnDefinition(
         header="Modified",
-        data_key=lambda td: get_track_stat(td, 'modified'),
+        data_key='mod_stamp', # Filled from TrackStatCache
         display_formatter=format_modified_time, # Use existing formatter
-        sort_key=lambda td: get_track_stat(td, 'modified'), # Sort by raw timestamp
+        sort_key='mod_stamp', # Sort by raw timestamp
         width=150,
         sort_role=Qt.ItemDataRole.EditRole # Use EditRole for sorting timestamp
     ),
     ColumnDefinition(
         header="Date Added",
-        data_key=get_added_timestamp, # Use helper to get timestamp
+        data_key='added_stamp', # Parsed once in make_track_row
         display_formatter=format_added_time, # Use helper to format timestamp
-        sort_key=get_added_timestamp, # Sort by raw timestamp
+        sort_key='added_stamp', # Sort by raw timestamp
         width=150,
         sort_role=Qt.ItemDataRole.EditRole # Use EditRole for sorting timestamp
     ),
@@ -125,6 +135,21 @@ class PlaylistPlaymodeWidget(QWidget):
         self.current_playlist: Optional[Playlist] = None # Type hint
         self.model: Optional[FilePoolModel] = None # <-- Use FilePoolModel
         self.proxy_model: Optional[QSortFilterProxyModel] = None # Proxy model reference
+
+        # Background stat refresh for the Size/Modified columns
+        self._stat_refresher = TrackStatRefresher(self)
+        self._stat_refresher.stats_ready.connect(self._on_track_stats_ready)
+        self._pending_stats = {}
+        self._stat_flush_timer = QTimer(self)
+        self._stat_flush_timer.setSingleShot(True)
+        self._stat_flush_timer.setInterval(STAT_FLUSH_INTERVAL_MS)
+        self._stat_flush_timer.timeout.connect(self._flush_track_stats)
+
+        # Debounced track filter, applied through the model's search index
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._apply_track_filter)
         
         self.setLayout(QVBoxLayout(self))
         self.layout().setContentsMargins(0, 0, 0, 0)
@@ -193,6 +218,11 @@ class PlaylistPlaymodeWidget(QWidget):
         breadcrumb_layout.addWidget(self.playlist_name_label)
         breadcrumb_layout.addWidget(self.play_playlist_button) # Add the play button
         breadcrumb_layout.addStretch(1)  # Push content to the left
+
+        # Filter field on the right of the breadcrumb
+        self.search_field = SearchField(placeholder="Filter playlist...")
+        self.search_field.setMaximumWidth(250)
+        breadcrumb_layout.addWidget(self.search_field)
         
         # Position the breadcrumb at the very top
         self.breadcrumb_container.setGeometry(0, 0, self.width(), 32)
@@ -239,6 +269,7 @@ class PlaylistPlaymodeWidget(QWidget):
         self.tracks_table.delete_requested_from_playlist.connect(self._handle_delete_requested)
         # Connect sort indicator signal
         self.tracks_table.horizontalHeader().sortIndicatorChanged.connect(self._on_sort_changed)
+        self.search_field.textChanged.connect(lambda _text: self._search_timer.start())
     
     def _on_track_double_clicked(self, index: QModelIndex): # Takes QModelIndex
         """Handle double-click on a track item to play it."""
@@ -249,7 +280,7 @@ class PlaylistPlaymodeWidget(QWidget):
         source_object = self.proxy_model.data(index, Qt.ItemDataRole.UserRole)
         if source_object and isinstance(source_object, dict):
             track_path = source_object.get('path')
-            if track_path and track_path in (t.get('path') for t in self.current_playlist.tracks):
+            if track_path and self.current_playlist.contains_track(track_path):
                 player_state.set_current_playlist(self.current_playlist)
                 self.track_selected_for_playback.emit(track_path)
             else:
@@ -269,6 +300,30 @@ class PlaylistPlaymodeWidget(QWidget):
         # Update content area size
         self.content_widget.setGeometry(0, 32, width, height - 32)
     
+    def show_loading(self, playlist: Playlist):
+        """
+        Show the playlist's name with a placeholder while its tracks load in the background.
+        The previously shown playlist is detached so nothing edits or plays it until load_playlist().
+        """
+        self._stat_refresher.cancel()
+        self._stat_flush_timer.stop()
+        self._pending_stats = {}
+        self.current_playlist = None
+        self.model = None
+        self.proxy_model = None
+        self.tracks_table.setModel(None)
+        self._set_editing_enabled(False)
+        self.playlist_name_label.setText(playlist.name if playlist.name else "Untitled Playlist")
+        self.tracks_table.hide()
+        self.empty_label.setText(f"Loading {playlist.track_count} tracks...")
+        self.empty_label.show()
+
+    def _set_editing_enabled(self, enabled: bool):
+        """Enables/disables adding from the pool, playing the playlist and dropping files."""
+        self.selection_pool_widget.setEnabled(enabled)
+        self.play_playlist_button.setEnabled(enabled)
+        self.setAcceptDrops(enabled)
+
     def load_playlist(self, playlist: Playlist):
         """
         Load a playlist into the view and display its tracks.
@@ -276,6 +331,9 @@ class PlaylistPlaymodeWidget(QWidget):
         Args:
             playlist (Playlist): The playlist to display and play
         """
+        self._stat_refresher.cancel()
+        self._pending_stats = {}
+        self._set_editing_enabled(playlist is not None)
         if playlist is None:
             self.current_playlist = None
             self.model = None
@@ -287,18 +345,14 @@ class PlaylistPlaymodeWidget(QWidget):
             return
             
         self.current_playlist = playlist
+        self.empty_label.setText("No tracks in this playlist")
         display_name = playlist.name if playlist.name else "Untitled Playlist"
         self.playlist_name_label.setText(display_name)
         logger = Logger.instance() # Get logger instance
         logger.info(self.__class__.__name__, f"[PlayMode] Loading playlist '{display_name}' into view.") # Log playlist name
         
-        # --- Prepare data for the model, adding original index --- 
-        source_track_data = []
-        for index, track_dict in enumerate(playlist.tracks):
-            # Create a copy and add the original index
-            model_track_dict = track_dict.copy()
-            model_track_dict['original_index'] = index
-            source_track_data.append(model_track_dict)
+        # --- Prepare data for the model: original index, sort keys, cached stats --- 
+        source_track_data = [make_track_row(track_dict, index) for index, track_dict in enumerate(playlist.tracks)]
         # --------------------------------------------------------
 
         if not source_track_data: # Check the prepared list
@@ -318,6 +372,8 @@ class PlaylistPlaymodeWidget(QWidget):
         
         # Set up proxy model and link to table
         self.proxy_model = QSortFilterProxyModel()
+        # Sort on the precomputed raw keys (EditRole) instead of the display strings
+        self.proxy_model.setSortRole(Qt.ItemDataRole.EditRole)
         self.proxy_model.setSourceModel(self.model)
         self.tracks_table.setModel(self.proxy_model)
         # BaseTableView handles loading saved state (widths, sort) in setModel
@@ -326,6 +382,30 @@ class PlaylistPlaymodeWidget(QWidget):
         # --- Explicitly update playlist sort order after initial load & sort --- 
         self._update_playlist_model_sort_order()
         # ---------------------------------------------------------------------
+        # Keep the current filter text across playlist switches
+        if self.search_field.text().strip():
+            self._apply_track_filter()
+
+        # Refresh file stats once per load in the background
+        self._stat_refresher.refresh([row['path'] for row in source_track_data if row.get('path')])
+
+    def _on_track_stats_ready(self, stats: dict):
+        """Collects stat results; the model is updated in batches by _flush_track_stats."""
+        self._pending_stats.update(stats)
+        if not self._stat_flush_timer.isActive():
+            self._stat_flush_timer.start()
+
+    def _flush_track_stats(self):
+        if not self.model or not self._pending_stats:
+            self._pending_stats = {}
+            return
+        updates = {path: {'size_bytes': size_bytes, 'mod_stamp': mod_stamp}
+                   for path, (size_bytes, mod_stamp) in self._pending_stats.items()}
+        self._pending_stats = {}
+        if not self.model.update_objects_by_path(updates):
+            return # Rows already held these values
+        # A resort may have moved rows; keep the playback order in line with the view
+        self._update_playlist_model_sort_order()
 
     def _handle_delete_requested(self, objects_to_delete: List[Any]):
         """Handles the delete request signal from PlaylistTableView."""
@@ -342,17 +422,19 @@ class PlaylistPlaymodeWidget(QWidget):
             if isinstance(track_obj, dict):
                 path = track_obj.get('path')
                 if path:
-                    paths_to_remove.append(path)
-                    # Try removing from the playlist DATA model
-                    if not self.current_playlist.remove_track(path):
+                    if not self.current_playlist.contains_track(path):
                         successfully_removed_from_playlist_obj = False
                         logger.warning(self.__class__.__name__, f"[PlayMode] Path '{path}' requested for delete, but not found in playlist object data.")
+                    else:
+                        paths_to_remove.append(path)
                 else:
                      successfully_removed_from_playlist_obj = False # Track object had no path
                      logger.warning(self.__class__.__name__, f"[PlayMode] Track object requested for delete missing 'path': {track_obj}")
             else:
                 successfully_removed_from_playlist_obj = False # Item wasn't a dict
                 logger.warning(self.__class__.__name__, f"[PlayMode] Item requested for delete was not a dictionary: {track_obj}")
+        # Remove from the playlist DATA model in one pass
+        self.current_playlist.remove_tracks(paths_to_remove)
 
         # 2. Save the Playlist (only if all removals from Playlist object seemed successful)
         if successfully_removed_from_playlist_obj:
@@ -380,7 +462,7 @@ class PlaylistPlaymodeWidget(QWidget):
              logger.error(self.__class__.__name__, "[PlayMode] Could not find remove_rows_by_objects method on model to update view.")
              
         # Update empty message if needed
-        if target_model and target_model.rowCount() == 0: # Check model row count AFTER potential removal
+        if target_model and target_model.rowCount() == 0 and not target_model.is_path_filtered(): # Check model row count AFTER potential removal
             self.tracks_table.hide()
             self.empty_label.show()
 
@@ -397,15 +479,16 @@ class PlaylistPlaymodeWidget(QWidget):
         paths_actually_added = []
         
         for track_path in tracks_to_add:
-            if self.current_playlist.add_track(track_path):
-                 # Create the dictionary expected by the model/column defs
-                 new_track_objects.append({
-                     'path': track_path,
-                     'added_time': datetime.datetime.now().isoformat() # Add current time
-                     # Other fields (filename, size, modified) will be derived by helpers/lambdas
-                 })
+            if not self.current_playlist.contains_track(track_path) and track_path not in paths_actually_added:
                  paths_actually_added.append(track_path)
-                 added_to_playlist_count += 1
+        added_to_playlist_count = self.current_playlist.add_tracks(paths_actually_added)
+        added_time_iso = datetime.datetime.now().isoformat()
+        for track_path in paths_actually_added:
+             # Create the dictionary expected by the model/column defs
+             new_track_objects.append(make_track_row(
+                 {'path': track_path, 'added_time': added_time_iso},
+                 self.current_playlist.index_of(track_path)
+             ))
             
         if added_to_playlist_count > 0:
             save_success = self.current_playlist.save()
@@ -424,6 +507,10 @@ class PlaylistPlaymodeWidget(QWidget):
                  Logger.instance().error(caller="PlayMode", msg="[PlayMode] ERROR: Failed to insert rows into model.")
                  # UI might be out of sync with playlist file
             
+            if self.search_field.text().strip():
+                self._search_timer.start() # Show new tracks that match the filter text
+            # Stat the new tracks in the background
+            self._stat_refresher.add(paths_actually_added)
             # Remove from selection pool
             self.selection_pool_widget.remove_tracks(paths_actually_added)
             
@@ -570,6 +657,18 @@ class PlaylistPlaymodeWidget(QWidget):
         Logger.instance().debug(caller="PlayMode", msg=f"[PlayMode] Filtered duplicates, {len(files_to_add)} files remain to be added.")
         return files_to_add
 
+    def _apply_track_filter(self):
+        """Filters the track table to files whose name or folders contain every word of the filter text."""
+        if not self.model:
+            return
+        query = self.search_field.text().strip()
+        if query:
+            self.model.apply_path_filter(self.model.search_paths(query), normalized=True)
+        elif self.model.is_path_filtered():
+            self.model.clear_path_filter()
+            # Sorting may have changed while filtered; re-read the full visual order
+            self._update_playlist_model_sort_order()
+
     def _on_sort_changed(self, logicalIndex: int, order: Qt.SortOrder):
         """Slot connected to the header's sortIndicatorChanged signal."""
         # Simply call the helper method to update the playlist model
@@ -580,20 +679,22 @@ class PlaylistPlaymodeWidget(QWidget):
         """Gets the current visual order and updates the Playlist object."""
         if not self.current_playlist or not self.tracks_table.model():
             return
+        if self.model and self.model.is_path_filtered():
+            return # Only part of the playlist is visible; resynced when the filter is cleared
 
         # Get the source objects in the current visual order
         ordered_track_objects = self.tracks_table.get_visible_items_data_in_order()
 
-        # Extract the original indices from these objects
-        sorted_original_indices = []
+        # Extract the paths from these objects; unlike row indices they survive adds/removes
+        sorted_paths = []
         for track_obj in ordered_track_objects:
-            if isinstance(track_obj, dict) and 'original_index' in track_obj:
-                sorted_original_indices.append(track_obj['original_index'])
+            if isinstance(track_obj, dict) and track_obj.get('path'):
+                sorted_paths.append(track_obj['path'])
             else:
                 # This indicates a problem with data preparation or retrieval
-                Logger.instance().warning(caller="PlayMode", msg=f"[PlayMode] Warning: Could not find 'original_index' in ordered track object during sort update: {track_obj}")
+                Logger.instance().warning(caller="PlayMode", msg=f"[PlayMode] Warning: Could not find 'path' in ordered track object during sort update: {track_obj}")
 
         # Update the Playlist object with the new order
-        if sorted_original_indices:
-            self.current_playlist.update_sort_order(sorted_original_indices)
+        if sorted_paths:
+            self.current_playlist.update_sort_order_by_paths(sorted_paths)
         # else: # No need to warn if list is empty, just means table was empty
@@ -4,14 +4,14 @@ import os
 import time # Import time for throttling
 import datetime
 from pathlib import Path
-from typing import List, Optional, Any # Added Any
+from typing import List, Optional, Any, Set # Added Any
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
     QFileDialog, QAbstractItemView, QMenu, QApplication,
     QComboBox, QMessageBox
 )
-from PyQt6.QtCore import Qt, pyqtSignal, QSize, QObject, QThread, QSortFilterProxyModel, QModelIndex
+from PyQt6.QtCore import Qt, pyqtSignal, QSize, QObject, QThread, QSortFilterProxyModel, QModelIndex, QRunnable, QThreadPool, QTimer
 from PyQt6.QtGui import QCursor, QIcon, QMovie # Added QMovie for spinner
 import qtawesome as qta
 
@@ -20,10 +20,12 @@ from qt_base_app.models.settings_manager import SettingsManager, SettingType
 from music_player.ui.components.search_field import SearchField
 from music_player.ui.components.icon_button import IconButton
 from music_player.ai.groq_music_model import GroqMusicModel
+from music_player.ai.prefilter import prefilter_filenames
 
 # Import BaseTable components
 from music_player.ui.components.base_table import BaseTableView, ColumnDefinition
 from music_player.models.file_pool_model import FilePoolModel # <-- ADD
+from music_player.models.track_stat_cache import TrackStatCache, TrackStatRefresher
 
 # Define common audio file extensions
 AUDIO_EXTENSIONS = {
@@ -31,6 +33,12 @@ AUDIO_EXTENSIONS = {
     '.opus', '.aiff', '.ape', '.mpc'
 }
 
+# Folder scans stream results to the pool in batches of this many files (or sooner, see below)
+SCAN_BATCH_SIZE = 200
+SCAN_BATCH_INTERVAL_S = 0.25
+# Filter text is applied this long after the last keystroke
+SEARCH_DEBOUNCE_MS = 150
+
 def format_file_size(size_bytes):
     """Format file size from bytes to human-readable format"""
     if size_bytes is None: return "Unknown"
@@ -106,9 +114,17 @@ class ClassificationWorker(QObject):
             def cancellation_check():
                 return self.is_cancelled
 
+            # Decide what local prefilter rules can, only send the ambiguous rest to the model
+            matched, rejected, ambiguous = prefilter_filenames(self.filenames, self.prompt_config)
+            if matched or rejected:
+                Logger.instance().info(caller="Worker", msg=f"[Worker] Prefilter decided {len(matched)} yes / {len(rejected)} no locally; sending {len(ambiguous)} to the model.")
+            if not ambiguous:
+                self.finished.emit([] if self.is_cancelled else matched)
+                return
+
             # Call classify_filenames, passing the necessary callbacks
-            results = self.groq_model.classify_filenames(
-                self.filenames, 
+            results = matched + self.groq_model.classify_filenames(
+                ambiguous, 
                 self.prompt_config,
                 worker_cancelled_check=cancellation_check,
                 progress_callback=progress_handler,
@@ -130,6 +146,75 @@ class ClassificationWorker(QObject):
             # Ensure finished is emitted even on unhandled exception, potentially with empty results
             self.finished.emit([]) # Emit empty list on major error
 
+class FolderScanSignals(QObject):
+    """Signals for the folder scan worker"""
+    batch_ready = pyqtSignal(int, list)        # scan id, list of track dicts ('path', 'size_bytes', 'mod_stamp')
+    progress = pyqtSignal(int, int, int)       # scan id, folders scanned, audio files found
+    finished = pyqtSignal(int, int, int, bool) # scan id, audio files found, hidden files deleted, cancelled
+
+class FolderScanWorker(QRunnable):
+    """
+    Recursively scans a folder for audio files with os.scandir, stating each file once,
+    and streams the results back in batches so the pool fills while the scan runs.
+    Files already in the current playlist are skipped; macOS '._' resource-fork files
+    under 1 KB are deleted, as the synchronous scan used to do.
+    """
+    def __init__(self, scan_id: int, directory: str, exclude_paths: frozenset):
+        super().__init__()
+        self.scan_id = scan_id
+        self.directory = directory
+        self.exclude_paths = exclude_paths
+        self.signals = FolderScanSignals()
+        self.is_cancelled = False
+
+    def run(self):
+        found_count, deleted_count, folder_count = 0, 0, 0
+        batch = []
+        last_emit = time.monotonic()
+        pending_dirs = [self.directory]
+        while pending_dirs and not self.is_cancelled:
+            current_dir = pending_dirs.pop()
+            try:
+                with os.scandir(current_dir) as entries:
+                    for entry in entries:
+                        if self.is_cancelled:
+                            break
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                pending_dirs.append(entry.path)
+                                continue
+                            if os.path.splitext(entry.name)[1].lower() not in AUDIO_EXTENSIONS:
+                                continue
+                            norm_path = os.path.normpath(entry.path)
+                            if norm_path in self.exclude_paths:
+                                continue
+                            stats = entry.stat()
+                            if entry.name.startswith('._') and stats.st_size < 1024:
+                                try:
+                                    os.remove(entry.path)
+                                    deleted_count += 1
+                                except OSError: pass
+                                continue
+                            found_count += 1
+                            batch.append({'path': norm_path, 'size_bytes': stats.st_size, 'mod_stamp': stats.st_mtime})
+                        except OSError:
+                            continue # Ignore errors for individual files
+            except OSError as e:
+                Logger.instance().warning(caller="FolderScanWorker", msg=f"Cannot scan '{current_dir}': {e}")
+            folder_count += 1
+
+            now = time.monotonic()
+            if batch and (len(batch) >= SCAN_BATCH_SIZE or now - last_emit >= SCAN_BATCH_INTERVAL_S):
+                self.signals.batch_ready.emit(self.scan_id, batch)
+                batch = []
+            if now - last_emit >= SCAN_BATCH_INTERVAL_S:
+                self.signals.progress.emit(self.scan_id, folder_count, found_count)
+                last_emit = now
+
+        if batch and not self.is_cancelled:
+            self.signals.batch_ready.emit(self.scan_id, batch)
+        self.signals.finished.emit(self.scan_id, found_count, deleted_count, self.is_cancelled)
+
 class SelectionPoolWidget(QWidget):
     """
     Widget representing the Selection Pool area in Play Mode.
@@ -165,6 +250,25 @@ class SelectionPoolWidget(QWidget):
         # Model references - Type hint changed
         self.model: Optional[FilePoolModel] = None # <-- Use FilePoolModel type hint
         self.proxy_model: Optional[QSortFilterProxyModel] = None
+
+        # Folder scanning runs on its own single-thread pool; batches from older scans are dropped
+        self._scan_pool = QThreadPool(self)
+        self._scan_pool.setMaxThreadCount(1)
+        self._scan_worker: Optional[FolderScanWorker] = None
+        self._scan_id = 0
+        self._scan_added_count = 0
+        self._scan_dir_name = ""
+
+        # Stats for tracks added by path (drag & drop, deletion from playlist) are filled in off-thread
+        self._stat_refresher = TrackStatRefresher(self)
+        self._stat_refresher.stats_ready.connect(self._on_track_stats_ready)
+
+        # Search text and AI results are combined into one model path filter
+        self._ai_filter_paths: Optional[Set[str]] = None
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._apply_pool_filters)
         
         self._setup_ui()
         self._connect_signals()
@@ -193,6 +297,7 @@ class SelectionPoolWidget(QWidget):
         header_layout.setSpacing(8)
         
         title_label = QLabel("Selection Pool")
+        self.title_label = title_label
         title_label.setStyleSheet(f"""
             color: {self.theme.get_color('text', 'secondary')};
             font-weight: bold;
@@ -307,7 +412,7 @@ class SelectionPoolWidget(QWidget):
         self.add_selected_button.clicked.connect(self._emit_add_selected)
         self.pool_table.customContextMenuRequested.connect(self._show_context_menu)
         # Connect the search field signal
-        self.search_field.textChanged.connect(self._filter_pool_table_proxy)
+        self.search_field.textChanged.connect(lambda _text: self._search_timer.start())
         # Connect double-click signal
         self.pool_table.doubleClicked.connect(self._on_item_double_clicked)
         # --- Connect AI signals if enabled --- 
@@ -551,15 +656,11 @@ class SelectionPoolWidget(QWidget):
 
         # Reset the source model with the filtered list
         if self.model:
-            # === Simply call the model's filter method === 
-            self.model.apply_path_filter(set(matching_paths))
-            # ============================================
-            # The model's override handles the path set update
-            # View updates automatically because apply_path_filter calls begin/endResetModel
-            # Need to check row count *after* filtering
-            filtered_row_count = self.model.rowCount() # Get count after filter
+            # Combined with the search text by _apply_pool_filters
+            self._ai_filter_paths = {os.path.normpath(p) for p in matching_paths}
+            self._apply_pool_filters()
             total_row_count = len(self.model.get_all_paths()) # Get total from source
-            if filtered_row_count < total_row_count:
+            if len(self._ai_filter_paths) < total_row_count:
                  self.ai_clear_filter_button.show()
             else:
                  self.ai_clear_filter_button.hide()
@@ -581,9 +682,7 @@ class SelectionPoolWidget(QWidget):
         Logger.instance().error(caller="SelectionPool", msg=f"[SelectionPool] Classification error signal received: {error_message}")
         self.progress_overlay.hide()
         QMessageBox.critical(self, "AI Classification Error", error_message)
-        # Ensure filter is cleared on error (existing logic)
-        if self.model:
-            self.model.clear_path_filter()
+        # Ensure the AI part of the filter is cleared on error
         self._clear_ai_filter(show_message=False) # Keep this to hide button maybe? Or remove?
                                                    # Let's remove it, model.clear_path_filter handles state.
         # UI reset is handled by _clear_thread_references
@@ -596,10 +695,9 @@ class SelectionPoolWidget(QWidget):
     def _clear_ai_filter(self, show_message=True): 
         if show_message:
             Logger.instance().debug(caller="SelectionPool", msg="[SelectionPool] Clearing AI filter.")
-        # === Simply call the model's clear method ===
-        if self.model:
-             self.model.clear_path_filter()
-        # ==========================================
+        # Drop the AI results; any search text filter stays applied
+        self._ai_filter_paths = None
+        self._apply_pool_filters()
         # Use the stored unfiltered list if available
         # objects_to_restore = self._unfiltered_pool_objects
         # if objects_to_restore is None:
@@ -671,41 +769,33 @@ class SelectionPoolWidget(QWidget):
             Logger.instance().debug(caller="SelectionPool", msg="[SelectionPool] add_tracks: No new paths to add.")
             return # Nothing new to add
 
-        # Create objects only for the new paths
+        # Create objects only for the new paths, using cached stats; the rest are stated in the background
+        cached_stats = TrackStatCache.instance().get_many(new_paths_normalized)
         new_track_objects = []
+        paths_to_stat = []
         for norm_path in new_paths_normalized:
-             # --- Pre-fetch stats --- 
-             size_bytes: Optional[int] = None
-             mod_stamp: Optional[float] = None
-             try:
-                 # Check existence before statting
-                 p = Path(norm_path)
-                 if p.exists():
-                     stats = p.stat()
-                     size_bytes = stats.st_size
-                     mod_stamp = stats.st_mtime
-                 else:
-                      Logger.instance().warning(caller="SelectionPool", msg=f"[SelectionPool] Warning: File not found when adding to pool: {norm_path}")
-             except Exception as e:
-                 Logger.instance().error(caller="SelectionPool", msg=f"[SelectionPool] Error stating file {norm_path} on add: {e}")
-             # -----------------------
+             size_bytes, mod_stamp = cached_stats.get(norm_path, (None, None))
+             if norm_path not in cached_stats:
+                 paths_to_stat.append(norm_path)
              new_track_objects.append({
                  'path': norm_path,
-                 'size_bytes': size_bytes, # Store fetched size (or None)
-                 'mod_stamp': mod_stamp    # Store fetched timestamp (or None)
+                 'size_bytes': size_bytes, # Cached size (or None until stated)
+                 'mod_stamp': mod_stamp    # Cached timestamp (or None until stated)
              })
 
-        if not new_track_objects:
-             # This case should not happen if new_paths_normalized was non-empty
-             Logger.instance().debug(caller="SelectionPool", msg="[SelectionPool] add_tracks: No track objects created despite new paths.")
-             return 
+        self._insert_track_objects(new_track_objects)
+        if paths_to_stat:
+            self._stat_refresher.add(paths_to_stat)
 
+    def _insert_track_objects(self, new_track_objects: List[dict]):
+        """Adds prepared track dicts to the pool model, creating the model on first use."""
         if self.model is None:
             # First time adding: Create FilePoolModel
             Logger.instance().debug(caller="SelectionPool", msg="[SelectionPool] First tracks added, creating FilePoolModel.")
             self.model = FilePoolModel(source_objects=new_track_objects, column_definitions=pool_col_defs)
             self.proxy_model = QSortFilterProxyModel()
             self.proxy_model.setSourceModel(self.model)
+            self.proxy_model.setSortRole(Qt.ItemDataRole.EditRole) # Sort on cached sort keys, not display strings
             self.pool_table.setModel(self.proxy_model)
             self.pool_table.resizeRowsToContents()
         else:
@@ -713,7 +803,29 @@ class SelectionPoolWidget(QWidget):
             Logger.instance().debug(caller="SelectionPool", msg=f"[SelectionPool] Adding {len(new_track_objects)} tracks to existing model.")
             insert_row_index = self.model.rowCount() # Get row count from potentially filtered model
             if not self.model.insert_rows(insert_row_index, new_track_objects):
-                 Logger.instance().error(caller="SelectionPool", msg="[SelectionPool] Error inserting rows into model.")
+                 Logger.instance().debug(caller="SelectionPool", msg="[SelectionPool] No rows inserted (all paths already in pool).")
+            elif self.search_field.text().strip():
+                 self._search_timer.start() # Let new tracks matching the search text show up
+
+    def _apply_pool_filters(self):
+        """Applies the search text (via the model's search index) and any AI results as one path filter."""
+        if not self.model:
+            return
+        query = self.search_field.text().strip()
+        allowed: Optional[Set[str]] = self.model.search_paths(query) if query else None
+        if self._ai_filter_paths is not None:
+            allowed = self._ai_filter_paths if allowed is None else allowed & self._ai_filter_paths
+        if allowed is None:
+            self.model.clear_path_filter()
+        else:
+            self.model.apply_path_filter(allowed, normalized=True)
+
+    def _on_track_stats_ready(self, stats: dict):
+        """Fills in size/modified columns once background stats arrive."""
+        if self.model:
+            self.model.update_objects_by_path({
+                path: {'size_bytes': size, 'mod_stamp': mtime} for path, (size, mtime) in stats.items()
+            })
 
     def get_selected_tracks(self) -> List[str]:
         """
@@ -752,6 +864,9 @@ class SelectionPoolWidget(QWidget):
         """
         Removes all items from the selection pool table and internal set.
         """
+        self._stat_refresher.cancel()
+        self._ai_filter_paths = None
+        self.ai_clear_filter_button.hide()
         if self.model:
             Logger.instance().debug(caller="SelectionPool", msg="[SelectionPool] Clearing model.")
             self.model.set_source_objects([])
@@ -761,9 +876,15 @@ class SelectionPoolWidget(QWidget):
 
     def _browse_folder(self):
         """
-        Opens a directory dialog and scans the selected folder for media files.
+        Opens a directory dialog and scans the selected folder for media files
+        in the background, streaming results into the pool as they are found.
+        Clicking the button again while a scan runs cancels it.
         The last used directory is remembered for future sessions.
         """
+        if self._scan_worker is not None:
+            self._cancel_folder_scan()
+            return
+
         # Get settings instance here
         settings = SettingsManager.instance()
         # Get the last used directory from settings, or default to user's home
@@ -775,79 +896,86 @@ class SelectionPoolWidget(QWidget):
             str(last_dir),  # Convert Path to string for QFileDialog
             QFileDialog.Option.ShowDirsOnly
         )
-        
-        if directory:
-            # --- Show Overlay --- 
-            self.progress_label.setText(f"Scanning {os.path.basename(directory)}...")
-            self.progress_overlay.setGeometry(self.pool_table.geometry())
-            self.progress_overlay.raise_()
-            self.progress_overlay.show()
-            QApplication.processEvents() # Allow UI update
-            # ------------------
-            try:
-                # Save the selected directory for next time
-                settings.set('playlists/last_browse_dir', directory, SettingType.PATH)
-                settings.sync()  # Ensure settings are saved immediately
-                
-                # --- Get current playlist tracks (if available) --- 
-                current_playlist_tracks_set = set()
-                try:
-                    playlist_playmode_widget = self.parentWidget().parentWidget()
-                    if hasattr(playlist_playmode_widget, 'current_playlist') and playlist_playmode_widget.current_playlist:
-                        current_playlist_tracks_set = set(os.path.normpath(p.get('path','')) for p in playlist_playmode_widget.current_playlist.tracks if p.get('path'))
-                except AttributeError:
-                    pass # Ignore if parent cannot be accessed
-
-                found_files_initial = []
-                try:
-                    for root, _, files in os.walk(directory):
-                        for filename in files:
-                            if Path(filename).suffix.lower() in AUDIO_EXTENSIONS:
-                                full_path = os.path.join(root, filename)
-                                found_files_initial.append(full_path)
-                except Exception as e:
-                    Logger.instance().error(caller="selection_pool", msg=f"Error scanning directory '{directory}': {e}")
-                    QMessageBox.warning(self, "Scan Error", f"Could not fully scan directory:\n{e}")
-                    # Don't return yet, hide overlay in finally
-
-                # --- Filter and Delete Hidden/Small Files ---
-                files_to_add_to_pool = []
-                deleted_count = 0
-                KB_SIZE = 1024
-                # --- Update Overlay Text for Processing --- 
-                self.progress_label.setText(f"Processing {len(found_files_initial)} found items...")
-                QApplication.processEvents() # Allow UI update
-                # -----------------------------------------
-                for file_path_str in found_files_initial:
-                    try:
-                        p = Path(file_path_str)
-                        filename = p.name
-                        norm_path = os.path.normpath(file_path_str)
-                        if norm_path in current_playlist_tracks_set:
-                            continue
-                        file_size = p.stat().st_size
-                        if filename.startswith('._') and file_size < KB_SIZE:
-                            try:
-                                os.remove(file_path_str)
-                                deleted_count += 1
-                            except OSError: pass
-                        else:
-                            files_to_add_to_pool.append(file_path_str)
-                    except Exception: pass # Ignore errors for individual files
-
-                if deleted_count > 0:
-                    Logger.instance().info(caller="SelectionPool", msg=f"[SelectionPool] Finished cleanup. Deleted {deleted_count} hidden/small files.")
-                    
-                # Add the filtered list to the pool
-                if files_to_add_to_pool:
-                    self.add_tracks(files_to_add_to_pool)
-                elif not found_files_initial:
-                    Logger.instance().debug(caller="selection_pool", msg=f"No audio files found in '{directory}'")
-            finally:
-                # --- Hide Overlay --- 
-                self.progress_overlay.hide()
-                # ------------------
-                
+        if not directory:
+            return
+
+        # Save the selected directory for next time
+        settings.set('playlists/last_browse_dir', directory, SettingType.PATH)
+        settings.sync()  # Ensure settings are saved immediately
+
+        # --- Get current playlist tracks (if available) --- 
+        current_playlist_tracks_set = frozenset()
+        try:
+            playlist_playmode_widget = self.parentWidget().parentWidget()
+            if hasattr(playlist_playmode_widget, 'current_playlist') and playlist_playmode_widget.current_playlist:
+                current_playlist_tracks_set = frozenset(os.path.normpath(p.get('path','')) for p in playlist_playmode_widget.current_playlist.tracks if p.get('path'))
+        except AttributeError:
+            pass # Ignore if parent cannot be accessed
+
+        self._scan_id += 1
+        self._scan_added_count = 0
+        self._scan_dir_name = os.path.basename(directory) or directory
+        worker = FolderScanWorker(self._scan_id, directory, current_playlist_tracks_set)
+        worker.signals.batch_ready.connect(self._on_scan_batch_ready)
+        worker.signals.progress.connect(self._on_scan_progress)
+        worker.signals.finished.connect(self._on_scan_finished)
+        self._scan_worker = worker
+
+        # --- Show Overlay until the first batch arrives --- 
+        self.progress_label.setText(f"Scanning {self._scan_dir_name}...")
+        self.progress_overlay.setGeometry(self.pool_table.geometry())
+        self.progress_overlay.raise_()
+        self.progress_overlay.show()
+        self.browse_button.setIcon(qta.icon('fa5s.stop'))
+        self.browse_button.setToolTip("Stop scanning")
+        self._scan_pool.start(worker)
+
+    def _cancel_folder_scan(self):
+        """Stops the running folder scan; tracks already added stay in the pool."""
+        if self._scan_worker is not None:
+            Logger.instance().debug(caller="SelectionPool", msg="[SelectionPool] Cancelling folder scan.")
+            self._scan_worker.is_cancelled = True
+            self._scan_id += 1 # Drop any batches still queued for delivery
+            self._scan_worker = None
+        self._reset_scan_ui()
+
+    def _reset_scan_ui(self):
+        self.progress_overlay.hide()
+        self.title_label.setText("Selection Pool")
+        self.browse_button.setIcon(qta.icon('fa5s.folder-open'))
+        self.browse_button.setToolTip("Browse folder to add tracks")
+
+    def _on_scan_batch_ready(self, scan_id: int, track_objects: list):
+        if scan_id != self._scan_id:
+            return
+        for obj in track_objects:
+            TrackStatCache.instance().prime(obj['path'], obj['size_bytes'], obj['mod_stamp'])
+        if self.model:
+            track_objects = [obj for obj in track_objects if not self.model.contains_path(obj['path'])]
+        if track_objects:
+            self._insert_track_objects(track_objects)
+            self._scan_added_count += len(track_objects)
+        self.progress_overlay.hide()
+
+    def _on_scan_progress(self, scan_id: int, folder_count: int, found_count: int):
+        if scan_id != self._scan_id:
+            return
+        status = f"Scanning {self._scan_dir_name}: {found_count} found, {self._scan_added_count} added ({folder_count} folders)"
+        self.progress_label.setText(status)
+        self.title_label.setText(f"Selection Pool - {status}")
+
+    def _on_scan_finished(self, scan_id: int, found_count: int, deleted_count: int, cancelled: bool):
+        if scan_id != self._scan_id:
+            return
+        self._scan_worker = None
+        self._reset_scan_ui()
+        if deleted_count > 0:
+            Logger.instance().info(caller="SelectionPool", msg=f"[SelectionPool] Finished cleanup. Deleted {deleted_count} hidden/small files.")
+        if found_count == 0:
+            Logger.instance().debug(caller="selection_pool", msg=f"No audio files found in '{self._scan_dir_name}'")
+        else:
+            Logger.instance().info(caller="SelectionPool", msg=f"[SelectionPool] Scan of '{self._scan_dir_name}' finished: {found_count} found, {self._scan_added_count} added.")
+
     def _emit_add_selected(self):
         """
         Emits the signal to add the selected tracks to the main playlist.
@@ -857,15 +985,3 @@ class SelectionPoolWidget(QWidget):
         if selected_paths:
             self.add_selected_requested.emit(selected_paths)
 
-    def _filter_pool_table_proxy(self, text: str):
-        """Filters the pool table using the proxy model."""
-        if self.proxy_model:
-            search_text = text.strip() # No need for lower here if case-insensitive
-            # Use setFilterRegularExpression for more flexibility, though setFilterFixedString is simpler
-            # For basic contains, regex is fine. Escape special chars if needed.
-            # Using regex allows multiple terms maybe? Let's stick to simple contains for now.
-            # QSortFilterProxyModel uses QRegularExpression which handles basic patterns well.
-            self.proxy_model.setFilterRegularExpression(search_text)
-        else:
-             Logger.instance().debug(caller="SelectionPool", msg="[SelectionPool] Cannot filter: Proxy model not available.")
-
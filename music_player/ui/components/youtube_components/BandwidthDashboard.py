@@ -0,0 +1,56 @@
+"""
+Compact bandwidth/ETA readout for the download queue header.
+"""
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel
+from PyQt6.QtCore import Qt
+
+from music_player.models.CLIDownloadWorker import format_bytes, format_eta
+
+
+class BandwidthDashboard(QWidget):
+    """
+    Shows total throughput, active/queued counts and the queue-wide ETA in one line.
+    The tooltip breaks the throughput down per host and per download.
+
+    Fed by DownloadManager.bandwidth_updated (a BandwidthSnapshot once per second).
+    """
+
+    def __init__(self, download_manager, parent=None):
+        """Initialize the dashboard and subscribe to the manager's bandwidth updates."""
+        super().__init__(parent)
+        self.download_manager = download_manager
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(10, 0, 10, 0)
+
+        self.summary_label = QLabel("Idle")
+        self.summary_label.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter)
+        self.summary_label.setStyleSheet("color: #AAAAAA;")
+        layout.addWidget(self.summary_label)
+
+        self.download_manager.bandwidth_updated.connect(self.update_snapshot)
+
+    def update_snapshot(self, snapshot):
+        """Render a BandwidthSnapshot."""
+        if not snapshot.active_count:
+            self.summary_label.setText("Idle")
+            self.setToolTip("")
+            return
+
+        eta_text = format_eta(snapshot.queue_eta) if snapshot.queue_eta is not None else "--:--"
+        self.summary_label.setText(
+            f"↓ {format_bytes(snapshot.total_rate)}/s · "
+            f"{snapshot.active_count} active · {snapshot.queued_count} queued · "
+            f"Queue ETA {eta_text}"
+        )
+
+        lines = ["Per host:"]
+        for host, rate in sorted(snapshot.host_rates.items(), key=lambda kv: -kv[1]):
+            lines.append(f"  {host}: {format_bytes(rate)}/s")
+        lines.append("Per download:")
+        for url, rate in sorted(snapshot.worker_rates.items(), key=lambda kv: -kv[1]):
+            title = self.download_manager.get_title(url) or url
+            lines.append(f"  {title}: {format_bytes(rate)}/s")
+        if snapshot.remaining_bytes is not None:
+            lines.append(f"Remaining: ~{format_bytes(snapshot.remaining_bytes)}")
+        self.setToolTip("\n".join(lines))
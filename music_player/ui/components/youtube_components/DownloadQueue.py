@@ -13,6 +13,7 @@ import os
 from .FlowLayout import FlowLayout
 from music_player.models import DownloadManager
 from .YoutubeProgress import YoutubeProgress
+from .BandwidthDashboard import BandwidthDashboard
 # Import SettingsManager and relevant keys/types
 from qt_base_app.models.settings_manager import SettingsManager, SettingType
 from music_player.models.settings_defs import YT_MAX_CONCURRENT_KEY, DEFAULT_YT_MAX_CONCURRENT
@@ -59,6 +60,10 @@ class DownloadQueue(QScrollArea):
         queue_label.setStyleSheet("font-weight: bold;")
         header_layout.addWidget(queue_label)
         
+        # Aggregate throughput and queue ETA
+        self.bandwidth_dashboard = BandwidthDashboard(self.download_manager)
+        header_layout.addWidget(self.bandwidth_dashboard)
+        
         # Concurrent downloads control
         concurrent_layout = QHBoxLayout()
         concurrent_label = QLabel("Max Concurrent:")
@@ -83,6 +88,11 @@ class DownloadQueue(QScrollArea):
         self.clear_completed_button.clicked.connect(self.clear_completed_downloads)
         header_layout.addWidget(self.clear_completed_button)
         
+        # Playlist expansion status ("Expanding playlist...", entries added, errors)
+        self.playlist_status_label = QLabel()
+        self.playlist_status_label.hide()
+        header_layout.addWidget(self.playlist_status_label)
+        
         header_layout.addStretch()
         
         # Use FlowLayout for the downloads grid
@@ -104,9 +114,15 @@ class DownloadQueue(QScrollArea):
         self.download_manager.download_progress.connect(self.on_download_progress)
         self.download_manager.download_complete.connect(self.on_download_complete)
         self.download_manager.download_error.connect(self.on_download_error)
+        self.download_manager.thumbnail_updated.connect(self.on_thumbnail_updated)
+        self.download_manager.playlist_expansion_started.connect(self.on_playlist_expansion_started)
+        self.download_manager.playlist_expanded.connect(self.on_playlist_expanded)
+        self.download_manager.playlist_error.connect(self.on_playlist_error)
         
         # Create a dictionary to track progress components
         self.progress_components = {}
+        # Playlist URLs whose expansion is still running
+        self._expanding_playlists = set()
         
         # Initial queue update
         self.update_queue()
@@ -250,6 +266,40 @@ class DownloadQueue(QScrollArea):
                 # Use placeholder
                 component.progress_bar.set_title(title or "Downloading...")
     
+    def on_thumbnail_updated(self, url, thumbnail):
+        """Handle a thumbnail fetched for a queued item."""
+        if url in self.progress_components and thumbnail and not thumbnail.isNull():
+            self.progress_components[url].set_thumbnail(thumbnail)
+    
+    def on_playlist_expansion_started(self, playlist_url):
+        """Show that a playlist is being expanded in the background."""
+        self._expanding_playlists.add(playlist_url)
+        self._show_playlist_status(f"Expanding playlist ({len(self._expanding_playlists)})...")
+    
+    def on_playlist_expanded(self, playlist_url, added_count):
+        """Report how many entries a finished playlist expansion added."""
+        self._expanding_playlists.discard(playlist_url)
+        if added_count:
+            message = f"Added {added_count} video(s) from playlist"
+        else:
+            message = "Playlist added no new videos"
+        self._show_playlist_status(message)
+    
+    def on_playlist_error(self, playlist_url, error_message):
+        """Report a failed playlist expansion."""
+        self._expanding_playlists.discard(playlist_url)
+        Logger.instance().error(caller="DownloadQueue", msg=f"Playlist expansion failed for {playlist_url}: {error_message}")
+        display_message = error_message if len(error_message) <= 100 else error_message[:97] + "..."
+        self._show_playlist_status(f"Playlist failed: {display_message}", is_error=True)
+    
+    def _show_playlist_status(self, message, is_error=False):
+        if self._expanding_playlists and not message.startswith("Expanding"):
+            message += f" | Expanding playlist ({len(self._expanding_playlists)})..."
+        self.playlist_status_label.setStyleSheet("color: #E05555;" if is_error else "color: #AAAAAA;")
+        self.playlist_status_label.setToolTip(message)
+        self.playlist_status_label.setText(message)
+        self.playlist_status_label.show()
+    
     def on_download_progress(self, url, progress, status_text):
         """Handle download progress signal."""
         if url in self.progress_components:
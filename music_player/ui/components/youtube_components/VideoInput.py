@@ -339,6 +339,15 @@ class VideoInput(QWidget):
             prefer_best_video=prefer_best_video,
             prefer_avc=(resolution is not None and not prefer_best_video)  # Use AVC only for specific resolutions
         )
+        # Tag with the matching preset name so DownloadManager can pick post-download stages
+        if active_button_text == "Audio":
+            options["preset"] = "audio_default"
+        elif active_button_text == "Best":
+            options["preset"] = "best_video_default"
+        elif resolution == 720:
+            options["preset"] = "video_720p_default"
+        elif resolution:
+            options["preset"] = f"video_{resolution}p"
         return options
 
     def set_format_audio_only(self):
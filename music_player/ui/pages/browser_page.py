@@ -433,6 +433,16 @@ class BrowserPage(QWidget):
         self.cancel_video_compression_button.hide() 
         # --- END NEW --- #
 
+        self.cancel_douyin_button = RoundButton(
+            parent=self,
+            icon_name="fa5s.ban",
+            diameter=48,
+            icon_size=24,
+            bg_opacity=0.5
+        )
+        self.cancel_douyin_button.setToolTip("Cancel Douyin Processing")
+        self.cancel_douyin_button.hide()
+
         # --- NEW: Bottom Button Bar --- #
         self.bottom_button_bar = QWidget(self)
         self.bottom_button_bar.setObjectName("bottomButtonBar")
@@ -442,6 +452,7 @@ class BrowserPage(QWidget):
         self.bottom_button_layout.addStretch(1)  
 
         # Add buttons to layout in desired order (left to right)
+        self.bottom_button_layout.addWidget(self.cancel_douyin_button)
         self.bottom_button_layout.addWidget(self.cancel_video_compression_button)
         self.bottom_button_layout.addWidget(self.cancel_conversion_button)
         self.bottom_button_layout.addWidget(self.douyin_button)
@@ -484,6 +495,7 @@ class BrowserPage(QWidget):
         # --- NEW: Connect Video Compression Signals --- #
         self.video_compress_button.clicked.connect(self._on_video_process_clicked)
         self.video_compression_manager.compression_batch_started.connect(self._on_video_compression_batch_started)
+        self.video_compression_manager.compression_batch_extended.connect(self._on_video_compression_batch_extended)
         self.video_compression_manager.compression_file_started.connect(self._on_video_compression_file_started)
         self.video_compression_manager.compression_file_progress.connect(self._on_video_compression_file_progress)
         self.video_compression_manager.compression_file_completed.connect(self._on_video_compression_file_completed)
@@ -499,6 +511,8 @@ class BrowserPage(QWidget):
         self.douyin_processor.trim_file_failed.connect(self._on_douyin_file_failed)
         self.douyin_processor.trim_batch_finished.connect(self._on_douyin_batch_finished)
         # Normalization signals
+        self.douyin_processor.analysis_started.connect(lambda total: (self.douyin_progress_overlay.show_analysis_started(total), self._update_douyin_progress_position(), self.cancel_douyin_button.show()))
+        self.douyin_processor.normalize_planned.connect(lambda plan: (self.douyin_progress_overlay.show_normalize_plan(len(plan.to_copy), len(plan.to_encode), len(plan.unprobed)), self._update_douyin_progress_position()))
         self.douyin_processor.normalize_started.connect(lambda total: (self.douyin_progress_overlay.show_normalization_started(total), self._update_douyin_progress_position()))
         self.douyin_processor.normalize_file_started.connect(lambda task_id, filename, idx, total: (self.douyin_progress_overlay.show_file_progress(task_id, os.path.basename(filename), idx, total, 0.0), self._update_douyin_progress_position()))
         self.douyin_processor.normalize_file_progress.connect(lambda task_id, percent: self.douyin_progress_overlay.update_current_file_progress(task_id, percent))
@@ -517,6 +531,7 @@ class BrowserPage(QWidget):
 
         # --- NEW: Connect Douyin Button --- #
         self.douyin_button.clicked.connect(self._on_douyin_process_clicked)
+        self.cancel_douyin_button.clicked.connect(self._on_cancel_douyin_clicked)
         # --- END NEW --- #
 
     # ... [Keep navigation/display logic, add new methods below] ...
@@ -668,6 +683,7 @@ class BrowserPage(QWidget):
         self.model = BaseTableModel(source_objects=files_data, column_definitions=browser_col_defs)
         self.proxy_model = QSortFilterProxyModel()
         self.proxy_model.setSourceModel(self.model)
+        self.proxy_model.setSortRole(Qt.ItemDataRole.EditRole) # Sort on cached sort keys, not display strings
         self.file_table.setModel(self.proxy_model)
         self.file_table.resizeRowsToContents()
         if directory_path == self._pending_selection_dir and self._pending_selection_filename:
@@ -782,7 +798,7 @@ class BrowserPage(QWidget):
         self.overlay_buttons = [
             self.browse_button, self.oplayer_button, self.refresh_button,
             self.mp3_convert_button, self.video_compress_button, self.douyin_button,
-            self.cancel_conversion_button, self.cancel_video_compression_button
+            self.cancel_conversion_button, self.cancel_video_compression_button, self.cancel_douyin_button
         ]
         for button in reversed(self.overlay_buttons):  
             if button.isVisible():
@@ -1044,11 +1060,17 @@ class BrowserPage(QWidget):
         self._update_video_compression_progress_position()
         self.cancel_video_compression_button.show() 
 
+    def _on_video_compression_batch_extended(self, added_files: int, total_files: int):
+        self.video_compression_progress_overlay.update_total_files(total_files)
+        self._update_video_compression_progress_position()
+
     def _on_video_compression_file_started(self, task_id: str, original_filename: str, file_index: int, total_files: int):
+        self.video_compression_progress_overlay.set_time_remaining(self.video_compression_manager.get_estimated_time_remaining())
         self.video_compression_progress_overlay.show_file_progress(task_id, os.path.basename(original_filename), file_index, total_files, 0.0)
         self._update_video_compression_progress_position() 
 
     def _on_video_compression_file_progress(self, task_id: str, percentage: float):
+        self.video_compression_progress_overlay.set_time_remaining(self.video_compression_manager.get_estimated_time_remaining())
         self.video_compression_progress_overlay.update_current_file_progress(task_id, percentage)
 
     def _on_video_compression_file_completed(self, task_id: str, original_filename: str, compressed_filename: str):
@@ -1099,6 +1121,7 @@ class BrowserPage(QWidget):
     def _on_douyin_batch_started(self, total_files: int):
         self.douyin_progress_overlay.show_trimming_started(total_files)
         self._update_douyin_progress_position()
+        self.cancel_douyin_button.show()
 
     def _on_douyin_file_started(self, task_id: str, original_filename: str, file_index: int, total_files: int):
         self.douyin_progress_overlay.show_file_progress(task_id, os.path.basename(original_filename), file_index, total_files, 0.0)
@@ -1120,6 +1143,8 @@ class BrowserPage(QWidget):
 
     def _on_douyin_merge_started(self):
         self.douyin_progress_overlay.show_merge_started()
+        # The merge itself can't be interrupted; cancel only applies to trimming/normalizing
+        self.cancel_douyin_button.hide()
         self._update_douyin_progress_position()
 
     def _on_douyin_merge_progress(self, percent):
@@ -1136,8 +1161,12 @@ class BrowserPage(QWidget):
 
     def _on_douyin_process_finished(self):
         self.douyin_progress_overlay.show_process_finished()
+        self.cancel_douyin_button.hide()
         QTimer.singleShot(500, self._refresh_view)
 
+    def _on_cancel_douyin_clicked(self):
+        if self.douyin_processor: self.douyin_processor.cancel_all_trimming()
+
     def _update_douyin_progress_position(self):
         if self.douyin_progress_overlay.isVisible():
             self.douyin_progress_overlay.adjustSize()
@@ -9,7 +9,7 @@ from PyQt6.QtWidgets import (
     QFileDialog, QMenu, QStackedWidget
 )
 from qt_base_app.models.logger import Logger
-from PyQt6.QtCore import Qt, QSettings, pyqtSignal
+from PyQt6.QtCore import Qt, QSettings, pyqtSignal, QObject, QRunnable, QThreadPool
 from PyQt6.QtGui import QFont, QIcon, QAction, QColor
 import qtawesome as qta
 from pathlib import Path
@@ -29,6 +29,26 @@ from music_player.ui.components.playlist_components.playlist_playmode import Pla
 from music_player.models.settings_defs import PREF_WORKING_DIR_KEY, DEFAULT_WORKING_DIR
 
 
+class PlaylistLoadSignals(QObject):
+    loaded = pyqtSignal(int, object)  # request id, Playlist
+
+
+class PlaylistLoadWorker(QRunnable):
+    """Reads a playlist's track list off the UI thread."""
+    def __init__(self, request_id: int, playlist: Playlist):
+        super().__init__()
+        self.request_id = request_id
+        self.playlist = playlist
+        self.signals = PlaylistLoadSignals()
+
+    def run(self):
+        try:
+            self.playlist.ensure_loaded()
+        except Exception as e:
+            Logger.instance().error(caller="PlaylistLoadWorker", msg=f"Error loading playlist '{self.playlist.name}': {e}")
+        self.signals.loaded.emit(self.request_id, self.playlist)
+
+
 class PlaylistsPage(QWidget):
     """
     Page for managing music playlists. Switches between modes.
@@ -59,6 +79,12 @@ class PlaylistsPage(QWidget):
         self._current_mode = "dashboard" # "dashboard" or "play"
         self._current_playlist_in_edit = None
 
+        # Background track loading for playlists listed from catalog headers
+        self._load_pool = QThreadPool(self)
+        self._load_pool.setMaxThreadCount(1)
+        self._load_request_id = 0
+        self._load_workers = {}  # request id -> worker, kept alive until it reports back
+
         self.setup_ui()
         self._connect_signals()
         self.load_playlists_into_dashboard()
@@ -107,6 +133,7 @@ class PlaylistsPage(QWidget):
     # --- Mode Switching --- 
     def _enter_dashboard_mode(self):
         self._current_mode = "dashboard"
+        self._load_request_id += 1 # Drop any pending background load
         # Note: We don't reset _current_playlist_in_edit here so playback can continue
         self.stacked_widget.setCurrentWidget(self.dashboard_widget)
         self.load_playlists_into_dashboard() # Refresh list when returning
@@ -114,7 +141,28 @@ class PlaylistsPage(QWidget):
     def _enter_play_mode(self, playlist: Playlist):
         self._current_mode = "play"
         self._current_playlist_in_edit = playlist
-        
+        self._load_request_id += 1
+
+        if not playlist.is_loaded:
+            # Show play mode right away and read the track list in the background
+            self.play_mode_widget.show_loading(playlist)
+            self.stacked_widget.setCurrentWidget(self.play_mode_widget)
+            worker = PlaylistLoadWorker(self._load_request_id, playlist)
+            worker.signals.loaded.connect(self._on_playlist_loaded)
+            self._load_workers[self._load_request_id] = worker
+            self._load_pool.start(worker)
+            return
+
+        self._show_loaded_playlist(playlist)
+
+    def _on_playlist_loaded(self, request_id: int, playlist: Playlist):
+        self._load_workers.pop(request_id, None)
+        # Ignore results for a playlist the user has already navigated away from
+        if request_id != self._load_request_id or self._current_mode != "play":
+            return
+        self._show_loaded_playlist(playlist)
+
+    def _show_loaded_playlist(self, playlist: Playlist):
         # Update the global reference to the current playlist
         player_state.set_current_playlist(playlist)
         
@@ -155,6 +203,7 @@ class PlaylistsPage(QWidget):
             # Use simple QListWidgetItem for now, storing Playlist object
             item = QListWidgetItem(playlist.name)
             item.setData(Qt.ItemDataRole.UserRole, playlist) # Store object
+            item.setToolTip(f"{playlist.track_count} tracks")
             item.setIcon(QIcon(qta.icon('fa5s.list', color='#a1a1aa').pixmap(32, 32)))
             list_widget.addItem(item)
 
@@ -335,13 +384,14 @@ class PlaylistsPage(QWidget):
                 if new_path.exists():
                     raise FileExistsError(f"A playlist named '{new_name}' already exists.")
 
+                # Read tracks and pending journal entries from the old location first
+                playlist.ensure_loaded()
                 # Rename file if it exists
                 if old_path and old_path.exists():
                     os.rename(old_path, new_path)
 
                 # Update playlist object and save its new state (name and path)
-                playlist.name = new_name
-                playlist.filepath = new_path
+                playlist.move_to(new_path, new_name)
                 if not self.playlist_manager.save_playlist(playlist):
                      # Attempt to revert rename if save fails?
                      if old_path and new_path.exists(): os.rename(new_path, old_path)
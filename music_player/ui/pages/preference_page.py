@@ -5,7 +5,7 @@ from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
     QPushButton, QSpinBox, QFormLayout, QGroupBox,
     QLineEdit, QFileDialog, QMessageBox, QDoubleSpinBox,
-    QCheckBox, QProgressBar
+    QCheckBox, QProgressBar, QGridLayout
 )
 from PyQt6.QtCore import Qt, QRegularExpression, QTimer, pyqtSlot
 from PyQt6.QtGui import QFont, QColor, QRegularExpressionValidator
@@ -24,8 +24,19 @@ from music_player.models.settings_defs import (
     YT_API_QSETTINGS_KEY, DEFAULT_YT_API_KEY, 
     GROQ_API_QSETTINGS_KEY, DEFAULT_GROQ_API_KEY,
     # --- NEW: Import Conversion Setting --- #
-    CONVERSION_MP3_BITRATE_KEY, DEFAULT_CONVERSION_MP3_BITRATE
+    CONVERSION_MP3_BITRATE_KEY, DEFAULT_CONVERSION_MP3_BITRATE,
+    YT_POST_PROCESS_KEY, DEFAULT_YT_POST_PROCESS
 )
+from music_player.models.PostDownloadPipeline import (
+    KNOWN_STAGES, CONFIGURABLE_PRESETS, STAGE_MP3, STAGE_COMPRESS, STAGE_OPLAYER
+)
+
+# Column headers for the post-download stage grid
+POST_PROCESS_STAGE_TITLES = {
+    STAGE_MP3: "MP3",
+    STAGE_COMPRESS: "Compress",
+    STAGE_OPLAYER: "OPlayer",
+}
 
 # Import yt-dlp updater settings and components
 try:
@@ -174,6 +185,32 @@ class PreferencePage(QWidget):
         
         form_layout.addRow(self.download_dir_label, self.download_dir_container)
         
+        # --- Post-download stages per download preset ---
+        self.post_process_label = QLabel("After Download:")
+        self.post_process_label.setStyleSheet(label_style)
+        
+        self.post_process_container = QWidget()
+        self.post_process_layout = QGridLayout(self.post_process_container)
+        self.post_process_layout.setContentsMargins(0, 0, 0, 0)
+        self.post_process_layout.setHorizontalSpacing(16)
+        
+        self.post_process_checkboxes = {}  # (preset, stage) -> QCheckBox
+        for col, stage in enumerate(KNOWN_STAGES, start=1):
+            header = QLabel(POST_PROCESS_STAGE_TITLES[stage])
+            header.setStyleSheet(label_style)
+            self.post_process_layout.addWidget(header, 0, col, Qt.AlignmentFlag.AlignCenter)
+        for row, (preset, preset_label) in enumerate(CONFIGURABLE_PRESETS.items(), start=1):
+            row_label = QLabel(preset_label)
+            row_label.setStyleSheet(label_style)
+            self.post_process_layout.addWidget(row_label, row, 0)
+            for col, stage in enumerate(KNOWN_STAGES, start=1):
+                checkbox = QCheckBox()
+                checkbox.stateChanged.connect(self._save_post_process)
+                self.post_process_layout.addWidget(checkbox, row, col, Qt.AlignmentFlag.AlignCenter)
+                self.post_process_checkboxes[(preset, stage)] = checkbox
+        
+        form_layout.addRow(self.post_process_label, self.post_process_container)
+        
         # --- Youtube API Key (Uses QSettings Key) ---
         self.yt_api_key_label = QLabel("YouTube API Key:")
         self.yt_api_key_label.setStyleSheet(label_style)
@@ -360,6 +397,9 @@ class PreferencePage(QWidget):
         self.mp3_bitrate_spinbox.setValue(mp3_bitrate)
         # --- END NEW --- #
         
+        post_process = self.settings.get(YT_POST_PROCESS_KEY, DEFAULT_YT_POST_PROCESS, SettingType.DICT) or {}
+        self._set_post_process_checks(post_process)
+        
         # Load yt-dlp update settings
         if YTDLP_UPDATER_AVAILABLE:
             try:
@@ -404,6 +444,26 @@ class PreferencePage(QWidget):
         self.settings.set(CONVERSION_MP3_BITRATE_KEY, bitrate, SettingType.INT)
         self.settings.sync()
     # --- END NEW --- #
+    
+    def _set_post_process_checks(self, post_process: dict):
+        """Tick the stage checkboxes from a {preset: [stage, ...]} mapping without saving."""
+        for (preset, stage), checkbox in self.post_process_checkboxes.items():
+            checkbox.blockSignals(True)
+            checkbox.setChecked(stage in post_process.get(preset, []))
+            checkbox.blockSignals(False)
+    
+    def _save_post_process(self):
+        """Save the post-download stages; stages always run in pipeline order."""
+        # Keep entries for presets this page doesn't show
+        post_process = dict(self.settings.get(YT_POST_PROCESS_KEY, DEFAULT_YT_POST_PROCESS, SettingType.DICT) or {})
+        for preset in CONFIGURABLE_PRESETS:
+            stages = [stage for stage in KNOWN_STAGES if self.post_process_checkboxes[(preset, stage)].isChecked()]
+            if stages:
+                post_process[preset] = stages
+            else:
+                post_process.pop(preset, None)
+        self.settings.set(YT_POST_PROCESS_KEY, post_process, SettingType.DICT)
+        self.settings.sync()
         
     def reset_settings(self):
         """Reset settings to default values."""
@@ -416,6 +476,7 @@ class PreferencePage(QWidget):
         # --- NEW: Reset MP3 Bitrate UI --- #
         self.mp3_bitrate_spinbox.setValue(DEFAULT_CONVERSION_MP3_BITRATE)
         # --- END NEW --- #
+        self._set_post_process_checks(DEFAULT_YT_POST_PROCESS)
         
         # Reset yt-dlp update settings UI
         if YTDLP_UPDATER_AVAILABLE:
@@ -433,6 +494,7 @@ class PreferencePage(QWidget):
         # --- NEW: Reset MP3 Bitrate in QSettings --- #
         self.settings.set(CONVERSION_MP3_BITRATE_KEY, DEFAULT_CONVERSION_MP3_BITRATE, SettingType.INT)
         # --- END NEW --- #
+        self.settings.set(YT_POST_PROCESS_KEY, DEFAULT_YT_POST_PROCESS, SettingType.DICT)
         
         # Reset yt-dlp database settings
         if YTDLP_UPDATER_AVAILABLE:
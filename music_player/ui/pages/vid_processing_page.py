@@ -15,7 +15,7 @@ from qt_base_app.models.settings_manager import SettingsManager
 from qt_base_app.components.base_progress_overlay import BaseProgressOverlay
 
 from music_player.models.vid_proc_model import VidProcTableModel, VidProcItem, calculate_default_tile_index
-from music_player.models.vid_proc_manager import VidProcManager
+from music_player.models.vid_proc_manager import VidProcManager, default_preview_ts
 from music_player.ui.delegates.vid_proc_delegates import ThumbDelegate, ControlGroupDelegate, TitleInfoDelegate
 
 class VidProcessingPage(QWidget):
@@ -32,6 +32,7 @@ class VidProcessingPage(QWidget):
         # Internal state for processing progress
         self._processing_total = 0
         self._processing_current = 0
+        self._processing_fractions = {} # path str -> 0..1 for encodes in flight
         self._is_processing = False # New flag to track state
         
         self._current_directory = None  # Track current directory to avoid re-scanning
@@ -216,6 +217,7 @@ class VidProcessingPage(QWidget):
         self.manager.scan_finished.connect(self._on_scan_finished)
         # preview_ready now includes a version integer so we can ignore stale previews
         self.manager.preview_ready.connect(self._on_preview_ready)
+        self.manager.process_progress.connect(self._on_process_progress)
         self.manager.process_finished.connect(self._on_process_finished)
         self.manager.merge_finished.connect(self._on_merge_finished)
         
@@ -384,7 +386,7 @@ class VidProcessingPage(QWidget):
             'tile_index': default_idx,
             'x_offset': 0,
             'width_delta': 0,
-            'preview_time': min(5.0, info['duration'] * 0.2), # Initialize with default time logic
+            'preview_time': default_preview_ts(info['duration']), # Initialize with default time logic
             'crop_rect': None, # Let model calculate
             'out_size': QSize(1080, 1920), # Default
             'included': True,
@@ -400,8 +402,8 @@ class VidProcessingPage(QWidget):
         # Trigger preview gen
         self.manager.generate_preview(item)
 
-    def _on_preview_ready(self, path: Path, type_: str, version: int):
-        """Handle preview readiness."""
+    def _on_preview_ready(self, path: Path, type_: str, version: int, img: QImage):
+        """Handle preview readiness (the image is decoded in memory by the manager)."""
         # Ignore stale previews for cropped output
         if type_ == 'out':
             latest = self.manager.get_preview_version(path)
@@ -412,11 +414,7 @@ class VidProcessingPage(QWidget):
         for i in range(self.model.rowCount()):
             item = self.model.get_item(i)
             if item['path'] == path:
-                suffix = "in" if type_ == 'in' else "out"
-                img_path = self.manager.temp_dir / f"{path.stem}_{suffix}.jpg"
-                if img_path.exists():
-                    img = QImage(str(img_path))
-                    
+                if img is not None and not img.isNull():
                     if type_ == 'in':
                         self.model.update_item(i, thumb_in=img)
                     else:
@@ -498,6 +496,7 @@ class VidProcessingPage(QWidget):
         pending_items = included
         self._processing_total = len(pending_items)
         self._processing_current = 0
+        self._processing_fractions = {}
         
         if self._processing_total == 0:
              QMessageBox.information(self, "No Pending Items", "All selected items have already been processed successfully.")
@@ -522,7 +521,22 @@ class VidProcessingPage(QWidget):
                 
         self.manager.process_items(items, out_dir, target_height=target_h)
         
+    def _on_process_progress(self, path_str: str, fraction: float):
+        """Live progress of running encodes, shown as overall batch percentage."""
+        if not self._is_processing or self._processing_total <= 0:
+            return
+        self._processing_fractions[path_str] = fraction
+        done = self._processing_current + sum(self._processing_fractions.values())
+        percent = int(min(done / self._processing_total, 1.0) * 100)
+        if self.progress_overlay.isVisible():
+            self.progress_overlay.show_progress(
+                f"Processing... {percent}%",
+                f"{self._processing_current}/{self._processing_total}",
+                percent
+            )
+
     def _on_process_finished(self, path_str: str, success: bool, msg: str):
+        self._processing_fractions.pop(path_str, None)
         path = Path(path_str)
         for i in range(self.model.rowCount()):
             item = self.model.get_item(i)
@@ -19,6 +19,7 @@ from qt_base_app.models.logger import Logger
 
 # --- Import Models and Components ---
 from music_player.models import DownloadManager
+from music_player.models.SiteModel import SiteModel
 from music_player.models.Yt_DlpModel import YtDlpModel  # Import YtDlpModel for presets
 from music_player.ui.components.youtube_components.VideoInput import VideoInput 
 from music_player.ui.components.youtube_components.DownloadQueue import DownloadQueue
@@ -122,9 +123,14 @@ class YoutubePage(QWidget):
             # QMessageBox.warning(self, "Invalid Directory", "Download directory not set or invalid. Please set it in Preferences.")
             return # Prevent adding download if dir is invalid
             
-        # Use logger
-        self.logger.info(self.__class__.__name__, f"Adding download: URL={url}, Dir={output_dir_str}, Options={format_options}")
-        self.download_manager.add_download(url, format_options, output_dir_str)
+        # Playlist/channel URLs are expanded once and enqueued as a batch
+        if SiteModel.is_playlist_url(url):
+            self.logger.info(self.__class__.__name__, f"Adding playlist: URL={url}, Dir={output_dir_str}, Options={format_options}")
+            self.download_manager.add_playlist(url, format_options, output_dir_str)
+        else:
+            # Use logger
+            self.logger.info(self.__class__.__name__, f"Adding download: URL={url}, Dir={output_dir_str}, Options={format_options}")
+            self.download_manager.add_download(url, format_options, output_dir_str)
         
         # Optionally clear URL input after adding
         self.video_input.url_input.clear()
@@ -183,9 +189,14 @@ class YoutubePage(QWidget):
             return
         
         # 4. Call DownloadManager
-        self.logger.info(self.__class__.__name__, 
-                        f"Adding download: URL={url}, Dir={output_dir_str}")
-        self.download_manager.add_download(url, options, output_dir_str)
+        if SiteModel.is_playlist_url(url):
+            self.logger.info(self.__class__.__name__, 
+                            f"Adding playlist: URL={url}, Dir={output_dir_str}")
+            self.download_manager.add_playlist(url, options, output_dir_str)
+        else:
+            self.logger.info(self.__class__.__name__, 
+                            f"Adding download: URL={url}, Dir={output_dir_str}")
+            self.download_manager.add_download(url, options, output_dir_str)
         
         # Do NOT clear URL input here, as the user didn't type it
 
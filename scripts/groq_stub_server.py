@@ -0,0 +1,159 @@
+"""
+Local stand-in for the Groq chat-completions endpoint, for exercising the AI
+classification path without an API key or network access.
+
+Answers "Yes" for every filename in the prompt that contains one of the --yes
+keywords and "No" otherwise, in the numbered format GroqMusicModel parses.
+With --rate-limit-every N, every Nth request gets a 429 with a retry-after
+header so the client's backoff can be observed.
+
+Usage:
+    python scripts/groq_stub_server.py --port 8080 --yes symphony --yes bwv
+
+    Then set in music_player/resources/music_player_config.yaml:
+        ai:
+          groq:
+            base_url: "http://127.0.0.1:8080"
+    (any non-empty Groq API key works) and run an AI filter from the selection pool.
+
+    python scripts/groq_stub_server.py --check
+    Starts the stub on a free port, sends one classification batch through the
+    groq client exactly as GroqMusicModel does, and verifies the parsed answers.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from qt_base_app.models.logger import Logger
+
+# "12. Some File Name.mp3" lines after the "Filenames:" header of generate_prompt()
+_FILENAME_LINE = re.compile(r"^(\d+)\. (.+)$")
+
+
+def answer_prompt(prompt: str, yes_keywords) -> str:
+    """Builds the numbered Yes/No reply for the filenames listed in a prompt."""
+    _, _, listing = prompt.partition("Filenames:")
+    lines = []
+    for line in listing.strip().splitlines():
+        match = _FILENAME_LINE.match(line.strip())
+        if not match:
+            continue
+        name = match.group(2).lower()
+        verdict = "Yes" if any(k.lower() in name for k in yes_keywords) else "No"
+        lines.append(f"{match.group(1)}. {verdict}")
+    return "\n".join(lines)
+
+
+def make_handler(yes_keywords, rate_limit_every: int):
+    counter = {"requests": 0}
+    lock = threading.Lock()
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            Logger.instance().debug(caller="groq_stub_server", msg=format % args)
+
+        def _send_json(self, status: int, payload: dict, headers=None):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            if not self.path.rstrip("/").endswith("/chat/completions"):
+                self._send_json(404, {"error": {"message": f"Unknown path {self.path}"}})
+                return
+            length = int(self.headers.get("Content-Length", 0))
+            try:
+                request = json.loads(self.rfile.read(length) or b"{}")
+            except ValueError:
+                self._send_json(400, {"error": {"message": "Invalid JSON body"}})
+                return
+
+            with lock:
+                counter["requests"] += 1
+                throttled = rate_limit_every > 0 and counter["requests"] % rate_limit_every == 0
+            if throttled:
+                self._send_json(429, {"error": {"message": "Rate limit reached (stub)"}}, {"retry-after": "1"})
+                return
+
+            prompt = "\n".join(m.get("content", "") for m in request.get("messages", []) if m.get("role") == "user")
+            self._send_json(200, {
+                "id": f"chatcmpl-{uuid.uuid4().hex}",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": request.get("model", "stub"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": answer_prompt(prompt, yes_keywords)},
+                    "finish_reason": "stop",
+                }],
+                "usage": {"prompt_tokens": 0, "completion_tokens": 0, "total_tokens": 0},
+            })
+
+    return StubHandler
+
+
+def run_check(server: ThreadingHTTPServer) -> bool:
+    """Sends one batch through the groq client against the stub and checks the parsed answers."""
+    import groq
+    from music_player.ai.groq_music_model import generate_prompt, parse_classification_response
+
+    host, port = server.server_address[:2]
+    client = groq.Client(api_key="stub", base_url=f"http://{host}:{port}", max_retries=0)
+    filenames = ["Bach - BWV 1007 Prelude.mp3", "Pop Remix 2024.mp3", "Symphony No 9.flac"]
+    config = {"target_label": "Classical", "role": "expert music classifier"}
+    completion = client.chat.completions.create(
+        messages=[{"role": "user", "content": generate_prompt(config, filenames)}],
+        model="stub",
+    )
+    parsed = parse_classification_response(completion.choices[0].message.content or "", len(filenames))
+    expected = {0: True, 1: False, 2: True}
+    if parsed != expected:
+        Logger.instance().error(caller="groq_stub_server", msg=f"Check failed: expected {expected}, got {parsed}")
+        return False
+    Logger.instance().info(caller="groq_stub_server", msg=f"Check passed: {dict(zip(filenames, (parsed[i] for i in range(3))))}")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local stub of the Groq chat-completions endpoint.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--yes", action="append", default=[], help="Keyword that makes a filename answer Yes (repeatable)")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Answer every Nth request with HTTP 429")
+    parser.add_argument("--check", action="store_true", help="Run one classification against the stub and exit")
+    args = parser.parse_args()
+
+    if args.check:
+        server = ThreadingHTTPServer((args.host, 0), make_handler(["bwv", "symphony"], 0))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            ok = run_check(server)
+        finally:
+            server.shutdown()
+        sys.exit(0 if ok else 1)
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(args.yes, args.rate_limit_every))
+    Logger.instance().info(caller="groq_stub_server", msg=f"Groq stub listening on http://{args.host}:{args.port} (yes keywords: {args.yes or 'none'})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()